@@ -3,87 +3,102 @@ Configuration file for the research paper processing pipeline.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file if it exists
-load_dotenv()
+# Load environment variables from .env file if it exists. Skipped on Lambda
+# (no .env there) or when SKIP_DOTENV is set, avoiding the directory walk.
+if not os.environ.get('AWS_LAMBDA_FUNCTION_NAME') and not os.environ.get('SKIP_DOTENV'):
+    load_dotenv()
+
+def _flag(value):
+    """Parse a 'true'/'false' environment flag"""
+    return value.lower() == 'true'
+
+# Every setting comes from one snapshot of the environment
+_env = os.environ
+
+def _get(var, cast, default):
+    """Read one setting from the environment and cast it"""
+    return cast(_env.get(var, default))
 
 # API Configuration
-ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', '')
-OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
-DEFAULT_PROVIDER = os.environ.get('DEFAULT_PROVIDER', 'anthropic')
+ANTHROPIC_API_KEY = _get('ANTHROPIC_API_KEY', str, '')
+OPENAI_API_KEY = _get('OPENAI_API_KEY', str, '')
+DEFAULT_PROVIDER = _get('DEFAULT_PROVIDER', str, 'anthropic')
 
 # PubMed Configuration
-PUBMED_EMAIL = os.environ.get('PUBMED_EMAIL', 'user@example.com')
-NCBI_API_KEY = os.environ.get('NCBI_API_KEY', '')  # Optional, increases rate limit
+PUBMED_EMAIL = _get('PUBMED_EMAIL', str, 'user@example.com')
+NCBI_API_KEY = _get('NCBI_API_KEY', str, '')  # Optional, increases rate limit
 
 # Email Configuration
-SMTP_SERVER = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
-SMTP_PORT = int(os.environ.get('SMTP_PORT', '587'))
-SMTP_USER = os.environ.get('SMTP_USER', '')
-SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', '')
-FROM_EMAIL = os.environ.get('FROM_EMAIL', SMTP_USER)
+SMTP_SERVER = _get('SMTP_SERVER', str, 'smtp.gmail.com')
+SMTP_PORT = _get('SMTP_PORT', int, '587')
+SMTP_USER = _get('SMTP_USER', str, '')
+SMTP_PASSWORD = _get('SMTP_PASSWORD', str, '')
+FROM_EMAIL = _get('FROM_EMAIL', str, SMTP_USER)
 
 # Processing Configuration
-DEFAULT_PAPERS_DIR = os.environ.get('PAPERS_DIR', 'project/papers')
-DEFAULT_OUTPUT_DIR = os.environ.get('OUTPUT_DIR', 'project/outputs')
-DEFAULT_WORKERS = int(os.environ.get('MAX_WORKERS', '5'))
-USE_LANGCHAIN = os.environ.get('USE_LANGCHAIN', 'false').lower() == 'true'
+DEFAULT_PAPERS_DIR = _get('PAPERS_DIR', str, 'project/papers')
+DEFAULT_OUTPUT_DIR = _get('OUTPUT_DIR', str, 'project/outputs')
+DEFAULT_WORKERS = _get('MAX_WORKERS', int, '5')
+USE_LANGCHAIN = _get('USE_LANGCHAIN', _flag, 'false')
 
 # Model Configuration
-CLAUDE_MODEL = os.environ.get('CLAUDE_MODEL', 'claude-sonnet-4-20250514')
-OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4o')
-MAX_TOKENS = int(os.environ.get('MAX_TOKENS', '4000'))
-TEMPERATURE = float(os.environ.get('TEMPERATURE', '0.3'))
+CLAUDE_MODEL = _get('CLAUDE_MODEL', str, 'claude-sonnet-4-20250514')
+OPENAI_MODEL = _get('OPENAI_MODEL', str, 'gpt-4o')
+MAX_TOKENS = _get('MAX_TOKENS', int, '4000')
+TEMPERATURE = _get('TEMPERATURE', float, '0.3')
 
 # Text Processing Configuration
-MAX_CHARS_PER_CHUNK = int(os.environ.get('MAX_CHARS_PER_CHUNK', '100000'))
-OPENAI_MAX_CHARS_PER_CHUNK = int(os.environ.get('OPENAI_MAX_CHARS_PER_CHUNK', '80000'))
+MAX_CHARS_PER_CHUNK = _get('MAX_CHARS_PER_CHUNK', int, '100000')
+OPENAI_MAX_CHARS_PER_CHUNK = _get('OPENAI_MAX_CHARS_PER_CHUNK', int, '80000')
 
 # Cloud Configuration
-CLOUD_PROVIDER = os.environ.get('CLOUD_PROVIDER', 'local')  # local, aws, azure
+CLOUD_PROVIDER = _get('CLOUD_PROVIDER', str, 'local')  # local, aws, azure
 
 # AWS Configuration
-AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
-AWS_S3_BUCKET = os.environ.get('AWS_S3_BUCKET', '')
-RESULTS_BUCKET = os.environ.get('RESULTS_BUCKET', AWS_S3_BUCKET)
-DLQ_URL = os.environ.get('DLQ_URL', '')
-ENVIRONMENT = os.environ.get('ENVIRONMENT', 'prod')
+AWS_REGION = _get('AWS_REGION', str, 'us-east-1')
+AWS_S3_BUCKET = _get('AWS_S3_BUCKET', str, '')
+RESULTS_BUCKET = _get('RESULTS_BUCKET', str, AWS_S3_BUCKET)
+DLQ_URL = _get('DLQ_URL', str, '')
+ENVIRONMENT = _get('ENVIRONMENT', str, 'prod')
 
 # Azure Configuration
-AZURE_STORAGE_CONNECTION_STRING = os.environ.get('AZURE_STORAGE_CONNECTION_STRING', '')
-AZURE_CONTAINER_NAME = os.environ.get('AZURE_CONTAINER_NAME', 'research-papers')
-AZURE_COMMUNICATION_CONNECTION_STRING = os.environ.get('AZURE_COMMUNICATION_CONNECTION_STRING', '')
+AZURE_STORAGE_CONNECTION_STRING = _get('AZURE_STORAGE_CONNECTION_STRING', str, '')
+AZURE_CONTAINER_NAME = _get('AZURE_CONTAINER_NAME', str, 'research-papers')
+AZURE_COMMUNICATION_CONNECTION_STRING = _get('AZURE_COMMUNICATION_CONNECTION_STRING', str, '')
 
 # CloudWatch Configuration
-CLOUDWATCH_NAMESPACE = os.environ.get('CLOUDWATCH_NAMESPACE', 'ResearchPaperProcessing')
-ENABLE_CLOUDWATCH = os.environ.get('ENABLE_CLOUDWATCH', 'true').lower() == 'true'
+CLOUDWATCH_NAMESPACE = _get('CLOUDWATCH_NAMESPACE', str, 'ResearchPaperProcessing')
+ENABLE_CLOUDWATCH = _get('ENABLE_CLOUDWATCH', _flag, 'true')
 
 # Retry Configuration
-MAX_RETRIES = int(os.environ.get('MAX_RETRIES', '3'))
-RETRY_MIN_WAIT = int(os.environ.get('RETRY_MIN_WAIT', '4'))
-RETRY_MAX_WAIT = int(os.environ.get('RETRY_MAX_WAIT', '10'))
+MAX_RETRIES = _get('MAX_RETRIES', int, '3')
+RETRY_MIN_WAIT = _get('RETRY_MIN_WAIT', int, '4')
+RETRY_MAX_WAIT = _get('RETRY_MAX_WAIT', int, '10')
 
 # Quality Check Configuration
-MIN_QUALITY_SCORE = float(os.environ.get('MIN_QUALITY_SCORE', '0.5'))
-ENABLE_QUALITY_CHECKS = os.environ.get('ENABLE_QUALITY_CHECKS', 'true').lower() == 'true'
+MIN_QUALITY_SCORE = _get('MIN_QUALITY_SCORE', float, '0.5')
+ENABLE_QUALITY_CHECKS = _get('ENABLE_QUALITY_CHECKS', _flag, 'true')
 
 # Biomarker Aggregation Configuration
-MIN_PAPERS_FOR_HIGH_CONFIDENCE = int(os.environ.get('MIN_PAPERS_FOR_HIGH_CONFIDENCE', '2'))
+MIN_PAPERS_FOR_HIGH_CONFIDENCE = _get('MIN_PAPERS_FOR_HIGH_CONFIDENCE', int, '2')
 
 # Cost Estimation (per million tokens)
-CLAUDE_INPUT_COST = float(os.environ.get('CLAUDE_INPUT_COST', '3.0'))
-CLAUDE_OUTPUT_COST = float(os.environ.get('CLAUDE_OUTPUT_COST', '15.0'))
-OPENAI_INPUT_COST = float(os.environ.get('OPENAI_INPUT_COST', '2.5'))
-OPENAI_OUTPUT_COST = float(os.environ.get('OPENAI_OUTPUT_COST', '10.0'))
+CLAUDE_INPUT_COST = _get('CLAUDE_INPUT_COST', float, '3.0')
+CLAUDE_OUTPUT_COST = _get('CLAUDE_OUTPUT_COST', float, '15.0')
+OPENAI_INPUT_COST = _get('OPENAI_INPUT_COST', float, '2.5')
+OPENAI_OUTPUT_COST = _get('OPENAI_OUTPUT_COST', float, '10.0')
 
 # Logging Configuration
-LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
-LOG_FILE = os.environ.get('LOG_FILE', '')
+LOG_LEVEL = _get('LOG_LEVEL', str, 'INFO')
+LOG_FILE = _get('LOG_FILE', str, '')
 
+@lru_cache(maxsize=1)
 def validate_config():
-    """Validate configuration settings"""
+    """Validate configuration settings (cached; settings are fixed after import)"""
     errors = []
     
     # Check API keys
@@ -113,8 +128,9 @@ def validate_config():
     
     return errors
 
+@lru_cache(maxsize=1)
 def get_config_summary():
-    """Get a summary of current configuration"""
+    """Get a summary of current configuration (cached; treat as read-only)"""
     return {
         'platform': os.name,
         'provider': DEFAULT_PROVIDER,
@@ -130,6 +146,11 @@ def get_config_summary():
         'pubmed_email': PUBMED_EMAIL
     }
 
+def _invalidate_config_cache():
+    """Clear cached validation/summary results (e.g. after patching settings in tests)"""
+    validate_config.cache_clear()
+    get_config_summary.cache_clear()
+
 if __name__ == '__main__':
     # Validate and print configuration
     print("Current Configuration:")
@@ -6,17 +6,41 @@ Triggered by S3 upload events.
 import json
 import os
 import boto3
+import orjson
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+import threading
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
 from datetime import datetime
 from extract_text import extract_text_from_pdf
 from langchain_pipeline import process_paper_with_langchain
-from tenacity import retry, stop_after_attempt, wait_exponential
 
-# Initialize AWS clients
-s3_client = boto3.client('s3')
-cloudwatch = boto3.client('cloudwatch')
-sqs_client = boto3.client('sqs')
+# Initialize AWS clients once per container. botocore's adaptive retry mode
+# replaces per-call retry wrappers, and the shared connection pool keeps
+# HTTPS connections alive across the download and both uploads.
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=10,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+aws_session = boto3.session.Session()
+aws_session.get_credentials()  # Resolve credentials during cold start, not on first request
+s3_client = aws_session.client('s3', config=AWS_CLIENT_CONFIG)
+cloudwatch = aws_session.client('cloudwatch', config=AWS_CLIENT_CONFIG)
+sqs_client = aws_session.client('sqs', config=AWS_CLIENT_CONFIG)
+
+MULTIPART_THRESHOLD = 8 * 1024 * 1024  # Bytes; smaller payloads use a single PutObject
+S3_TRANSFER_CONFIG = TransferConfig(multipart_threshold=MULTIPART_THRESHOLD, max_concurrency=4)
+
+# Maximum SQS records processed concurrently by batch_handler
+BATCH_MAX_WORKERS = 10
+
+# Reused across warm invocations to run the independent S3 uploads in parallel
+# (two uploads per paper, for up to BATCH_MAX_WORKERS papers at once)
+upload_executor = ThreadPoolExecutor(max_workers=2 * BATCH_MAX_WORKERS)
 
 # Configuration from environment variables
 RESULTS_BUCKET = os.environ.get('RESULTS_BUCKET')
@@ -24,26 +48,44 @@ PROVIDER = os.environ.get('PROVIDER', 'anthropic')
 API_KEY = os.environ.get('ANTHROPIC_API_KEY') if PROVIDER == 'anthropic' else os.environ.get('OPENAI_API_KEY')
 DLQ_URL = os.environ.get('DLQ_URL')  # Dead Letter Queue for failed processing
 NAMESPACE = 'ResearchPaperProcessing'
+PROVIDER_DIMENSIONS = ({'Name': 'Provider', 'Value': PROVIDER},)  # Shared by every per-provider metric
+MAX_METRICS_PER_CALL = 20  # PutMetricData limit per request
+
+# Metrics buffered during an invocation, sent in one batch by flush_metrics()
+_METRIC_BUFFER = []
+_METRIC_LOCK = threading.Lock()
 
 def send_cloudwatch_metric(metric_name, value, unit='Count', dimensions=None):
-    """Send metrics to CloudWatch"""
+    """Queue a metric for CloudWatch (sent by flush_metrics)"""
+    metric_data = {
+        'MetricName': metric_name,
+        'Value': value,
+        'Unit': unit,
+        'Timestamp': time.time()  # Epoch seconds; botocore serializes these directly
+    }
+    
+    if dimensions:
+        metric_data['Dimensions'] = dimensions
+    
+    with _METRIC_LOCK:
+        _METRIC_BUFFER.append(metric_data)
+
+def flush_metrics():
+    """Send all buffered metrics to CloudWatch in batches of up to 20"""
+    # Take the pending metrics under the lock so concurrent handlers
+    # (see batch_handler) never lose or double-send an entry
+    with _METRIC_LOCK:
+        metrics = _METRIC_BUFFER[:]
+        _METRIC_BUFFER.clear()
+    
     try:
-        metric_data = {
-            'MetricName': metric_name,
-            'Value': value,
-            'Unit': unit,
-            'Timestamp': datetime.utcnow()
-        }
-        
-        if dimensions:
-            metric_data['Dimensions'] = dimensions
-        
-        cloudwatch.put_metric_data(
-            Namespace=NAMESPACE,
-            MetricData=[metric_data]
-        )
+        for i in range(0, len(metrics), MAX_METRICS_PER_CALL):
+            cloudwatch.put_metric_data(
+                Namespace=NAMESPACE,
+                MetricData=metrics[i:i + MAX_METRICS_PER_CALL]
+            )
     except Exception as e:
-        print(f"Error sending CloudWatch metric: {e}")
+        print(f"Error sending CloudWatch metrics: {e}")
 
 def send_to_dlq(message, error):
     """Send failed processing to Dead Letter Queue"""
@@ -53,36 +95,44 @@ def send_to_dlq(message, error):
     try:
         sqs_client.send_message(
             QueueUrl=DLQ_URL,
-            MessageBody=json.dumps({
+            MessageBody=orjson.dumps({
                 'original_message': message,
                 'error': str(error),
                 'timestamp': datetime.utcnow().isoformat()
-            })
+            }).decode()
         )
     except Exception as e:
         print(f"Error sending to DLQ: {e}")
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10)
-)
-def download_from_s3(bucket, key, local_path):
-    """Download file from S3 with retry logic"""
-    s3_client.download_file(bucket, key, local_path)
-    return True
+def download_from_s3(bucket, key):
+    """Read an object from S3 into memory (retried by botocore)"""
+    return s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10)
-)
-def upload_to_s3(bucket, key, data):
-    """Upload results to S3 with retry logic"""
-    s3_client.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=data,
-        ContentType='application/json'
-    )
+def upload_to_s3(bucket, key, data, content_type='application/json'):
+    """
+    Upload results to S3 (retried by botocore).
+    
+    Payloads above MULTIPART_THRESHOLD are streamed from an in-memory buffer
+    in multipart chunks instead of being sent as a single request body.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    
+    if len(data) < MULTIPART_THRESHOLD:
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type
+        )
+    else:
+        s3_client.upload_fileobj(
+            BytesIO(data),
+            bucket,
+            key,
+            ExtraArgs={'ContentType': content_type},
+            Config=S3_TRANSFER_CONFIG
+        )
     return True
 
 def lambda_handler(event, context):
@@ -104,37 +154,42 @@ def lambda_handler(event, context):
         bucket = record['s3']['bucket']['name']
         key = record['s3']['object']['key']
         
-        print(f"Processing file: s3://{bucket}/{key}")
+        # Derive names and URIs from the key once
+        key_path = PurePosixPath(key)
+        filename = key_path.name
+        source_uri = f"s3://{bucket}/{key}"
+        text_key = f"extracted_texts/{key_path.stem}.txt"
+        results_key = f"results/{key_path.stem}.json"
+        results_uri = f"s3://{RESULTS_BUCKET}/{results_key}"
+        source_object = {'bucket': bucket, 'key': key}
+        
+        print(f"Processing file: {source_uri}")
         
         # Send metric for processing start
         send_cloudwatch_metric(
             'ProcessingStarted',
             1,
-            dimensions=[{'Name': 'Provider', 'Value': PROVIDER}]
+            dimensions=PROVIDER_DIMENSIONS
         )
         
-        # Create local path in /tmp (Lambda's writable directory)
-        filename = key.split('/')[-1]
-        local_path = f'/tmp/{filename}'
-        
-        # Download PDF from S3
+        # Download PDF from S3 straight into memory (no /tmp round-trip)
         try:
-            download_from_s3(bucket, key, local_path)
+            pdf_bytes = download_from_s3(bucket, key)
         except Exception as e:
             error_msg = f"Failed to download from S3: {str(e)}"
             print(error_msg)
             send_cloudwatch_metric('DownloadFailure', 1)
-            send_to_dlq({'bucket': bucket, 'key': key}, error_msg)
+            send_to_dlq(source_object, error_msg)
             raise
         
         # Extract text from PDF
-        extraction_result = extract_text_from_pdf(local_path)
+        extraction_result = extract_text_from_pdf(BytesIO(pdf_bytes))
         
         if not extraction_result['success']:
             error_msg = f"Text extraction failed: {extraction_result['error']}"
             print(error_msg)
             send_cloudwatch_metric('ExtractionFailure', 1)
-            send_to_dlq({'bucket': bucket, 'key': key}, error_msg)
+            send_to_dlq(source_object, error_msg)
             
             return {
                 'statusCode': 500,
@@ -144,17 +199,6 @@ def lambda_handler(event, context):
                 })
             }
         
-        # Save extracted text to S3
-        text_key = f"extracted_texts/{filename.replace('.pdf', '.txt')}"
-        try:
-            upload_to_s3(
-                RESULTS_BUCKET,
-                text_key,
-                extraction_result['text']
-            )
-        except Exception as e:
-            print(f"Warning: Failed to upload extracted text: {e}")
-        
         # Process paper with LangChain
         try:
             result = process_paper_with_langchain(
@@ -167,23 +211,37 @@ def lambda_handler(event, context):
             error_msg = f"LLM processing failed: {str(e)}"
             print(error_msg)
             send_cloudwatch_metric('ProcessingFailure', 1)
-            send_to_dlq({'bucket': bucket, 'key': key}, error_msg)
+            send_to_dlq(source_object, error_msg)
             raise
         
         # Add extraction metadata
         result['num_pages'] = extraction_result['num_pages']
         result['text_length'] = len(extraction_result['text'])
-        result['s3_source'] = f"s3://{bucket}/{key}"
+        result['s3_source'] = source_uri
         result['processing_timestamp'] = datetime.utcnow().isoformat()
         
-        # Upload results to S3
-        results_key = f"results/{filename.replace('.pdf', '.json')}"
+        # Upload extracted text and results to S3 concurrently
+        text_upload = upload_executor.submit(
+            upload_to_s3,
+            RESULTS_BUCKET,
+            text_key,
+            extraction_result['text'],
+            'text/plain; charset=utf-8'
+        )
+        results_upload = upload_executor.submit(
+            upload_to_s3,
+            RESULTS_BUCKET,
+            results_key,
+            orjson.dumps(result)
+        )
+        
         try:
-            upload_to_s3(
-                RESULTS_BUCKET,
-                results_key,
-                json.dumps(result, indent=2)
-            )
+            text_upload.result()
+        except Exception as e:
+            print(f"Warning: Failed to upload extracted text: {e}")
+        
+        try:
+            results_upload.result()
         except Exception as e:
             error_msg = f"Failed to upload results: {str(e)}"
             print(error_msg)
@@ -197,14 +255,14 @@ def lambda_handler(event, context):
         send_cloudwatch_metric(
             'ProcessingSuccess',
             1,
-            dimensions=[{'Name': 'Provider', 'Value': PROVIDER}]
+            dimensions=PROVIDER_DIMENSIONS
         )
         
         send_cloudwatch_metric(
             'ProcessingDuration',
             processing_time,
             unit='Seconds',
-            dimensions=[{'Name': 'Provider', 'Value': PROVIDER}]
+            dimensions=PROVIDER_DIMENSIONS
         )
         
         if result.get('quality_score'):
@@ -212,7 +270,7 @@ def lambda_handler(event, context):
                 'QualityScore',
                 result['quality_score'],
                 unit='None',
-                dimensions=[{'Name': 'Provider', 'Value': PROVIDER}]
+                dimensions=PROVIDER_DIMENSIONS
             )
         
         # Count biomarkers extracted
@@ -220,24 +278,18 @@ def lambda_handler(event, context):
         send_cloudwatch_metric(
             'BiomarkersExtracted',
             num_biomarkers,
-            dimensions=[{'Name': 'Provider', 'Value': PROVIDER}]
+            dimensions=PROVIDER_DIMENSIONS
         )
         
-        # Cleanup local file
-        try:
-            os.remove(local_path)
-        except Exception as e:
-            print(f"Warning: Failed to cleanup local file: {e}")
-        
         print(f"Successfully processed {filename} in {processing_time:.2f}s")
-        print(f"Results saved to: s3://{RESULTS_BUCKET}/{results_key}")
+        print(f"Results saved to: {results_uri}")
         
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Successfully processed paper',
                 'filename': filename,
-                'results_location': f"s3://{RESULTS_BUCKET}/{results_key}",
+                'results_location': results_uri,
                 'processing_time': processing_time,
                 'quality_score': result.get('quality_score'),
                 'biomarkers_found': num_biomarkers,
@@ -250,7 +302,7 @@ def lambda_handler(event, context):
         send_cloudwatch_metric(
             'ProcessingFailure',
             1,
-            dimensions=[{'Name': 'Provider', 'Value': PROVIDER}]
+            dimensions=PROVIDER_DIMENSIONS
         )
         
         error_msg = str(e)
@@ -263,11 +315,51 @@ def lambda_handler(event, context):
                 'timestamp': datetime.utcnow().isoformat()
             })
         }
+    
+    finally:
+        # Single PutMetricData round-trip for everything recorded above
+        flush_metrics()
+
+def process_sqs_record(record, context):
+    """
+    Process a single SQS record by replaying it through lambda_handler.
+    
+    Args:
+        record: SQS record whose body holds the S3 bucket and key
+        context: Lambda context object
+        
+    Returns:
+        True if the paper was processed successfully
+    """
+    try:
+        # Parse SQS message
+        message_body = orjson.loads(record['body'])
+        
+        # Create S3 event format
+        s3_event = {
+            'Records': [{
+                's3': {
+                    'bucket': {'name': message_body['bucket']},
+                    'object': {'key': message_body['key']}
+                }
+            }]
+        }
+        
+        # Process the paper
+        result = lambda_handler(s3_event, context)
+        return result['statusCode'] == 200
+        
+    except Exception as e:
+        print(f"Error processing message {record['messageId']}: {e}")
+        return False
 
 def batch_handler(event, context):
     """
     Handler for processing batches of papers from SQS.
     
+    Records are processed concurrently since each one is dominated by
+    S3 and LLM API I/O.
+    
     Args:
         event: SQS event containing multiple messages
         context: Lambda context object
@@ -275,37 +367,19 @@ def batch_handler(event, context):
     Returns:
         Batch item failures for retry
     """
-    batch_item_failures = []
+    records = event['Records']
+    if not records:
+        return {'batchItemFailures': []}
     
-    for record in event['Records']:
-        try:
-            # Parse SQS message
-            message_body = json.loads(record['body'])
-            
-            # Create S3 event format
-            s3_event = {
-                'Records': [{
-                    's3': {
-                        'bucket': {'name': message_body['bucket']},
-                        'object': {'key': message_body['key']}
-                    }
-                }]
-            }
-            
-            # Process the paper
-            result = lambda_handler(s3_event, context)
-            
-            if result['statusCode'] != 200:
-                batch_item_failures.append({
-                    'itemIdentifier': record['messageId']
-                })
-                
-        except Exception as e:
-            print(f"Error processing message {record['messageId']}: {e}")
-            batch_item_failures.append({
-                'itemIdentifier': record['messageId']
-            })
+    with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(records))) as executor:
+        outcomes = list(executor.map(lambda record: process_sqs_record(record, context), records))
+    
+    batch_item_failures = [
+        {'itemIdentifier': record['messageId']}
+        for record, succeeded in zip(records, outcomes)
+        if not succeeded
+    ]
     
     return {
         'batchItemFailures': batch_item_failures
-    }
\ No newline at end of file
+    }
@@ -3,22 +3,27 @@ Simple monitoring dashboard to view processing metrics and CloudWatch data.
 Run with: streamlit run monitoring_dashboard.py
 """
 
+import importlib.util
+
 try:
     import streamlit as st
     import pandas as pd
-    import plotly.express as px
-    import plotly.graph_objects as go
     from datetime import datetime, timedelta
     import json
+    import os
     from pathlib import Path
-    import boto3
     
     STREAMLIT_AVAILABLE = True
 except ImportError:
     STREAMLIT_AVAILABLE = False
     print("Streamlit not installed. Install with: pip install streamlit plotly")
 
-if not STREAMLIT_AVAILABLE:
+# plotly and boto3 are imported lazily where they are used
+PLOTLY_AVAILABLE = importlib.util.find_spec('plotly') is not None
+if not PLOTLY_AVAILABLE:
+    print("Plotly not installed. Install with: pip install plotly")
+
+if not (STREAMLIT_AVAILABLE and PLOTLY_AVAILABLE):
     exit(1)
 
 st.set_page_config(
@@ -37,69 +42,128 @@ use_cloudwatch = st.sidebar.checkbox("Fetch CloudWatch Metrics", value=False)
 provider = st.sidebar.selectbox("Provider Filter", ["All", "anthropic", "openai"])
 
 # Helper functions
+def load_plotting():
+    """Import plotly on first chart render instead of at startup"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    return px, go
+
+@st.cache_data(ttl=30)
+def list_output_files(output_dir, pattern):
+    """List files in output_dir matching pattern (cached across reruns)"""
+    return sorted(str(p) for p in Path(output_dir).glob(pattern))
+
+@st.cache_data(ttl=60)
 def load_local_metrics(output_dir):
     """Load metrics from local JSON files"""
-    metrics_files = list(Path(output_dir).glob("metrics_*.json"))
+    metrics_files = list_output_files(output_dir, "metrics_*.json")
     if not metrics_files:
         return None
     
     all_metrics = []
-    for file in sorted(metrics_files, reverse=True)[:10]:  # Last 10 runs
+    for file in reversed(metrics_files[-10:]):  # Last 10 runs, newest first
         with open(file, 'r') as f:
             metrics = json.load(f)
-            metrics['file'] = file.name
+            metrics['file'] = Path(file).name
             all_metrics.append(metrics)
     
     return pd.DataFrame(all_metrics)
 
+# Only the columns the dashboard displays or aggregates
+RESULT_COLUMNS = ['filename', 'status', 'api_provider', 'title', 'authors', 'year', 'quality_score', 'num_biomarkers']
+
 def load_results(output_dir, provider_filter="All"):
     """Load processing results from CSV files"""
-    csv_files = list(Path(output_dir).glob("paper_summaries_*.csv"))
+    csv_files = list_output_files(output_dir, "paper_summaries_*.csv")
     
     if not csv_files:
         return None
     
+    # Key the cache on modification times so rewritten CSVs are re-read
+    file_stamps = tuple((f, os.stat(f).st_mtime) for f in csv_files)
+    return read_results_csvs(file_stamps, provider_filter)
+
+@st.cache_data(show_spinner=False)
+def read_results_csvs(file_stamps, provider_filter="All"):
+    """Read and concatenate result CSVs (cached per set of file mtimes)"""
     all_results = []
-    for csv_file in csv_files:
+    for csv_file, _ in file_stamps:
         try:
-            df = pd.read_csv(csv_file)
-            if provider_filter != "All":
-                df = df[df['api_provider'] == provider_filter]
-            all_results.append(df)
+            # Older CSVs may lack some columns; the pyarrow engine cannot take a callable usecols
+            header = pd.read_csv(csv_file, nrows=0).columns
+            usecols = [col for col in RESULT_COLUMNS if col in header]
+            all_results.append(pd.read_csv(csv_file, usecols=usecols, engine='pyarrow'))
         except Exception as e:
-            st.sidebar.error(f"Error loading {csv_file.name}: {e}")
+            st.sidebar.error(f"Error loading {Path(csv_file).name}: {e}")
+    
+    if not all_results:
+        return None
     
-    if all_results:
-        return pd.concat(all_results, ignore_index=True)
-    return None
+    df = pd.concat(all_results, ignore_index=True)
+    if provider_filter != "All" and 'api_provider' in df.columns:
+        df = df[df['api_provider'] == provider_filter]
+    return df
+
+# CloudWatch metrics shown on the dashboard; counters are summed, the rest averaged
+CLOUDWATCH_METRICS = [
+    'ProcessingSuccess',
+    'ProcessingFailure',
+    'AverageQualityScore',
+    'TotalBiomarkers'
+]
+SUM_METRICS = ['ProcessingSuccess', 'ProcessingFailure', 'TotalBiomarkers']
 
 def get_cloudwatch_metrics(namespace='ResearchPaperProcessing', hours=24):
-    """Fetch metrics from CloudWatch"""
+    """Fetch metrics from CloudWatch in a single batched get_metric_data request"""
     try:
+        import boto3
         cloudwatch = boto3.client('cloudwatch')
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(hours=hours)
         
-        metrics_to_fetch = [
-            'ProcessingSuccess',
-            'ProcessingFailure',
-            'AverageQualityScore',
-            'TotalBiomarkers'
+        dimensions = [{'Name': 'Provider', 'Value': provider.lower()}] if provider != "All" else []
+        
+        queries = [
+            {
+                'Id': f'm{i}',
+                'Label': metric_name,
+                'MetricStat': {
+                    'Metric': {
+                        'Namespace': namespace,
+                        'MetricName': metric_name,
+                        'Dimensions': dimensions
+                    },
+                    'Period': 3600,  # 1 hour
+                    'Stat': 'Sum' if metric_name in SUM_METRICS else 'Average'
+                }
+            }
+            for i, metric_name in enumerate(CLOUDWATCH_METRICS)
         ]
+        query_metrics = {query['Id']: query['MetricStat'] for query in queries}
         
+        timestamps = {query_id: [] for query_id in query_metrics}
+        values = {query_id: [] for query_id in query_metrics}
+        request = {
+            'MetricDataQueries': queries,
+            'StartTime': start_time,
+            'EndTime': end_time
+        }
+        while True:
+            response = cloudwatch.get_metric_data(**request)
+            for result in response['MetricDataResults']:
+                timestamps[result['Id']].extend(result['Timestamps'])
+                values[result['Id']].extend(result['Values'])
+            if not response.get('NextToken'):
+                break
+            request['NextToken'] = response['NextToken']
+        
+        # Same shape as get_metric_statistics datapoints: Timestamp + stat column
         all_data = {}
-        for metric_name in metrics_to_fetch:
-            response = cloudwatch.get_metric_statistics(
-                Namespace=namespace,
-                MetricName=metric_name,
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=3600,  # 1 hour
-                Statistics=['Sum', 'Average'],
-                Dimensions=[{'Name': 'Provider', 'Value': provider.lower()}] if provider != "All" else []
-            )
-            
-            all_data[metric_name] = pd.DataFrame(response['Datapoints'])
+        for query_id, metric_stat in query_metrics.items():
+            all_data[metric_stat['Metric']['MetricName']] = pd.DataFrame({
+                'Timestamp': timestamps[query_id],
+                metric_stat['Stat']: values[query_id]
+            })
         
         return all_data
     except Exception as e:
@@ -112,6 +176,8 @@ results_df = load_results(output_dir, provider)
 
 # Main dashboard
 if metrics_df is not None and not metrics_df.empty:
+    px, go = load_plotting()
+    
     # Key metrics
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -211,6 +277,7 @@ if metrics_df is not None and not metrics_df.empty:
 
 # Results analysis
 if results_df is not None and not results_df.empty:
+    px, go = load_plotting()
     st.subheader("📊 Results Analysis")
     
     col1, col2 = st.columns(2)
@@ -319,12 +386,13 @@ if use_cloudwatch:
     
     cw_data = get_cloudwatch_metrics()
     if cw_data:
+        px, go = load_plotting()
         for metric_name, df in cw_data.items():
             if not df.empty:
                 df['Timestamp'] = pd.to_datetime(df['Timestamp'])
                 df = df.sort_values('Timestamp')
                 
-                stat = 'Sum' if metric_name in ['ProcessingSuccess', 'ProcessingFailure', 'TotalBiomarkers'] else 'Average'
+                stat = 'Sum' if metric_name in SUM_METRICS else 'Average'
                 
                 fig = px.line(
                     df,
@@ -3,28 +3,72 @@ Biomarker aggregation module for cross-paper analysis.
 """
 
 import json
+import os
+import orjson
 import re
+from array import array
+from heapq import nlargest
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# Separators stripped from biomarker names, and type prefixes dropped afterwards
+_SEP_RE = re.compile(r'[-_\s]')
+_PREFIX_RE = re.compile(r'^(?:GENE|PROTEIN|BIOMARKER):')
+
 class BiomarkerAggregator:
     """Aggregate and analyze biomarker associations across multiple papers"""
     
     def __init__(self):
-        self.biomarkers = defaultdict(lambda: {
-            'normalized_name': '',
-            'variants': set(),
-            'diseases': defaultdict(lambda: {
-                'papers': set(),
-                'association_types': set(),
-                'evidence_levels': set()
-            }),
-            'total_mentions': 0,
-            'first_seen': None,
-            'last_seen': None
-        })
+        # Biomarkers and diseases are stored column-wise, indexed by integer
+        # ids assigned in first-seen order, instead of as nested dicts
+        self._name_to_id: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._variants: List[Set[str]] = []
+        self._mentions = array('I')
+        self._first_seen: List[str] = []
+        self._last_seen: List[str] = []
+        self._bio_diseases: List[List[int]] = []  # Disease ids per biomarker, in first-seen order
+        
+        self._disease_to_id: Dict[str, int] = {}  # Keyed by every spelling seen
+        self._diseases: List[str] = []  # Lowercased names
+        
+        # Per (biomarker id, disease id) association
+        self._assoc_papers: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        self._assoc_types: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        self._assoc_evidence: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+    
+    def _biomarker_id(self, normalized: str, timestamp: str) -> int:
+        """Return the id for a normalized biomarker name, registering it if new"""
+        bio_id = self._name_to_id.get(normalized)
+        if bio_id is None:
+            bio_id = self._name_to_id[normalized] = len(self._names)
+            self._names.append(normalized)
+            self._variants.append(set())
+            self._mentions.append(0)
+            self._first_seen.append(timestamp)
+            self._last_seen.append(timestamp)
+            self._bio_diseases.append([])
+        return bio_id
+    
+    def _disease_id(self, disease: str) -> int:
+        """
+        Return the id for a disease name, registering it if new.
+        
+        Names are matched case-insensitively. Each raw spelling is remembered,
+        so lower() only runs the first time a spelling is seen.
+        """
+        disease_id = self._disease_to_id.get(disease)
+        if disease_id is None:
+            lowered = disease.lower()
+            disease_id = self._disease_to_id.get(lowered)
+            if disease_id is None:
+                disease_id = self._disease_to_id[lowered] = len(self._diseases)
+                self._diseases.append(lowered)
+            self._disease_to_id[disease] = disease_id
+        return disease_id
     
     def normalize_biomarker_name(self, name: str) -> str:
         """
@@ -40,12 +84,16 @@ class BiomarkerAggregator:
         if not name:
             return ""
         
+        # Already normalized (uppercase, no separators or prefix)
+        if name.isascii() and name.isalnum() and name.isupper():
+            return name
+        
         # Remove common separators and convert to uppercase
-        normalized = re.sub(r'[-_\s]', '', name).upper()
+        normalized = _SEP_RE.sub('', name).upper()
         
         # Handle common patterns
         # Gene names: remove prefixes like "gene:", "protein:"
-        normalized = re.sub(r'^(GENE|PROTEIN|BIOMARKER):', '', normalized)
+        normalized = _PREFIX_RE.sub('', normalized)
         
         return normalized
     
@@ -65,6 +113,10 @@ class BiomarkerAggregator:
         
         timestamp = datetime.now().isoformat()
         
+        # Extraction sometimes repeats an identical biomarker entry within a
+        # paper; only its first occurrence is counted
+        seen = set()
+        
         for biomarker in biomarkers_data:
             if isinstance(biomarker, dict):
                 raw_name = biomarker.get('name', '')
@@ -77,26 +129,65 @@ class BiomarkerAggregator:
             if not raw_name:
                 continue
             
+            entry_key = (raw_name, tuple(diseases), assoc_type, evidence)
+            if entry_key in seen:
+                continue
+            seen.add(entry_key)
+            
             # Normalize name
             normalized = self.normalize_biomarker_name(raw_name)
             
-            # Update biomarker data
-            bio_data = self.biomarkers[normalized]
-            bio_data['normalized_name'] = normalized
-            bio_data['variants'].add(raw_name)
-            bio_data['total_mentions'] += 1
-            
-            if bio_data['first_seen'] is None:
-                bio_data['first_seen'] = timestamp
-            bio_data['last_seen'] = timestamp
+            # Update biomarker data (first_seen is set when it is registered)
+            bio_id = self._biomarker_id(normalized, timestamp)
+            self._variants[bio_id].add(raw_name)
+            self._mentions[bio_id] += 1
+            self._last_seen[bio_id] = timestamp
             
             # Add disease associations
             for disease in diseases:
                 if disease:
-                    disease_data = bio_data['diseases'][disease.lower()]
-                    disease_data['papers'].add(filename)
-                    disease_data['association_types'].add(assoc_type)
-                    disease_data['evidence_levels'].add(evidence)
+                    key = (bio_id, self._disease_id(disease))
+                    papers = self._assoc_papers.get(key)
+                    if papers is None:
+                        papers = self._assoc_papers[key]
+                        self._bio_diseases[bio_id].append(key[1])
+                    papers.add(filename)
+                    self._assoc_types[key].add(assoc_type)
+                    self._assoc_evidence[key].add(evidence)
+    
+    def merge(self, other: 'BiomarkerAggregator') -> 'BiomarkerAggregator':
+        """
+        Fold another aggregator's data into this one.
+        
+        Merging aggregators built from consecutive slices of a paper list,
+        in order, gives the same biomarkers and associations as adding all
+        papers to a single aggregator.
+        
+        Args:
+            other: Aggregator to merge in (left unchanged)
+            
+        Returns:
+            This aggregator
+        """
+        for other_id, name in enumerate(other._names):
+            bio_id = self._biomarker_id(name, other._first_seen[other_id])
+            self._variants[bio_id] |= other._variants[other_id]
+            self._mentions[bio_id] += other._mentions[other_id]
+            self._first_seen[bio_id] = min(self._first_seen[bio_id], other._first_seen[other_id])
+            self._last_seen[bio_id] = max(self._last_seen[bio_id], other._last_seen[other_id])
+            
+            for other_disease_id in other._bio_diseases[other_id]:
+                other_key = (other_id, other_disease_id)
+                key = (bio_id, self._disease_id(other._diseases[other_disease_id]))
+                papers = self._assoc_papers.get(key)
+                if papers is None:
+                    papers = self._assoc_papers[key]
+                    self._bio_diseases[bio_id].append(key[1])
+                papers |= other._assoc_papers[other_key]
+                self._assoc_types[key] |= other._assoc_types[other_key]
+                self._assoc_evidence[key] |= other._assoc_evidence[other_key]
+        
+        return self
     
     def get_summary(self) -> Dict:
         """
@@ -105,37 +196,30 @@ class BiomarkerAggregator:
         Returns:
             Dictionary with summary stats
         """
-        total_biomarkers = len(self.biomarkers)
-        total_associations = sum(
-            len(bio['diseases']) 
-            for bio in self.biomarkers.values()
-        )
+        total_biomarkers = len(self._names)
+        total_associations = len(self._assoc_papers)
         
         # Top biomarkers by mention count
-        top_biomarkers = sorted(
-            [(name, data['total_mentions']) for name, data in self.biomarkers.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
+        top_biomarkers = nlargest(10, range(total_biomarkers), key=self._mentions.__getitem__)
         
         # Top diseases
         all_diseases = defaultdict(int)
-        for bio_data in self.biomarkers.values():
-            for disease in bio_data['diseases'].keys():
-                all_diseases[disease] += len(bio_data['diseases'][disease]['papers'])
+        for bio_id, disease_ids in enumerate(self._bio_diseases):
+            for disease_id in disease_ids:
+                all_diseases[disease_id] += len(self._assoc_papers[bio_id, disease_id])
         
-        top_diseases = sorted(all_diseases.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_diseases = nlargest(10, all_diseases.items(), key=lambda x: x[1])
         
         return {
             'total_unique_biomarkers': total_biomarkers,
             'total_biomarker_disease_associations': total_associations,
             'top_biomarkers': [
-                {'name': name, 'mentions': count} 
-                for name, count in top_biomarkers
+                {'name': self._names[bio_id], 'mentions': self._mentions[bio_id]} 
+                for bio_id in top_biomarkers
             ],
             'top_diseases': [
-                {'disease': disease, 'association_count': count}
-                for disease, count in top_diseases
+                {'disease': self._diseases[disease_id], 'association_count': count}
+                for disease_id, count in top_diseases
             ]
         }
     
@@ -151,55 +235,77 @@ class BiomarkerAggregator:
         """
         normalized = self.normalize_biomarker_name(biomarker_name)
         
-        if normalized not in self.biomarkers:
+        bio_id = self._name_to_id.get(normalized)
+        if bio_id is None:
             return None
         
-        bio_data = self.biomarkers[normalized]
-        
+        return self._biomarker_record(bio_id)
+    
+    def _biomarker_record(self, bio_id: int) -> Dict:
+        """Build the serializable details record for a biomarker id"""
         # Convert sets to lists for JSON serialization
         diseases_list = []
-        for disease, data in bio_data['diseases'].items():
+        for disease_id in self._bio_diseases[bio_id]:
+            key = (bio_id, disease_id)
             diseases_list.append({
-                'disease': disease,
-                'paper_count': len(data['papers']),
-                'papers': list(data['papers']),
-                'association_types': list(data['association_types']),
-                'evidence_levels': list(data['evidence_levels'])
+                'disease': self._diseases[disease_id],
+                'paper_count': len(self._assoc_papers[key]),
+                'papers': list(self._assoc_papers[key]),
+                'association_types': list(self._assoc_types[key]),
+                'evidence_levels': list(self._assoc_evidence[key])
             })
         
         return {
-            'normalized_name': bio_data['normalized_name'],
-            'name_variants': list(bio_data['variants']),
-            'total_mentions': bio_data['total_mentions'],
+            'normalized_name': self._names[bio_id],
+            'name_variants': list(self._variants[bio_id]),
+            'total_mentions': self._mentions[bio_id],
             'disease_associations': diseases_list,
-            'first_seen': bio_data['first_seen'],
-            'last_seen': bio_data['last_seen']
+            'first_seen': self._first_seen[bio_id],
+            'last_seen': self._last_seen[bio_id]
         }
     
-    def export_to_json(self, output_path: str):
+    def export_to_json(self, output_path: str, indent: bool = False):
         """
         Export aggregated biomarker data to JSON file.
         
+        Compact output is streamed one biomarker record at a time, so the
+        full document is never built in memory.
+        
         Args:
             output_path: Path to save JSON file
+            indent: Pretty-print with 2-space indentation (builds the whole
+                    document in memory first)
         """
-        # Convert to serializable format
-        export_data = {
-            'metadata': {
-                'export_date': datetime.now().isoformat(),
-                'total_biomarkers': len(self.biomarkers)
-            },
-            'summary': self.get_summary(),
-            'biomarkers': {}
+        metadata = {
+            'export_date': datetime.now().isoformat(),
+            'total_biomarkers': len(self._names)
         }
         
-        for name in self.biomarkers.keys():
-            export_data['biomarkers'][name] = self.get_biomarker_details(name)
-        
         os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        with open(output_path, 'wb') as f:
+            if indent:
+                export_data = {
+                    'metadata': metadata,
+                    'summary': self.get_summary(),
+                    'biomarkers': {
+                        name: self._biomarker_record(bio_id)
+                        for bio_id, name in enumerate(self._names)
+                    }
+                }
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(b'{"metadata":' + orjson.dumps(metadata))
+                f.write(b',"summary":' + orjson.dumps(self.get_summary()))
+                f.write(b',"biomarkers":{')
+                
+                # Names are already normalized, so build records by id directly
+                for bio_id, name in enumerate(self._names):
+                    if bio_id:
+                        f.write(b',')
+                    f.write(orjson.dumps(name) + b':' + orjson.dumps(self._biomarker_record(bio_id)))
+                
+                f.write(b'}}')
         
         print(f"Biomarker data exported to: {output_path}")
     
@@ -214,7 +320,7 @@ class BiomarkerAggregator:
         
         os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
         
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow([
                 'Biomarker',
@@ -226,19 +332,21 @@ class BiomarkerAggregator:
                 'Name Variants'
             ])
             
-            for biomarker_name in sorted(self.biomarkers.keys()):
-                bio_data = self.biomarkers[biomarker_name]
-                
-                for disease, disease_data in bio_data['diseases'].items():
-                    writer.writerow([
-                        bio_data['normalized_name'],
-                        disease,
-                        len(disease_data['papers']),
-                        ', '.join(disease_data['association_types']),
-                        ', '.join(disease_data['evidence_levels']),
-                        bio_data['total_mentions'],
-                        ', '.join(list(bio_data['variants'])[:3])
-                    ])
+            writer.writerows(
+                (
+                    biomarker_name,
+                    self._diseases[disease_id],
+                    len(self._assoc_papers[bio_id, disease_id]),
+                    ', '.join(self._assoc_types[bio_id, disease_id]),
+                    ', '.join(self._assoc_evidence[bio_id, disease_id]),
+                    self._mentions[bio_id],
+                    variants
+                )
+                for biomarker_name in sorted(self._names)
+                for bio_id in (self._name_to_id[biomarker_name],)
+                for variants in (', '.join(list(self._variants[bio_id])[:3]),)
+                for disease_id in self._bio_diseases[bio_id]
+            )
         
         print(f"Biomarker associations exported to: {output_path}")
     
@@ -254,17 +362,18 @@ class BiomarkerAggregator:
         """
         high_confidence = []
         
-        for biomarker_name, bio_data in self.biomarkers.items():
-            for disease, disease_data in bio_data['diseases'].items():
-                paper_count = len(disease_data['papers'])
+        for bio_id, disease_ids in enumerate(self._bio_diseases):
+            for disease_id in disease_ids:
+                key = (bio_id, disease_id)
+                paper_count = len(self._assoc_papers[key])
                 
                 if paper_count >= min_papers:
                     high_confidence.append({
-                        'biomarker': bio_data['normalized_name'],
-                        'disease': disease,
+                        'biomarker': self._names[bio_id],
+                        'disease': self._diseases[disease_id],
                         'paper_count': paper_count,
-                        'association_types': list(disease_data['association_types']),
-                        'evidence_levels': list(disease_data['evidence_levels']),
+                        'association_types': list(self._assoc_types[key]),
+                        'evidence_levels': list(self._assoc_evidence[key]),
                         'confidence_score': min(paper_count / 10.0, 1.0)  # 0-1 scale
                     })
         
@@ -273,29 +382,48 @@ class BiomarkerAggregator:
         
         return high_confidence
 
-def aggregate_from_results(results_file: str) -> BiomarkerAggregator:
+# Below this many papers, worker start-up and pickling cost more than they save
+PARALLEL_MIN_PAPERS = 2000
+
+def _build_partial(paper_results: List[Dict]) -> BiomarkerAggregator:
+    """Aggregate one slice of paper results (runs in a worker process)"""
+    aggregator = BiomarkerAggregator()
+    for paper_result in paper_results:
+        aggregator.add_paper_results(paper_result)
+    return aggregator
+
+def aggregate_from_results(results_file: str, max_workers: int = None) -> BiomarkerAggregator:
     """
     Create aggregator from a results JSON file.
     
+    Large result files are split into one contiguous slice per worker,
+    aggregated in parallel processes and merged in order.
+    
     Args:
         results_file: Path to paper_summaries_*.json file
+        max_workers: Number of worker processes (default: CPU count)
         
     Returns:
         BiomarkerAggregator with loaded data
     """
-    aggregator = BiomarkerAggregator()
-    
     with open(results_file, 'r') as f:
         results = json.load(f)
     
-    for paper_result in results:
-        aggregator.add_paper_results(paper_result)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(results) < PARALLEL_MIN_PAPERS:
+        return _build_partial(results)
+    
+    slice_size = -(-len(results) // workers)
+    slices = [results[i:i + slice_size] for i in range(0, len(results), slice_size)]
+    
+    aggregator = BiomarkerAggregator()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(_build_partial, slices):
+            aggregator.merge(partial)
     
     return aggregator
 
 if __name__ == '__main__':
-    import os
-    
     # Test aggregation
     aggregator = BiomarkerAggregator()
     
@@ -3,9 +3,77 @@ Cloud storage abstraction for AWS S3 and Azure Blob Storage.
 """
 
 import os
+import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+# Parallel transfer settings for large files
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 64 * 1024 * 1024
+TRANSFER_CONCURRENCY = 16
+
+def _copy_local(source: str, destination: str, copy_mode: str = 'content') -> bool:
+    """
+    Copy a file for the 'local' provider, skipping the copy if both paths are the same file.
+    
+    Args:
+        source: File to copy
+        destination: Target path
+        copy_mode: 'content' copies the bytes only (kernel fast path, no
+                   metadata), 'hardlink' links the file when both paths are
+                   on the same filesystem (falling back to a content copy),
+                   'metadata' also copies permissions and timestamps
+    """
+    if copy_mode not in ('content', 'hardlink', 'metadata'):
+        raise ValueError(f"Unknown copy mode: {copy_mode}")
+    
+    try:
+        if os.path.samefile(source, destination):
+            return True
+    except OSError:
+        pass  # Destination doesn't exist yet
+    
+    os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+    
+    if copy_mode == 'hardlink':
+        try:
+            if os.path.lexists(destination):
+                os.remove(destination)
+            os.link(source, destination)
+            return True
+        except OSError:
+            pass  # Different filesystem or links unsupported: copy instead
+    
+    if copy_mode == 'metadata':
+        shutil.copy2(source, destination)
+    else:
+        shutil.copyfile(source, destination)
+    return True
+
+@lru_cache(maxsize=1)
+def _make_s3_client():
+    """Create the S3 client once per process (shared session and connection pool)"""
+    import boto3
+    return boto3.session.Session().client('s3')
+
+@lru_cache(maxsize=1)
+def _make_transfer_config():
+    """S3 transfer settings for parallel multipart uploads/downloads"""
+    from boto3.s3.transfer import TransferConfig
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=TRANSFER_CONCURRENCY,
+        use_threads=True
+    )
+
+@lru_cache(maxsize=None)
+def _make_azure_service(connection_string: str):
+    """Create the Blob service client once per connection string"""
+    from azure.storage.blob import BlobServiceClient
+    return BlobServiceClient.from_connection_string(connection_string)
+
 class CloudStorage:
     """Abstract interface for cloud storage"""
     
@@ -13,11 +81,15 @@ class CloudStorage:
         """
         Initialize cloud storage client.
         
+        The provider SDK is imported and its client created on first use
+        (see client), so constructing a CloudStorage is cheap.
+        
         Args:
             provider: 'local', 'aws', or 'azure'
         """
         self.provider = provider.lower()
-        self.client = None
+        self._client = None
+        self._client_loaded = False
         
         if self.provider == 'aws':
             self._init_aws()
@@ -29,49 +101,62 @@ class CloudStorage:
             raise ValueError(f"Unknown provider: {provider}")
     
     def _init_aws(self):
-        """Initialize AWS S3 client"""
-        try:
-            import boto3
-            self.client = boto3.client('s3')
-            self.bucket = os.environ.get('AWS_S3_BUCKET', '')
-            if not self.bucket:
-                print("Warning: AWS_S3_BUCKET not set")
-        except ImportError:
-            print("boto3 not installed. Install with: pip install boto3")
-            self.client = None
+        """Read AWS S3 settings"""
+        self.bucket = os.environ.get('AWS_S3_BUCKET', '')
+        if not self.bucket:
+            print("Warning: AWS_S3_BUCKET not set")
     
     def _init_azure(self):
-        """Initialize Azure Blob Storage client"""
-        try:
-            from azure.storage.blob import BlobServiceClient
-            connection_string = os.environ.get('AZURE_STORAGE_CONNECTION_STRING', '')
-            if not connection_string:
-                print("Warning: AZURE_STORAGE_CONNECTION_STRING not set")
-                self.client = None
-            else:
-                self.client = BlobServiceClient.from_connection_string(connection_string)
-                self.container = os.environ.get('AZURE_CONTAINER_NAME', 'research-papers')
-        except ImportError:
-            print("azure-storage-blob not installed. Install with: pip install azure-storage-blob")
-            self.client = None
+        """Read Azure Blob Storage settings"""
+        self.connection_string = os.environ.get('AZURE_STORAGE_CONNECTION_STRING', '')
+        if not self.connection_string:
+            print("Warning: AZURE_STORAGE_CONNECTION_STRING not set")
+        self.container = os.environ.get('AZURE_CONTAINER_NAME', 'research-papers')
+    
+    @property
+    def client(self):
+        """Provider client, created on first access (None if unavailable)"""
+        if not self._client_loaded:
+            self._client = self._get_client()
+            self._client_loaded = True
+        return self._client
+    
+    def _get_client(self):
+        """Import the provider SDK and return its (shared) client"""
+        if self.provider == 'aws':
+            try:
+                client = _make_s3_client()
+                self.transfer_config = _make_transfer_config()
+                return client
+            except ImportError:
+                print("boto3 not installed. Install with: pip install boto3")
+        
+        elif self.provider == 'azure':
+            if not self.connection_string:
+                return None
+            try:
+                return _make_azure_service(self.connection_string)
+            except ImportError:
+                print("azure-storage-blob not installed. Install with: pip install azure-storage-blob")
+        
+        return None
     
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
+    def upload_file(self, local_path: str, remote_path: str, copy_mode: str = 'content') -> bool:
         """
         Upload file to cloud storage.
         
         Args:
             local_path: Local file path
             remote_path: Remote path/key
+            copy_mode: How the 'local' provider copies files: 'content',
+                       'hardlink', or 'metadata' (ignored for cloud providers)
             
         Returns:
             True if successful
         """
         if self.provider == 'local':
             # For local, just copy to output directory
-            import shutil
-            os.makedirs(os.path.dirname(remote_path) or '.', exist_ok=True)
-            shutil.copy2(local_path, remote_path)
-            return True
+            return _copy_local(local_path, remote_path, copy_mode)
         
         elif self.provider == 'aws':
             if not self.client or not self.bucket:
@@ -79,7 +164,7 @@ class CloudStorage:
                 return False
             
             try:
-                self.client.upload_file(local_path, self.bucket, remote_path)
+                self.client.upload_file(local_path, self.bucket, remote_path, Config=self.transfer_config)
                 print(f"✓ Uploaded to s3://{self.bucket}/{remote_path}")
                 return True
             except Exception as e:
@@ -97,8 +182,14 @@ class CloudStorage:
                     blob=remote_path
                 )
                 
+                # A known length lets the SDK stream the file in blocks without buffering it
                 with open(local_path, 'rb') as data:
-                    blob_client.upload_blob(data, overwrite=True)
+                    blob_client.upload_blob(
+                        data,
+                        length=os.path.getsize(local_path),
+                        overwrite=True,
+                        max_concurrency=TRANSFER_CONCURRENCY
+                    )
                 
                 print(f"✓ Uploaded to Azure: {self.container}/{remote_path}")
                 return True
@@ -108,23 +199,22 @@ class CloudStorage:
         
         return False
     
-    def download_file(self, remote_path: str, local_path: str) -> bool:
+    def download_file(self, remote_path: str, local_path: str, copy_mode: str = 'content') -> bool:
         """
         Download file from cloud storage.
         
         Args:
             remote_path: Remote path/key
             local_path: Local file path
+            copy_mode: How the 'local' provider copies files: 'content',
+                       'hardlink', or 'metadata' (ignored for cloud providers)
             
         Returns:
             True if successful
         """
         if self.provider == 'local':
             # For local, just copy
-            import shutil
-            os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
-            shutil.copy2(remote_path, local_path)
-            return True
+            return _copy_local(remote_path, local_path, copy_mode)
         
         elif self.provider == 'aws':
             if not self.client or not self.bucket:
@@ -132,7 +222,7 @@ class CloudStorage:
             
             try:
                 os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
-                self.client.download_file(self.bucket, remote_path, local_path)
+                self.client.download_file(self.bucket, remote_path, local_path, Config=self.transfer_config)
                 print(f"✓ Downloaded from s3://{self.bucket}/{remote_path}")
                 return True
             except Exception as e:
@@ -151,8 +241,9 @@ class CloudStorage:
                 
                 os.makedirs(os.path.dirname(local_path) or '.', exist_ok=True)
                 
+                # Download ranges in parallel and write them straight to disk
                 with open(local_path, 'wb') as f:
-                    f.write(blob_client.download_blob().readall())
+                    blob_client.download_blob(max_concurrency=TRANSFER_CONCURRENCY).readinto(f)
                 
                 print(f"✓ Downloaded from Azure: {self.container}/{remote_path}")
                 return True
@@ -184,11 +275,14 @@ class CloudStorage:
                 return []
             
             try:
-                response = self.client.list_objects_v2(
+                # Each response holds at most 1000 keys, so follow continuation tokens
+                paginator = self.client.get_paginator('list_objects_v2')
+                pages = paginator.paginate(
                     Bucket=self.bucket,
-                    Prefix=prefix
+                    Prefix=prefix,
+                    PaginationConfig={'PageSize': 1000}
                 )
-                return [obj['Key'] for obj in response.get('Contents', [])]
+                return [obj['Key'] for page in pages for obj in page.get('Contents', [])]
             except Exception as e:
                 print(f"✗ AWS list failed: {e}")
                 return []
@@ -218,7 +312,7 @@ class CloudStorage:
             True if file exists
         """
         if self.provider == 'local':
-            return os.path.exists(remote_path)
+            return os.path.isfile(remote_path)
         
         elif self.provider == 'aws':
             if not self.client or not self.bucket:
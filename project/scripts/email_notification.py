@@ -3,66 +3,276 @@ Email notification system for sending alerts about new papers.
 """
 
 import os
+import json
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
 from datetime import datetime
+from functools import lru_cache, partial
+import jinja2
+from tenacity import retry, retry_if_exception, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
-def send_email_smtp(to_email: str, subject: str, body_html: str, body_text: str = None):
-    """
-    Send email using SMTP (Gmail, Outlook, etc.)
-    
-    Args:
-        to_email: Recipient email address
-        subject: Email subject
-        body_html: HTML body content
-        body_text: Plain text fallback
-    """
-    # Get SMTP configuration from environment
-    smtp_server = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
-    smtp_port = int(os.environ.get('SMTP_PORT', '587'))
+def get_smtp_settings() -> Optional[Dict]:
+    """Read SMTP configuration from environment (None if credentials are missing)"""
     smtp_user = os.environ.get('SMTP_USER', '')
     smtp_password = os.environ.get('SMTP_PASSWORD', '')
-    from_email = os.environ.get('FROM_EMAIL', smtp_user)
     
     if not smtp_user or not smtp_password:
         print("Error: SMTP credentials not configured.")
         print("Set SMTP_USER and SMTP_PASSWORD environment variables.")
+        return None
+    
+    return {
+        'server': os.environ.get('SMTP_SERVER', 'smtp.gmail.com'),
+        'port': int(os.environ.get('SMTP_PORT', '587')),
+        'user': smtp_user,
+        'password': smtp_password,
+        'from_email': os.environ.get('FROM_EMAIL', smtp_user)
+    }
+
+class SMTPSession:
+    """
+    Logged-in SMTP connection shared across several messages.
+    
+    Connecting, STARTTLS and AUTH happen once in __enter__; each send reuses
+    the connection. A connection idle for longer than IDLE_CHECK_SECONDS is
+    probed with NOOP first, and a dropped connection is re-opened once.
+    """
+    
+    IDLE_CHECK_SECONDS = 30
+    TIMEOUT_SECONDS = 30  # Socket timeout so a stuck server can't hang the sender
+    
+    def __init__(self, settings: Dict):
+        self.settings = settings
+        self.from_email = settings['from_email']
+        self.server = None
+        self.last_used = 0.0
+    
+    def _connect(self):
+        server = smtplib.SMTP(self.settings['server'], self.settings['port'], timeout=self.TIMEOUT_SECONDS)
+        server.starttls()
+        server.login(self.settings['user'], self.settings['password'])
+        self.server = server
+        self.last_used = time.monotonic()
+    
+    def _ensure_alive(self):
+        if self.server is None:
+            self._connect()
+            return
+        if time.monotonic() - self.last_used < self.IDLE_CHECK_SECONDS:
+            return
+        try:
+            if self.server.noop()[0] == 250:
+                return
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._connect()
+    
+    def send_message(self, msg):
+        """Send a prepared message, reconnecting once if the server hung up"""
+        self._ensure_alive()
+        try:
+            self.server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._connect()
+            self.server.send_message(msg)
+        self.last_used = time.monotonic()
+    
+    def __enter__(self):
+        self._connect()
+        return self
+    
+    def close(self):
+        """Close the connection; the next send opens a new one"""
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self.server = None
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
         return False
+
+def smtp_session() -> Optional[SMTPSession]:
+    """Create an SMTPSession from environment settings (None if not configured)"""
+    settings = get_smtp_settings()
+    return SMTPSession(settings) if settings else None
+
+def build_email_message(subject: str, from_email: str, body_html: str, body_text: str = None) -> MIMEMultipart:
+    """
+    Build a multipart email without a recipient.
+    
+    The text/HTML parts are encoded once here, so the same message can be
+    addressed and sent to several recipients with send_smtp_message.
+    """
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = from_email
+    
+    # Attach plain text and HTML versions
+    if body_text:
+        part1 = MIMEText(body_text, 'plain')
+        msg.attach(part1)
     
+    part2 = MIMEText(body_html, 'html')
+    msg.attach(part2)
+    
+    return msg
+
+# Connection-level SMTP failures worth retrying; rejected recipients and
+# authentication errors are permanent and fail immediately
+SMTP_TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, TimeoutError, ConnectionError)
+
+@retry(
+    retry=retry_if_exception_type(SMTP_TRANSIENT_ERRORS),
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(multiplier=0.5, max=10),
+    reraise=True
+)
+def _smtp_send(session: SMTPSession, msg: MIMEMultipart):
+    """Send over the session, retried with jittered backoff on dropped connections"""
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = from_email
+        session.send_message(msg)
+    except SMTP_TRANSIENT_ERRORS:
+        # Start the next attempt on a fresh connection
+        session.close()
+        raise
+
+def send_smtp_message(session: SMTPSession, msg: MIMEMultipart, to_email: str) -> bool:
+    """
+    Address a prepared message to to_email and send it over an open session.
+    
+    Emails that still fail after retrying are appended to FAILED_EMAILS_FILE.
+    """
+    try:
+        del msg['To']
         msg['To'] = to_email
-        
-        # Attach plain text and HTML versions
-        if body_text:
-            part1 = MIMEText(body_text, 'plain')
-            msg.attach(part1)
-        
-        part2 = MIMEText(body_html, 'html')
-        msg.attach(part2)
-        
-        # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_password)
-            server.send_message(msg)
+        _smtp_send(session, msg)
         
         print(f"✓ Email sent successfully to {to_email}")
         return True
         
     except Exception as e:
         print(f"✗ Failed to send email: {e}")
+        record_failed_email(to_email, msg['Subject'], e)
         return False
 
+def send_email_smtp(to_email: str, subject: str, body_html: str, body_text: str = None,
+                    session: SMTPSession = None):
+    """
+    Send email using SMTP (Gmail, Outlook, etc.)
+    
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        body_html: HTML body content
+        body_text: Plain text fallback
+        session: Open SMTPSession to reuse; if None, a connection is
+                 opened and closed just for this message
+    """
+    if session is None:
+        session = smtp_session()
+        if session is None:
+            return False
+        try:
+            with session:
+                return send_email_smtp(to_email, subject, body_html, body_text, session=session)
+        except Exception as e:
+            print(f"✗ Failed to send email: {e}")
+            return False
+    
+    msg = build_email_message(subject, session.from_email, body_html, body_text)
+    return send_smtp_message(session, msg, to_email)
+
+class SESRateLimiter:
+    """
+    Token bucket that keeps SES sends under the account's per-second quota.
+    
+    SES counts every recipient against the quota, so callers acquire one
+    token per To/Cc/Bcc address.
+    """
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = rate
+        self.tokens = rate
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, n: int = 1):
+        """Block until n tokens are available, then consume them"""
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                
+                # Requests larger than the bucket wait for a full bucket and go into debt
+                needed = min(n, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= n
+                    return
+                time.sleep((needed - self.tokens) / self.rate)
+
+_ses_limiter = SESRateLimiter(float(os.environ.get('SES_RATE_LIMIT', '14')))
+
+SES_THROTTLING_CODES = ('Throttling', 'TooManyRequestsException')
+
+def _is_ses_throttling(exception: BaseException) -> bool:
+    """True for SES ClientErrors caused by exceeding the sending rate"""
+    response = getattr(exception, 'response', None) or {}
+    return response.get('Error', {}).get('Code') in SES_THROTTLING_CODES
+
+@lru_cache(maxsize=None)
+def get_ses_client(region: str):
+    """Create (once per region) the SES client"""
+    import boto3
+    return boto3.client('ses', region_name=region)
+
+def recipient_count(destination: Dict) -> int:
+    """Number of addresses SES will bill against the sending rate"""
+    return sum(len(destination.get(field, [])) for field in ('ToAddresses', 'CcAddresses', 'BccAddresses'))
+
+@retry(
+    retry=retry_if_exception(_is_ses_throttling),
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(multiplier=1, max=10),
+    reraise=True
+)
+def _ses_call(operation, tokens: int, **kwargs):
+    """Rate-limited SES API call, retried with jittered backoff on throttling"""
+    _ses_limiter.acquire(tokens)
+    return operation(**kwargs)
+
+def record_failed_email(to_email: str, subject: str, error: Exception):
+    """Append an undeliverable email to the local failed-emails file for later replay"""
+    failed_file = os.environ.get('FAILED_EMAILS_FILE', 'project/outputs/failed_emails.jsonl')
+    try:
+        os.makedirs(os.path.dirname(failed_file) or '.', exist_ok=True)
+        with open(failed_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'to_email': to_email,
+                'subject': subject,
+                'error': str(error),
+                'timestamp': datetime.now().isoformat()
+            }) + '\n')
+    except Exception as e:
+        print(f"Error recording failed email: {e}")
+
 def send_email_aws_ses(to_email: str, subject: str, body_html: str, body_text: str = None):
     """
     Send email using AWS SES
     
+    Sends are throttled to SES_RATE_LIMIT recipients per second (default 14)
+    and retried on throttling; emails that still fail are appended to
+    FAILED_EMAILS_FILE.
+    
     Args:
         to_email: Recipient email address
         subject: Email subject
@@ -70,16 +280,17 @@ def send_email_aws_ses(to_email: str, subject: str, body_html: str, body_text: s
         body_text: Plain text fallback
     """
     try:
-        import boto3
-        
         from_email = os.environ.get('FROM_EMAIL', 'noreply@example.com')
         region = os.environ.get('AWS_REGION', 'us-east-1')
         
-        client = boto3.client('ses', region_name=region)
+        client = get_ses_client(region)
         
-        response = client.send_email(
+        destination = {'ToAddresses': [to_email]}
+        response = _ses_call(
+            client.send_email,
+            recipient_count(destination),
             Source=from_email,
-            Destination={'ToAddresses': [to_email]},
+            Destination=destination,
             Message={
                 'Subject': {'Data': subject},
                 'Body': {
@@ -97,8 +308,103 @@ def send_email_aws_ses(to_email: str, subject: str, body_html: str, body_text: s
         return False
     except Exception as e:
         print(f"✗ Failed to send email via AWS SES: {e}")
+        if _is_ses_throttling(e):
+            record_failed_email(to_email, subject, e)
         return False
 
+SES_MAX_BULK_DESTINATIONS = 50  # SendBulkTemplatedEmail limit per call
+SES_TEMPLATE_NAME = os.environ.get('SES_TEMPLATE_NAME', 'NewPapersNotification')
+
+# Fixed SES template: each send passes its content as template data, which
+# SES substitutes verbatim (triple braces skip escaping, and substituted
+# values are never parsed as Handlebars themselves)
+SES_TEMPLATE = {
+    'SubjectPart': '{{{subject}}}',
+    'HtmlPart': '{{{body_html}}}',
+    'TextPart': '{{{body_text}}}'
+}
+
+def ensure_ses_template(client, name: str):
+    """Create or update the fixed SES template used for bulk notifications"""
+    template = {'TemplateName': name, **SES_TEMPLATE}
+    try:
+        client.update_template(Template=template)
+    except client.exceptions.TemplateDoesNotExistException:
+        client.create_template(Template=template)
+
+def send_bulk_email_aws_ses(to_emails: List[str], subject: str, body_html: str, body_text: str = None):
+    """
+    Send the same email to many recipients using AWS SES bulk templated email.
+    
+    The content is passed as DefaultTemplateData for the fixed SES_TEMPLATE
+    and delivered with SendBulkTemplatedEmail in chunks of up to 50
+    destinations, sharing the SES rate limiter and throttling retries with
+    send_email_aws_ses.
+    
+    Args:
+        to_emails: Recipient email addresses
+        subject: Email subject
+        body_html: HTML body content
+        body_text: Plain text fallback
+        
+    Returns:
+        True if every recipient was accepted by SES
+    """
+    try:
+        from_email = os.environ.get('FROM_EMAIL', 'noreply@example.com')
+        region = os.environ.get('AWS_REGION', 'us-east-1')
+        
+        client = get_ses_client(region)
+        ensure_ses_template(client, SES_TEMPLATE_NAME)
+    except ImportError:
+        print("boto3 not installed. Install with: pip install boto3")
+        return False
+    except Exception as e:
+        print(f"✗ Failed to prepare SES template: {e}")
+        return False
+    
+    template_data = json.dumps({
+        'subject': subject,
+        'body_html': body_html,
+        'body_text': body_text or 'Please view this email in HTML format.'
+    })
+    
+    all_sent = True
+    for i in range(0, len(to_emails), SES_MAX_BULK_DESTINATIONS):
+        chunk = to_emails[i:i + SES_MAX_BULK_DESTINATIONS]
+        destinations = [
+            {'Destination': {'ToAddresses': [email]}, 'ReplacementTemplateData': '{}'}
+            for email in chunk
+        ]
+        
+        try:
+            response = _ses_call(
+                client.send_bulk_templated_email,
+                len(chunk),
+                Source=from_email,
+                Template=SES_TEMPLATE_NAME,
+                DefaultTemplateData=template_data,
+                Destinations=destinations
+            )
+        except Exception as e:
+            print(f"✗ Failed to send bulk email via AWS SES: {e}")
+            for email in chunk:
+                record_failed_email(email, subject, e)
+            all_sent = False
+            continue
+        
+        # Statuses are returned in the same order as Destinations
+        for email, status in zip(chunk, response.get('Status', [])):
+            if status.get('Status') == 'Success':
+                print(f"✓ Email sent via AWS SES to {email}")
+            else:
+                error = status.get('Error', status.get('Status'))
+                print(f"✗ Failed to send email via AWS SES to {email}: {error}")
+                record_failed_email(email, subject, error)
+                all_sent = False
+    
+    return all_sent
+
 def send_email_azure(to_email: str, subject: str, body_html: str, body_text: str = None):
     """
     Send email using Azure Communication Services
@@ -146,32 +452,26 @@ def send_email_azure(to_email: str, subject: str, body_html: str, body_text: str
         print(f"✗ Failed to send email via Azure: {e}")
         return False
 
-def create_new_papers_email(papers: List[Dict], query: str = "") -> tuple:
-    """
-    Create email content for new papers notification.
-    
-    Args:
-        papers: List of paper dictionaries
-        query: Search query used
-        
-    Returns:
-        Tuple of (html_body, text_body)
-    """
-    # HTML version
-    html = f"""
+# Email bodies, compiled once at import. The HTML template autoescapes paper
+# fields so titles/abstracts can't inject markup.
+EMAIL_CSS = """
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .header { background-color: #4CAF50; color: white; padding: 20px; text-align: center; }
+            .paper { border: 1px solid #ddd; margin: 15px 0; padding: 15px; border-radius: 5px; }
+            .paper-title { font-size: 18px; font-weight: bold; color: #2c3e50; margin-bottom: 8px; }
+            .paper-meta { color: #7f8c8d; font-size: 14px; margin-bottom: 8px; }
+            .paper-abstract { margin-top: 10px; font-size: 14px; }
+            .footer { margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #7f8c8d; font-size: 12px; }
+            a { color: #3498db; text-decoration: none; }
+            a:hover { text-decoration: underline; }
+"""
+
+# The stylesheet is spliced in before compilation, so it is emitted as a
+# single static chunk rather than being processed on every render
+_HTML_SRC = """
     <html>
     <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .header {{ background-color: #4CAF50; color: white; padding: 20px; text-align: center; }}
-            .paper {{ border: 1px solid #ddd; margin: 15px 0; padding: 15px; border-radius: 5px; }}
-            .paper-title {{ font-size: 18px; font-weight: bold; color: #2c3e50; margin-bottom: 8px; }}
-            .paper-meta {{ color: #7f8c8d; font-size: 14px; margin-bottom: 8px; }}
-            .paper-abstract {{ margin-top: 10px; font-size: 14px; }}
-            .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #7f8c8d; font-size: 12px; }}
-            a {{ color: #3498db; text-decoration: none; }}
-            a:hover {{ text-decoration: underline; }}
-        </style>
+        <style>{% raw %}""" + EMAIL_CSS + """{% endraw %}        </style>
     </head>
     <body>
         <div class="header">
@@ -180,39 +480,25 @@ def create_new_papers_email(papers: List[Dict], query: str = "") -> tuple:
         </div>
         
         <div style="padding: 20px;">
-            <p><strong>Summary:</strong> Found {len(papers)} new paper(s) matching your search criteria.</p>
-            {f'<p><strong>Search Query:</strong> {query}</p>' if query else ''}
-            <p><strong>Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p><strong>Summary:</strong> Found {{ papers|length }} new paper(s) matching your search criteria.</p>
+            {{ ('<p><strong>Search Query:</strong> %s</p>'|safe % query) if query }}
+            <p><strong>Date:</strong> {{ date }}</p>
             
             <hr style="margin: 30px 0;">
-    """
-    
-    # Add each paper
-    for i, paper in enumerate(papers, 1):
-        authors_str = ', '.join(paper.get('authors', [])[:3])
-        if len(paper.get('authors', [])) > 3:
-            authors_str += f" et al. ({len(paper['authors'])} authors)"
-        
-        abstract = paper.get('abstract', 'No abstract available.')
-        if len(abstract) > 300:
-            abstract = abstract[:300] + '...'
-        
-        html += f"""
+{% for paper in papers %}
             <div class="paper">
-                <div class="paper-title">{i}. {paper.get('title', 'Untitled')}</div>
+                <div class="paper-title">{{ loop.index }}. {{ paper.title }}</div>
                 <div class="paper-meta">
-                    <strong>Authors:</strong> {authors_str}<br>
-                    <strong>Journal:</strong> {paper.get('journal', 'Unknown')}<br>
-                    <strong>Year:</strong> {paper.get('year', 'Unknown')}<br>
-                    <strong>PMID:</strong> <a href="{paper.get('url', '#')}">{paper.get('pmid', 'N/A')}</a>
+                    <strong>Authors:</strong> {{ paper.authors_short }}{% if paper.author_count > 3 %} et al. ({{ paper.author_count }} authors){% endif %}<br>
+                    <strong>Journal:</strong> {{ paper.journal }}<br>
+                    <strong>Year:</strong> {{ paper.year }}<br>
+                    <strong>PMID:</strong> <a href="{{ paper.url or '#' }}">{{ paper.pmid }}</a>
                 </div>
                 <div class="paper-abstract">
-                    <strong>Abstract:</strong> {abstract}
+                    <strong>Abstract:</strong> {{ paper.abstract_short }}
                 </div>
             </div>
-        """
-    
-    html += """
+{% endfor %}
             <div class="footer">
                 <p>This is an automated notification from the Research Paper Processing Pipeline.</p>
                 <p>To process these papers, run the pipeline with your configured settings.</p>
@@ -220,75 +506,158 @@ def create_new_papers_email(papers: List[Dict], query: str = "") -> tuple:
         </div>
     </body>
     </html>
-    """
-    
-    # Plain text version
-    text = f"""
+"""
+
+_TEXT_SRC = """
 New Research Papers Found
 Research Paper Processing Pipeline
-{'='*60}
+{{ rule }}
 
-Summary: Found {len(papers)} new paper(s) matching your search criteria.
-{f'Search Query: {query}' if query else ''}
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Summary: Found {{ papers|length }} new paper(s) matching your search criteria.
+{{ ('Search Query: ' ~ query) if query }}
+Date: {{ date }}
 
-{'='*60}
+{{ rule }}
 
-"""
-    
-    for i, paper in enumerate(papers, 1):
-        authors_str = ', '.join(paper.get('authors', [])[:3])
-        if len(paper.get('authors', [])) > 3:
-            authors_str += f" et al."
-        
-        text += f"""
-{i}. {paper.get('title', 'Untitled')}
+{% for paper in papers %}
 
-Authors: {authors_str}
-Journal: {paper.get('journal', 'Unknown')}
-Year: {paper.get('year', 'Unknown')}
-PMID: {paper.get('pmid', 'N/A')}
-URL: {paper.get('url', 'N/A')}
+{{ loop.index }}. {{ paper.title }}
 
-{paper.get('abstract', 'No abstract available.')[:300]}...
+Authors: {{ paper.authors_short }}{% if paper.author_count > 3 %} et al.{% endif %}
+
+Journal: {{ paper.journal }}
+Year: {{ paper.year }}
+PMID: {{ paper.pmid }}
+URL: {{ paper.url or 'N/A' }}
+
+{{ paper.abstract_head }}...
+
+{{ rule }}
+{% endfor %}
 
-{'='*60}
-"""
-    
-    text += """
 This is an automated notification from the Research Paper Processing Pipeline.
 To process these papers, run the pipeline with your configured settings.
 """
+
+_html_env = jinja2.Environment(autoescape=True, trim_blocks=True)
+_text_env = jinja2.Environment(autoescape=False, trim_blocks=True, keep_trailing_newline=True)
+_HTML_TPL = _html_env.from_string(_HTML_SRC)
+_TEXT_TPL = _text_env.from_string(_TEXT_SRC)
+
+def _prepare_paper(paper) -> Dict:
+    """
+    Resolve defaults and trimmed fields once for both email renderers.
+    
+    Accepts pubmed_integration.Paper records as well as plain paper dicts.
+    """
+    get = paper.get if isinstance(paper, dict) else partial(getattr, paper)
+    authors = get('authors', [])
+    abstract = get('abstract', 'No abstract available.')
+    abstract_head = abstract[:300]
+    
+    return {
+        'title': get('title', 'Untitled'),
+        'authors_short': ', '.join(authors[:3]),
+        'author_count': len(authors),
+        'journal': get('journal', 'Unknown'),
+        'year': get('year', 'Unknown'),
+        'pmid': get('pmid', 'N/A'),
+        'url': get('url', None),
+        'abstract_head': abstract_head,
+        'abstract_short': abstract_head + '...' if len(abstract) > 300 else abstract
+    }
+
+def create_new_papers_email(papers: List, query: str = "") -> tuple:
+    """
+    Create email content for new papers notification.
+    
+    Args:
+        papers: List of Paper records or paper dictionaries
+        query: Search query used
+        
+    Returns:
+        Tuple of (html_body, text_body)
+    """
+    date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    prepared = [_prepare_paper(paper) for paper in papers]
+    
+    html = _HTML_TPL.render(papers=prepared, query=query, date=date)
+    text = _TEXT_TPL.render(papers=prepared, query=query, date=date, rule='=' * 60)
     
     return html, text
 
-def notify_new_papers(papers: List[Dict], to_email: str, query: str = "", 
-                     method: str = 'smtp'):
+def send_notification(method: str, recipients: List[str], subject: str, html_body: str, text_body: str) -> bool:
+    """
+    Deliver a rendered notification to all recipients through one channel.
+    
+    Args:
+        method: 'smtp', 'aws_ses', or 'azure'
+        recipients: Recipient email addresses
+        subject: Email subject
+        html_body: HTML body content
+        text_body: Plain text fallback
+        
+    Returns:
+        True if every recipient was notified
+    """
+    if method == 'smtp':
+        # One connection/login for the whole recipient list
+        session = smtp_session()
+        if session is None:
+            return False
+        try:
+            with session:
+                # Encode the message once and only re-address it per recipient
+                msg = build_email_message(subject, session.from_email, html_body, text_body)
+                results = [send_smtp_message(session, msg, recipient) for recipient in recipients]
+        except Exception as e:
+            print(f"✗ Failed to send email: {e}")
+            return False
+        return all(results)
+    elif method == 'aws_ses':
+        return send_bulk_email_aws_ses(recipients, subject, html_body, text_body)
+    elif method == 'azure':
+        return all([send_email_azure(recipient, subject, html_body, text_body) for recipient in recipients])
+    else:
+        print(f"Unknown email method: {method}")
+        return False
+
+def notify_new_papers(papers: List, to_email: Union[str, List[str]], query: str = "", 
+                     method: Union[str, List[str]] = 'smtp'):
     """
     Send email notification about new papers.
     
     Args:
         papers: List of new papers
-        to_email: Recipient email
+        to_email: Recipient email, or a list of recipients
         query: Search query used
-        method: 'smtp', 'aws_ses', or 'azure'
+        method: 'smtp', 'aws_ses', or 'azure', or a list of these to
+                notify through several channels concurrently
+        
+    Returns:
+        True if every recipient was notified (through at least one
+        channel when several are given)
     """
     if not papers:
         print("No new papers to notify about.")
         return False
     
+    recipients = [to_email] if isinstance(to_email, str) else list(to_email)
+    methods = [method] if isinstance(method, str) else list(method)
+    
     subject = f"New Research Papers Found ({len(papers)} papers)"
     html_body, text_body = create_new_papers_email(papers, query)
     
-    if method == 'smtp':
-        return send_email_smtp(to_email, subject, html_body, text_body)
-    elif method == 'aws_ses':
-        return send_email_aws_ses(to_email, subject, html_body, text_body)
-    elif method == 'azure':
-        return send_email_azure(to_email, subject, html_body, text_body)
-    else:
-        print(f"Unknown email method: {method}")
-        return False
+    if len(methods) == 1:
+        return send_notification(methods[0], recipients, subject, html_body, text_body)
+    
+    # Channels are independent, so a slow provider doesn't delay the others
+    with ThreadPoolExecutor(max_workers=len(methods)) as executor:
+        results = list(executor.map(
+            lambda channel: send_notification(channel, recipients, subject, html_body, text_body),
+            methods
+        ))
+    return any(results)
 
 if __name__ == '__main__':
     # Test email generation
@@ -2,69 +2,263 @@
 Extract text from PDF files in the papers directory.
 """
 
+import hashlib
+import io
 import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 import json
 import pypdf
 
+try:
+    import pypdfium2 as pdfium
+    from importlib.metadata import version as package_version
+    PDFIUM_AVAILABLE = True
+    EXTRACTOR_VERSION = f"pdfium-{package_version('pypdfium2')}"
+except ImportError:
+    PDFIUM_AVAILABLE = False
+    EXTRACTOR_VERSION = f"pypdf-{pypdf.__version__}"
+
+# PDFium is not thread-safe; every call into it (open, page text, close) holds this lock
+_PDFIUM_LOCK = threading.Lock()
+
 def extract_text_from_pdf(pdf_path):
     """
     Extract text from a PDF file.
     
     Args:
-        pdf_path: Path to the PDF file
+        pdf_path: Path to the PDF file, or a binary file-like object
+                  (e.g. BytesIO) already holding the PDF contents
         
     Returns:
         dict with 'text', 'num_pages', and 'metadata'
     """
+    buffer = io.StringIO()
+    result = extract_text_to_file(pdf_path, buffer)
+    del result['text_length']
+    result['text'] = buffer.getvalue()
+    return result
+
+def _write_pages(page_texts, out_fp):
+    """
+    Write (page number, text) pairs to out_fp, skipping blank pages.
+    
+    Returns:
+        Number of characters written
+    """
+    text_length = 0
+    for page_num, text in page_texts:
+        if text.strip():
+            header = f"--- Page {page_num + 1} ---\n"
+            if text_length:
+                out_fp.write("\n\n")
+                text_length += 2
+            out_fp.write(header)
+            out_fp.write(text)
+            text_length += len(header) + len(text)
+    return text_length
+
+def _pdfium_page_texts(pdf):
+    """Yield (page number, text) for each page of a pypdfium2 document"""
+    for page_num in range(len(pdf)):
+        page = pdf[page_num]
+        textpage = page.get_textpage()
+        try:
+            # PDFium separates lines with CRLF
+            yield page_num, textpage.get_text_range().replace('\r\n', '\n')
+        finally:
+            textpage.close()
+            page.close()
+
+def _extract_with_pdfium(pdf, out_fp):
+    """Write the text of an open pypdfium2 document to out_fp"""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = pypdf.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
-            
-            # Extract text from all pages
-            text_parts = []
-            for page_num, page in enumerate(pdf_reader.pages):
-                text = page.extract_text()
-                if text.strip():
-                    text_parts.append(f"--- Page {page_num + 1} ---\n{text}")
-            
-            full_text = "\n\n".join(text_parts)
-            
-            # Extract metadata if available
-            metadata = {}
-            if pdf_reader.metadata:
-                metadata = {
-                    'title': pdf_reader.metadata.get('/Title', ''),
-                    'author': pdf_reader.metadata.get('/Author', ''),
-                    'subject': pdf_reader.metadata.get('/Subject', ''),
-                    'creator': pdf_reader.metadata.get('/Creator', '')
-                }
-            
-            return {
-                'text': full_text,
-                'num_pages': num_pages,
-                'metadata': metadata,
-                'success': True,
-                'error': None
+        text_length = _write_pages(_pdfium_page_texts(pdf), out_fp)
+        
+        # Extract metadata if available
+        info = pdf.get_metadata_dict()
+        metadata = {}
+        if any(info.values()):
+            metadata = {
+                'title': info.get('Title', ''),
+                'author': info.get('Author', ''),
+                'subject': info.get('Subject', ''),
+                'creator': info.get('Creator', '')
             }
+        
+        return {
+            'text_length': text_length,
+            'num_pages': len(pdf),
+            'metadata': metadata,
+            'success': True,
+            'error': None
+        }
+    finally:
+        pdf.close()
+
+def _extract_with_pypdf(file, out_fp):
+    """Write the text of a PDF file object to out_fp using pypdf"""
+    pdf_reader = pypdf.PdfReader(file)
+    num_pages = len(pdf_reader.pages)
+    
+    text_length = _write_pages(
+        ((page_num, page.extract_text()) for page_num, page in enumerate(pdf_reader.pages)),
+        out_fp
+    )
+    
+    # Extract metadata if available
+    metadata = {}
+    if pdf_reader.metadata:
+        metadata = {
+            'title': pdf_reader.metadata.get('/Title', ''),
+            'author': pdf_reader.metadata.get('/Author', ''),
+            'subject': pdf_reader.metadata.get('/Subject', ''),
+            'creator': pdf_reader.metadata.get('/Creator', '')
+        }
+    
+    return {
+        'text_length': text_length,
+        'num_pages': num_pages,
+        'metadata': metadata,
+        'success': True,
+        'error': None
+    }
+
+def extract_text_to_file(pdf_path, out_fp):
+    """
+    Extract text from a PDF file, writing it page by page to out_fp.
+    
+    Produces the same text as extract_text_from_pdf without holding the
+    whole document text in memory. Uses PDFium (pypdfium2) when installed,
+    falling back to pypdf for documents PDFium cannot open. PDFium calls
+    are serialized across threads, so this is safe to call concurrently.
+    
+    Args:
+        pdf_path: Path to the PDF file, or a binary file-like object
+        out_fp: Text file object to write the extracted text to
+        
+    Returns:
+        dict with 'num_pages', 'text_length' (characters written), and 'metadata'
+    """
+    try:
+        if hasattr(pdf_path, 'read'):
+            file = pdf_path
+        else:
+            file = open(pdf_path, 'rb')
+        
+        with file:
+            if PDFIUM_AVAILABLE:
+                with _PDFIUM_LOCK:
+                    try:
+                        pdf = pdfium.PdfDocument(file)
+                    except pdfium.PdfiumError:
+                        file.seek(0)
+                    else:
+                        return _extract_with_pdfium(pdf, out_fp)
+            
+            return _extract_with_pypdf(file, out_fp)
             
     except Exception as e:
         return {
-            'text': '',
+            'text_length': 0,
             'num_pages': 0,
             'metadata': {},
             'success': False,
             'error': str(e)
         }
 
-def process_all_pdfs(papers_dir='project/papers', output_dir='project/outputs'):
+def _failed_result(pdf_path, error):
+    return {
+        'filename': pdf_path.name,
+        'num_pages': 0,
+        'text_length': 0,
+        'status': 'failed',
+        'error': str(error)
+    }
+
+def _save_to_cache(text_path, cache_dir, cached_text, cached_info, result):
+    """Copy an extracted text into the cache (failures are only reported)"""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(text_path, cached_text)
+        with open(cached_info, 'w', encoding='utf-8') as f:
+            json.dump({'num_pages': result['num_pages'], 'text_length': result['text_length']}, f)
+    except OSError as e:
+        # The info file is written last, so a failed copy never leaves an entry that looks complete
+        print(f"  ✗ Could not cache extracted text: {e}")
+
+def _extract_and_save(pdf_path, output_dir):
+    """
+    Extract one PDF and write its text to output_dir/extracted_texts.
+    
+    Extracted text is cached in output_dir/.cache, keyed by a hash of the PDF
+    contents and the text extractor version, so unchanged PDFs are copied from the
+    cache instead of being parsed again.
+    
+    Runs in a worker process, so only the small result record (not the
+    extracted text) is sent back to the caller. Errors are returned as a
+    'failed' record rather than raised, so one bad file doesn't stop a batch.
+    """
+    text_filename = pdf_path.stem + '.txt'
+    text_path = Path(output_dir) / 'extracted_texts' / text_filename
+    
+    try:
+        text_path.parent.mkdir(parents=True, exist_ok=True)
+        pdf_bytes = pdf_path.read_bytes()
+    except OSError as e:
+        return _failed_result(pdf_path, e)
+    
+    digest = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+    cache_dir = Path(output_dir) / '.cache' / EXTRACTOR_VERSION
+    cached_text = cache_dir / f'{digest}.txt'
+    cached_info = cache_dir / f'{digest}.json'
+    
+    result = None
+    if cached_text.exists() and cached_info.exists():
+        try:
+            shutil.copyfile(cached_text, text_path)
+            with open(cached_info, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ✗ Could not read cached text ({e}), extracting again")
+            result = None
+    
+    if result is None:
+        try:
+            # Stream extracted text straight into the output file
+            with open(text_path, 'w', encoding='utf-8') as f:
+                result = extract_text_to_file(io.BytesIO(pdf_bytes), f)
+        except OSError as e:
+            result = {'success': False, 'error': str(e)}
+        
+        if not result['success']:
+            text_path.unlink(missing_ok=True)
+            return _failed_result(pdf_path, result['error'])
+        
+        _save_to_cache(text_path, cache_dir, cached_text, cached_info, result)
+    
+    return {
+        'filename': pdf_path.name,
+        'num_pages': result['num_pages'],
+        'text_length': result['text_length'],
+        'status': 'success',
+        'text_file': str(text_path)
+    }
+
+def process_all_pdfs(papers_dir='project/papers', output_dir='project/outputs', max_workers=None):
     """
     Process all PDFs in the papers directory and save extracted text.
     
+    Extraction is CPU-bound, so PDFs are processed in parallel worker
+    processes (one per CPU by default).
+    
     Args:
         papers_dir: Directory containing PDF files
         output_dir: Directory to save extracted text
+        max_workers: Number of worker processes (default: CPU count)
     """
     # Create output directory if it doesn't exist
     Path(output_dir).mkdir(parents=True, exist_ok=True)
@@ -75,39 +269,25 @@ def process_all_pdfs(papers_dir='project/papers', output_dir='project/outputs'):
     
     print(f"Found {len(pdf_files)} PDF files in {papers_dir}")
     
+    extract = partial(_extract_and_save, output_dir=output_dir)
+    
     results = []
     
-    for i, pdf_path in enumerate(pdf_files, 1):
-        print(f"Processing {i}/{len(pdf_files)}: {pdf_path.name}")
-        
-        result = extract_text_from_pdf(pdf_path)
-        
-        if result['success']:
-            # Save extracted text to a file
-            text_filename = pdf_path.stem + '.txt'
-            text_path = Path(output_dir) / 'extracted_texts' / text_filename
-            text_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(result['text'])
-            
-            results.append({
-                'filename': pdf_path.name,
-                'num_pages': result['num_pages'],
-                'text_length': len(result['text']),
-                'status': 'success',
-                'text_file': str(text_path)
-            })
-            print(f"  ✓ Extracted {result['num_pages']} pages, {len(result['text'])} characters")
+    # Worker processes are only started once work is submitted, so a single
+    # PDF is simply extracted in this process
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        if len(pdf_files) > 1:
+            outcomes = executor.map(extract, pdf_files, chunksize=2)
         else:
-            results.append({
-                'filename': pdf_path.name,
-                'num_pages': 0,
-                'text_length': 0,
-                'status': 'failed',
-                'error': result['error']
-            })
-            print(f"  ✗ Failed: {result['error']}")
+            outcomes = map(extract, pdf_files)
+        
+        for i, result in enumerate(outcomes, 1):
+            print(f"Processed {i}/{len(pdf_files)}: {result['filename']}")
+            if result['status'] == 'success':
+                print(f"  ✓ Extracted {result['num_pages']} pages, {result['text_length']} characters")
+            else:
+                print(f"  ✗ Failed: {result['error']}")
+            results.append(result)
     
     # Save summary
     summary_path = Path(output_dir) / 'extraction_summary.json'
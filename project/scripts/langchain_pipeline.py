@@ -4,14 +4,42 @@ LangChain-based pipeline for research paper processing with structured output.
 
 import os
 import json
-from typing import List, Optional
-from pydantic import BaseModel, Field
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
+import orjson
+import re
+import threading
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationError, computed_field
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
-from langchain.output_parsers import PydanticOutputParser
-from tenacity import retry, stop_after_attempt, wait_exponential
+from response_cache import response_cache_key, load_cached_response, save_cached_response
+from summarize import chunk_text, retry_transient
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+SEMANTIC_CACHE_DIRNAME = '.semantic_cache'  # Created under the output directory
+SEMANTIC_CACHE_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Minimum cosine similarity for a cache hit
+SEMANTIC_CACHE_PREFIX_CHARS = 2000  # Title/abstract region used as the cache key
+
+def _validate_year(year_str: str) -> bool:
+    """Validate publication year"""
+    if not year_str or year_str == 'Not found':
+        return False
+    try:
+        year = int(year_str)
+        return 1900 <= year <= 2026
+    except (ValueError, TypeError):
+        return False
 
 class BiomarkerAssociation(BaseModel):
     """Model for biomarker-disease associations"""
@@ -36,77 +64,331 @@ class PaperExtraction(BaseModel):
         description="List of biomarker-disease associations found in the paper",
         default_factory=list
     )
+    
+    # Quality metadata is computed from the fields above when the model is
+    # dumped. Computed fields stay out of the input schema sent to the LLM.
+    @computed_field
+    @cached_property
+    def quality_checks(self) -> Dict[str, bool]:
+        """Per-field quality checks on the extraction"""
+        title = self.title
+        methodology = self.methodology
+        return {
+            'has_title': bool(title and title != 'Not found' and len(title) > 5),
+            'has_authors': bool(self.authors and self.authors != 'Not found'),
+            'has_findings': bool(self.key_findings),
+            'has_year': _validate_year(self.year),
+            'sufficient_abstract': len(self.abstract) > 50,
+            'has_methodology': bool(methodology and methodology != 'Not found' and len(methodology) > 20),
+            'has_biomarkers': len(self.biomarkers) > 0
+        }
+    
+    @computed_field
+    @property
+    def quality_score(self) -> float:
+        """Fraction of quality checks passed"""
+        checks = self.quality_checks
+        return sum(checks.values()) / len(checks)
+
+class PaperExtractionBatch(BaseModel):
+    """Structured output model for several papers extracted in one call"""
+    papers: List[PaperExtraction] = Field(
+        description="One extraction per paper, in the order the papers were given"
+    )
+
+# Output schemas are part of every request, so they are part of the response
+# cache keys. Serialized once at import instead of per processor.
+PAPER_SCHEMA = json.dumps(PaperExtraction.model_json_schema(), sort_keys=True)
+BATCH_SCHEMA = json.dumps(PaperExtractionBatch.model_json_schema(), sort_keys=True)
+
+# Static instructions shared by every paper. Kept separate from the paper
+# text so providers can cache this prefix across requests.
+SYSTEM_PROMPT = """You are an expert research paper analyst. Extract comprehensive information from the research paper provided by the user.
+
+Pay special attention to:
+1. Biomarker-disease associations (genes, proteins, metabolites linked to diseases)
+2. Clinical relevance and evidence quality
+3. Methodological rigor
+
+Provide a complete and accurate extraction. If information is not available, use "Not found" for string fields or empty lists for list fields."""
+
+BATCH_SYSTEM_PROMPT = """You are an expert research paper analyst. The user provides several research papers, each starting with a "### PAPER n" marker. Extract comprehensive information from each paper separately.
+
+Pay special attention to:
+1. Biomarker-disease associations (genes, proteins, metabolites linked to diseases)
+2. Clinical relevance and evidence quality
+3. Methodological rigor
+
+Return exactly one extraction per paper, in the same order as the papers. If information is not available, use "Not found" for string fields or empty lists for list fields."""
+
+REFINE_SYSTEM_PROMPT = """You are an expert research paper analyst. Papers too long for one request are read in parts. The user provides the extraction made from the earlier parts of a paper, followed by the next part of its text.
+
+Return the updated extraction for the whole paper: keep everything that is already correct, add key findings and biomarker-disease associations found in this part, and fill in fields that are still "Not found" if this part contains them."""
+
+# Sections worth sending to the LLM, and trailing sections that are dropped
+INFORMATIVE_SECTIONS = (
+    'abstract', 'summary', 'introduction', 'background', 'materials and methods', 'methods',
+    'methodology', 'results and discussion', 'results', 'discussion', 'conclusions', 'conclusion',
+    'limitations'
+)
+SKIPPED_SECTIONS = (
+    'references', 'bibliography', 'acknowledgements', 'acknowledgments', 'funding',
+    'author contributions', 'competing interests', 'conflicts of interest', 'conflict of interest',
+    'data availability', 'supplementary materials', 'supplementary material', 'declarations'
+)
+INFORMATIVE_SECTIONS_ONLY = os.environ.get('INFORMATIVE_SECTIONS_ONLY', 'true').lower() == 'true'
+FRONT_MATTER_MAX_CHARS = 3000  # Title, authors and journal info before the first section header
+SECTION_MAX_CHARS = 8000  # Per kept section
+
+# A line holding only a (optionally numbered) known section name
+SECTION_HEADER_RE = re.compile(
+    r'^[ \t]*(?:\d+(?:\.\d+)*\.?|[IVX]+\.)?[ \t]*(?P<name>'
+    + '|'.join(name.replace(' ', r'[ \t]+') for name in INFORMATIVE_SECTIONS + SKIPPED_SECTIONS)
+    + r')[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+CAPTION_RE = re.compile(r'^[ \t]*(?:fig(?:ure)?\.?|table)[ \t]*S?\d+\b.*\n?', re.IGNORECASE | re.MULTILINE)
+
+# Structured output that fails validation gets one re-prompt with the error
+SCHEMA_ERRORS = (ValidationError, OutputParserException)
+SCHEMA_RETRY_PROMPT = """Your previous output did not match the extraction schema:
+{error}
+
+Return the extraction again, following the schema exactly and filling every required field."""
+
+QUALITY_FIELDS = {'quality_checks', 'quality_score'}  # Computed, never sent back to the LLM
+
+MAX_CHARS_PER_REQUEST = 100000
+BATCH_MAX_TOKENS = 16000  # Output budget for a batched request (gpt-4o's maximum)
+
+def _extract_informative(text: str, max_section_chars: int = SECTION_MAX_CHARS) -> str:
+    """
+    Keep only the regions of a paper that carry extractable information.
+    
+    The front matter and the abstract, introduction, methods, results,
+    discussion, conclusion and limitations sections are kept (each capped at
+    max_section_chars), figure and table captions are removed, and
+    references, acknowledgements and similar trailing sections are dropped.
+    
+    Args:
+        text: The paper text
+        max_section_chars: Maximum characters kept per section
+        
+    Returns:
+        The reduced text, or text unchanged if fewer than two informative
+        section headers are found
+    """
+    headers = list(SECTION_HEADER_RE.finditer(text))
+    names = [' '.join(m.group('name').lower().split()) for m in headers]
+    if sum(name in INFORMATIVE_SECTIONS for name in names) < 2:
+        return text
+    
+    parts = [text[:headers[0].start()].strip()[:FRONT_MATTER_MAX_CHARS]]
+    for i, (match, name) in enumerate(zip(headers, names)):
+        if name not in INFORMATIVE_SECTIONS:
+            continue
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        body = CAPTION_RE.sub('', text[match.end():end]).strip()
+        parts.append(f"{match.group('name').strip()}\n{body[:max_section_chars]}")
+    
+    return '\n\n'.join(parts)
+
+class SemanticCache:
+    """
+    Extraction cache keyed by an embedding of the start of each paper.
+    
+    Near-duplicate papers (re-runs, preprint versions) are matched by
+    cosine similarity, so they skip the LLM call entirely. Embeddings and
+    extractions are appended to files under cache_dir, and the FAISS index
+    is rebuilt from them on load.
+    """
+    
+    def __init__(self, cache_dir: str, model_name: str = SEMANTIC_CACHE_MODEL,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.cache_dir = Path(cache_dir)
+        self.embeddings_path = self.cache_dir / 'embeddings.f32'
+        self.entries_path = self.cache_dir / 'extractions.jsonl'
+        self.threshold = threshold
+        self.model = SentenceTransformer(model_name)
+        self._lock = threading.Lock()
+        
+        dimension = self.model.get_sentence_embedding_dimension()
+        self.index = faiss.IndexFlatIP(dimension)
+        self.entries = []
+        if self.embeddings_path.exists() and self.entries_path.exists():
+            try:
+                embeddings = np.fromfile(self.embeddings_path, dtype='float32').reshape(-1, dimension)
+                with open(self.entries_path, 'rb') as f:
+                    entries = [orjson.loads(line) for line in f]
+                
+                # Start over if the embeddings and extractions are out of sync
+                if len(embeddings) == len(entries):
+                    self.index.add(embeddings)
+                    self.entries = entries
+                else:
+                    print("  ✗ Semantic cache files are out of sync, starting empty")
+            except Exception as e:
+                print(f"  ✗ Could not load semantic cache ({e}), starting empty")
+    
+    def embed(self, text: str):
+        """Normalized embedding of the start of a paper (inner product = cosine)"""
+        return self.model.encode(
+            [text[:SEMANTIC_CACHE_PREFIX_CHARS]],
+            normalize_embeddings=True
+        ).astype('float32')
+    
+    def lookup(self, embedding) -> Optional[dict]:
+        """Return a copy of the cached extraction closest to embedding, if similar enough"""
+        with self._lock:
+            if self.index.ntotal == 0:
+                return None
+            scores, ids = self.index.search(embedding, 1)
+            if scores[0][0] < self.threshold:
+                return None
+            return dict(self.entries[ids[0][0]])
+    
+    def add(self, embedding, extraction: dict):
+        """Store an extraction, appending it to the cache files (write errors are only reported)"""
+        with self._lock:
+            self.index.add(embedding)
+            self.entries.append(dict(extraction))
+            
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.entries_path, 'ab') as f:
+                    f.write(orjson.dumps(extraction) + b'\n')
+                with open(self.embeddings_path, 'ab') as f:
+                    f.write(embedding.tobytes())
+            except OSError as e:
+                print(f"  ✗ Could not save to semantic cache: {e}")
+
+@lru_cache(maxsize=None)
+def get_semantic_cache(cache_dir: str) -> SemanticCache:
+    """Shared SemanticCache per directory (loads the embedding model once)"""
+    return SemanticCache(cache_dir)
 
 class LangChainPaperProcessor:
     """LangChain-based paper processor with structured output"""
     
-    def __init__(self, provider='anthropic', api_key=None):
+    def __init__(self, provider='anthropic', api_key=None, semantic_cache_dir=None, use_cache=True, cache_dir=None):
         """
         Initialize the LangChain processor.
         
         Args:
             provider: 'anthropic' or 'openai'
             api_key: API key (if None, reads from environment)
+            semantic_cache_dir: Directory for a semantic cache that reuses the
+                extractions of near-duplicate papers (None to disable; requires
+                faiss and sentence-transformers)
+            use_cache: Return cached results; if False, every paper is sent to
+                the LLM and the caches are refreshed with the new results
+            cache_dir: Response cache directory (from response_cache_dir; None for no cache)
         """
         self.provider = provider.lower()
         self.api_key = api_key
-        self.parser = PydanticOutputParser(pydantic_object=PaperExtraction)
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.semantic_cache = None
+        if semantic_cache_dir is not None:
+            if SEMANTIC_CACHE_AVAILABLE:
+                self.semantic_cache = get_semantic_cache(str(semantic_cache_dir))
+            else:
+                print("✗ faiss or sentence-transformers not installed, semantic cache disabled "
+                      "(pip install -r requirements-semantic-cache.txt)")
         self.chain = self._create_chain()
+        self.batch_chain = self.llm.model_copy(update={'max_tokens': BATCH_MAX_TOKENS}).with_structured_output(
+            PaperExtractionBatch, method='function_calling'
+        )
+        self.batch_instructions = BATCH_SYSTEM_PROMPT
+        self.batch_system_message = self._system_message(self.batch_instructions)
+        self.refine_system_message = self._system_message(REFINE_SYSTEM_PROMPT)
     
     def _create_chain(self):
         """Create the LangChain extraction chain"""
         
-        prompt = PromptTemplate(
-            template="""You are an expert research paper analyst. Extract comprehensive information from the following research paper.
-
-Pay special attention to:
-1. Biomarker-disease associations (genes, proteins, metabolites linked to diseases)
-2. Clinical relevance and evidence quality
-3. Methodological rigor
-
-{format_instructions}
-
-Research Paper:
-{paper_text}
-
-Provide a complete and accurate extraction. If information is not available, use "Not found" for string fields or empty lists for list fields.""",
-            input_variables=["paper_text"],
-            partial_variables={"format_instructions": self.parser.get_format_instructions()}
-        )
+        self.instructions = SYSTEM_PROMPT
+        self.temperature = 0.3
         
         # Initialize appropriate LLM
         if self.provider == 'anthropic':
             if self.api_key is None:
                 self.api_key = os.environ.get('ANTHROPIC_API_KEY')
+            self.model_name = "claude-sonnet-4-20250514"
             llm = ChatAnthropic(
-                model="claude-sonnet-4-20250514",
+                model=self.model_name,
                 api_key=self.api_key,
-                temperature=0.3,
+                temperature=self.temperature,
                 max_tokens=4000
             )
         elif self.provider == 'openai':
             if self.api_key is None:
                 self.api_key = os.environ.get('OPENAI_API_KEY')
+            self.model_name = "gpt-4o"
             llm = ChatOpenAI(
-                model="gpt-4o",
+                model=self.model_name,
                 api_key=self.api_key,
-                temperature=0.3,
+                temperature=self.temperature,
                 max_tokens=4000
             )
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
         
-        return LLMChain(llm=llm, prompt=prompt, output_parser=self.parser)
+        self.llm = llm
+        self.system_message = self._system_message(self.instructions)
+        
+        # The schema is sent as a tool definition and the model is forced to
+        # call it, so the output arrives as validated arguments instead of
+        # free text that has to be parsed
+        return llm.with_structured_output(PaperExtraction, method='function_calling')
+    
+    def _system_message(self, instructions: str) -> SystemMessage:
+        """Wrap static instructions in a system message the provider can cache"""
+        if self.provider == 'anthropic':
+            # Mark the instructions as a cache breakpoint: the first paper
+            # writes the cache and later papers only pay full price for their text
+            return SystemMessage(content=[{
+                "type": "text",
+                "text": instructions,
+                "cache_control": {"type": "ephemeral"}
+            }])
+        # OpenAI caches repeated prompt prefixes automatically
+        return SystemMessage(content=instructions)
+    
+    def _build_messages(self, paper_text: str) -> list:
+        """Static system instructions followed by the paper text"""
+        return [self.system_message, HumanMessage(content=f"Research Paper:\n{paper_text}")]
+    
+    @retry_transient
+    def _invoke(self, chain, messages: list):
+        """
+        Invoke a structured-output chain.
+        
+        Transient API errors are retried with backoff. Output that fails
+        schema validation is re-prompted once with the validation error;
+        other errors are raised immediately.
+        """
+        try:
+            return self._structured(chain.invoke(messages))
+        except SCHEMA_ERRORS as e:
+            print("  ✗ Output failed schema validation, re-prompting once")
+            retry_prompt = SCHEMA_RETRY_PROMPT.format(error=str(e)[:1000])
+            return self._structured(chain.invoke(messages + [HumanMessage(content=retry_prompt)]))
+    
+    @staticmethod
+    def _structured(result):
+        """The parsed output, or an OutputParserException if the model made no tool call"""
+        if result is None:
+            raise OutputParserException("Model returned no structured output")
+        return result
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        reraise=True
-    )
     def process_paper(self, text: str, filename: str) -> dict:
         """
         Process a paper with retry logic.
         
+        Papers longer than one request are refined part by part: each later
+        chunk is sent together with the extraction so far, so the tail of
+        the paper is not dropped.
+        
         Args:
             text: The paper text
             filename: Name of the paper file
@@ -115,31 +397,28 @@ Provide a complete and accurate extraction. If information is not available, use
             dict with extracted information
         """
         try:
+            text = self._informative_text(text)
+            
             # Chunk text if necessary
             chunks = self._chunk_text(text)
             
-            # Process first chunk (or combine if needed)
-            result = self.chain.invoke({"paper_text": chunks[0]})
+            cache_key = self._cache_key(text)
+            cached, embedding = self._check_cache(text, filename, cache_key)
+            if cached is not None:
+                return cached
             
-            # Convert Pydantic model to dict
-            if hasattr(result, 'dict'):
-                extraction = result.dict()
-            elif isinstance(result, dict):
-                extraction = result
-            else:
-                extraction = json.loads(str(result))
-            
-            # Add metadata
-            extraction['filename'] = filename
-            extraction['status'] = 'success'
-            extraction['chunks_processed'] = len(chunks)
-            extraction['api_provider'] = self.provider
-            extraction['processing_method'] = 'langchain'
+            # Process first chunk, then refine with the rest
+            result = self._invoke(self.chain, self._build_messages(chunks[0]))
+            for part, chunk in enumerate(chunks[1:], 2):
+                result = self._invoke(self.chain, [
+                    self.refine_system_message,
+                    HumanMessage(content=(
+                        f"Extraction so far:\n{result.model_dump_json(exclude=QUALITY_FIELDS)}\n\n"
+                        f"Research Paper (part {part} of {len(chunks)}):\n{chunk}"
+                    ))
+                ])
             
-            # Calculate quality score
-            extraction = self._validate_extraction(extraction)
-            
-            return extraction
+            return self._finish_extraction(result, filename, len(chunks), cache_key, embedding)
             
         except Exception as e:
             return {
@@ -150,56 +429,141 @@ Provide a complete and accurate extraction. If information is not available, use
                 'processing_method': 'langchain'
             }
     
-    def _chunk_text(self, text: str, max_chars: int = 100000) -> List[str]:
-        """Split text into chunks if necessary"""
-        if len(text) <= max_chars:
-            return [text]
-        
-        # Try to split on page boundaries
-        pages = text.split('--- Page')
-        chunks = []
-        current_chunk = ""
-        
-        for page in pages:
-            if len(current_chunk) + len(page) > max_chars and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = page
+    def _cache_key(self, paper_text: str) -> str:
+        """
+        Exact-match cache key for one paper.
+        
+        The single-paper and batched requests yield the same per-paper
+        extraction, so both share this key (covering both prompts and
+        schemas); a paper cached by one path is a hit on the other.
+        """
+        return response_cache_key(self.provider, self.model_name, self.temperature,
+                                  self.instructions, PAPER_SCHEMA, self.batch_instructions, BATCH_SCHEMA,
+                                  paper_text)
+    
+    def _check_cache(self, text: str, filename: str, cache_key: str):
+        """
+        Look a paper up in the exact-match cache, then the semantic cache.
+        
+        Returns:
+            (cached result or None, embedding to store the new result under)
+        """
+        if self.use_cache:
+            cached = load_cached_response(cache_key, filename, self.cache_dir)
+            if cached is not None:
+                return cached, None
+        
+        if self.semantic_cache is None:
+            return None, None
+        
+        embedding = self.semantic_cache.embed(text)
+        cached = self.semantic_cache.lookup(embedding) if self.use_cache else None
+        if cached is not None:
+            cached['filename'] = filename
+            cached['cache_hit'] = True
+        return cached, embedding
+    
+    def _finish_extraction(self, result: PaperExtraction, filename: str, chunks_processed: int,
+                           cache_key: str, embedding=None) -> dict:
+        """Dump an extraction (with its quality score) plus metadata to a dict, and cache it"""
+        extraction = result.model_dump()
+        extraction['filename'] = filename
+        extraction['status'] = 'success'
+        extraction['chunks_processed'] = chunks_processed
+        extraction['api_provider'] = self.provider
+        extraction['processing_method'] = 'langchain'
+        
+        save_cached_response(cache_key, extraction, self.cache_dir)
+        if embedding is not None:
+            self.semantic_cache.add(embedding, extraction)
+        
+        return extraction
+    
+    def _invoke_batch(self, texts: List[str]) -> List[PaperExtraction]:
+        """Extract several papers in one request"""
+        paper_text = "\n\n".join(f"### PAPER {i}\n{text}" for i, text in enumerate(texts, 1))
+        result = self._invoke(self.batch_chain, [self.batch_system_message, HumanMessage(content=paper_text)])
+        
+        if len(result.papers) != len(texts):
+            raise ValueError(f"Expected {len(texts)} extractions, got {len(result.papers)}")
+        
+        return result.papers
+    
+    def process_papers_batch(self, docs: List[Tuple[str, str]], batch_size: int = 4) -> List[dict]:
+        """
+        Process several papers, packing up to batch_size small papers into each request.
+        
+        Papers longer than MAX_CHARS_PER_REQUEST / batch_size are processed
+        one at a time with process_paper, as are the papers of any batch
+        whose combined response cannot be parsed.
+        
+        Args:
+            docs: List of (text, filename) tuples
+            batch_size: Maximum number of papers per request
+            
+        Returns:
+            List of result dicts, in the same order as docs
+        """
+        results = [None] * len(docs)
+        max_chars = MAX_CHARS_PER_REQUEST // max(batch_size, 1)
+        
+        small = []
+        texts = [self._informative_text(text) for text, _ in docs]
+        cache_keys = [None] * len(docs)
+        embeddings = [None] * len(docs)
+        for i, (doc, text) in enumerate(zip(docs, texts)):
+            filename = doc[1]
+            if batch_size > 1 and len(text) <= max_chars:
+                cache_keys[i] = self._cache_key(text)
+                results[i], embeddings[i] = self._check_cache(text, filename, cache_keys[i])
+                if results[i] is None:
+                    small.append(i)
             else:
-                current_chunk += ('--- Page' if current_chunk else '') + page
-        
-        if current_chunk:
-            chunks.append(current_chunk)
-        
-        return chunks
-    
-    def _validate_extraction(self, result: dict) -> dict:
-        """Validate extracted information and calculate quality score"""
-        checks = {
-            'has_title': bool(result.get('title') and result['title'] != 'Not found' and len(result['title']) > 5),
-            'has_authors': bool(result.get('authors') and result['authors'] != 'Not found'),
-            'has_findings': bool(result.get('key_findings') and len(result.get('key_findings', [])) > 0),
-            'has_year': self._validate_year(result.get('year')),
-            'sufficient_abstract': len(result.get('abstract', '')) > 50,
-            'has_methodology': bool(result.get('methodology') and result['methodology'] != 'Not found' and len(result['methodology']) > 20),
-            'has_biomarkers': len(result.get('biomarkers', [])) > 0
-        }
+                results[i] = self.process_paper(*doc)
         
-        result['quality_score'] = sum(checks.values()) / len(checks)
-        result['quality_checks'] = checks
+        for start in range(0, len(small), batch_size):
+            batch = small[start:start + batch_size]
+            if len(batch) == 1:
+                text, filename = docs[batch[0]]
+                results[batch[0]] = self.process_paper(text, filename)
+                continue
+            
+            try:
+                extractions = self._invoke_batch([texts[i] for i in batch])
+            except Exception as e:
+                print(f"  ✗ Batch extraction failed ({e}), processing papers individually")
+                for i in batch:
+                    results[i] = self.process_paper(*docs[i])
+                continue
+            
+            for i, extraction in zip(batch, extractions):
+                results[i] = self._finish_extraction(extraction, docs[i][1], 1, cache_keys[i], embeddings[i])
         
-        return result
+        return results
     
-    def _validate_year(self, year_str: str) -> bool:
-        """Validate publication year"""
-        if not year_str or year_str == 'Not found':
-            return False
-        try:
-            year = int(year_str)
-            return 1900 <= year <= 2026
-        except (ValueError, TypeError):
-            return False
+    def _informative_text(self, text: str) -> str:
+        """Reduce text to its informative sections, unless INFORMATIVE_SECTIONS_ONLY is off"""
+        return _extract_informative(text) if INFORMATIVE_SECTIONS_ONLY else text
+    
+    def _chunk_text(self, text: str, max_chars: int = MAX_CHARS_PER_REQUEST) -> List[str]:
+        """Split text into chunks if necessary"""
+        return chunk_text(text, max_chars)
+
+@lru_cache(maxsize=4)
+def get_langchain_processor(provider: str = 'anthropic', api_key: str = None, use_cache: bool = True,
+                            semantic_cache_dir: str = None, cache_dir: str = None) -> LangChainPaperProcessor:
+    """
+    Shared processor per configuration.
+    
+    Reusing the processor keeps its API client (and HTTP connection pool)
+    and structured-output chains alive across papers instead of rebuilding
+    them per call.
+    """
+    return LangChainPaperProcessor(provider=provider, api_key=api_key, semantic_cache_dir=semantic_cache_dir,
+                                   use_cache=use_cache, cache_dir=cache_dir)
 
-def process_paper_with_langchain(text: str, filename: str, api_key: str = None, provider: str = 'anthropic') -> dict:
+def process_paper_with_langchain(text: str, filename: str, api_key: str = None, provider: str = 'anthropic',
+                                 use_cache: bool = True, cache_dir: str = None) -> dict:
     """
     Convenience function to process a paper using LangChain.
     
@@ -208,11 +572,13 @@ def process_paper_with_langchain(text: str, filename: str, api_key: str = None,
         filename: Name of the paper file
         api_key: API key (optional)
         provider: 'anthropic' or 'openai'
+        use_cache: Return cached results (False forces a fresh extraction)
+        cache_dir: Response cache directory (from response_cache_dir; None for no cache)
         
     Returns:
         dict with extracted information
     """
-    processor = LangChainPaperProcessor(provider=provider, api_key=api_key)
+    processor = get_langchain_processor(provider.lower(), api_key, use_cache, cache_dir=cache_dir)
     return processor.process_paper(text, filename)
 
 if __name__ == '__main__':
@@ -0,0 +1,121 @@
+"""
+CloudWatch metrics for the pipeline.
+
+Metrics are queued and sent from a background thread in batches of up to
+20 per PutMetricData call, so neither the async event loop nor worker
+threads wait on CloudWatch.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+
+try:
+    import boto3
+    CLOUDWATCH_AVAILABLE = True
+except ImportError:
+    CLOUDWATCH_AVAILABLE = False
+
+MAX_METRICS_PER_CALL = 20  # PutMetricData limit per request
+METRIC_FLUSH_SECONDS = 5  # Longest a queued metric waits for others to share its request
+
+@lru_cache(maxsize=1)
+def _cloudwatch_client():
+    """CloudWatch client shared by every flush"""
+    return boto3.client('cloudwatch')
+
+def _put_metrics(metrics):
+    """Send metrics to CloudWatch in batches of up to 20"""
+    try:
+        for i in range(0, len(metrics), MAX_METRICS_PER_CALL):
+            _cloudwatch_client().put_metric_data(
+                Namespace='ResearchPaperProcessing',
+                MetricData=metrics[i:i + MAX_METRICS_PER_CALL]
+            )
+    except Exception as e:
+        print(f"Warning: Failed to send CloudWatch metrics: {e}")
+
+class MetricBuffer:
+    """
+    Sends queued CloudWatch metrics from a background thread.
+    
+    A batch is sent as soon as 20 metrics are queued, or flush_seconds
+    after its first metric, so callers never wait on CloudWatch. Call
+    flush_and_close() when done to send anything still queued; it also
+    runs at interpreter exit as a backstop.
+    """
+    
+    def __init__(self, flush_seconds=METRIC_FLUSH_SECONDS):
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush_and_close)
+    
+    def put(self, metric_data):
+        """Queue one MetricDatum (starts the sender thread on first use)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='cloudwatch-metrics', daemon=True)
+                self._thread.start()
+        self.queue.put(metric_data)
+    
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < MAX_METRICS_PER_CALL:
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    _put_metrics(batch)
+                    return
+                batch.append(item)
+            _put_metrics(batch)
+    
+    def flush_and_close(self):
+        """Stop the sender thread and send whatever is still queued"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join(timeout=30)
+        
+        remaining = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                remaining.append(item)
+        if remaining:
+            _put_metrics(remaining)
+
+METRIC_BUFFER = MetricBuffer()
+
+def send_cloudwatch_metric(metric_name, value, unit='Count', dimensions=None):
+    """Queue a metric for CloudWatch if available (sent in the background by METRIC_BUFFER)"""
+    if not CLOUDWATCH_AVAILABLE:
+        return
+    
+    metric_data = {
+        'MetricName': metric_name,
+        'Value': value,
+        'Unit': unit,
+        'Timestamp': datetime.utcnow()
+    }
+    
+    if dimensions:
+        metric_data['Dimensions'] = dimensions
+    
+    METRIC_BUFFER.put(metric_data)
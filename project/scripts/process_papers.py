@@ -6,79 +6,86 @@ Cloud support: Local, AWS, Azure.
 """
 
 import os
+import asyncio
 from pathlib import Path
-import json
-import csv
+import orjson
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
+from aiolimiter import AsyncLimiter
 import sys
 from datetime import datetime
-from tenacity import retry, stop_after_attempt, wait_exponential
-import numpy as np
+import pandas as pd
 
 try:
-    import boto3
-    CLOUDWATCH_AVAILABLE = True
+    import pyarrow
+    PARQUET_AVAILABLE = True
 except ImportError:
-    CLOUDWATCH_AVAILABLE = False
+    PARQUET_AVAILABLE = False
+
+try:
+    from datasketch import MinHash, MinHashLSH
+    MINHASH_AVAILABLE = True
+except ImportError:
+    MINHASH_AVAILABLE = False
 
 # Import our other modules
 sys.path.append(str(Path(__file__).parent))
 from extract_text import extract_text_from_pdf
-from summarize import summarize_paper, estimate_cost
-from pubmed_integration import find_new_papers, save_processed_papers, load_processed_papers
+from summarize import create_async_client, summarize_paper_async, summarize_papers_batch, estimate_cost
+from pubmed_integration import find_new_papers, TRACKING_FILENAME
 from email_notification import notify_new_papers
 from biomarker_aggregator import BiomarkerAggregator
 from cloud_storage import get_storage_client
+from text_store import TextStore, TEXT_STORE_FILENAME
+from response_cache import response_cache_dir
+from metrics import METRIC_BUFFER, send_cloudwatch_metric
 
-def send_cloudwatch_metric(metric_name, value, unit='Count', dimensions=None):
-    """Send metrics to CloudWatch if available"""
-    if not CLOUDWATCH_AVAILABLE:
-        return
-    
-    try:
-        cloudwatch = boto3.client('cloudwatch')
-        metric_data = {
-            'MetricName': metric_name,
-            'Value': value,
-            'Unit': unit,
-            'Timestamp': datetime.utcnow()
-        }
-        
-        if dimensions:
-            metric_data['Dimensions'] = dimensions
-        
-        cloudwatch.put_metric_data(
-            Namespace='ResearchPaperProcessing',
-            MetricData=[metric_data]
-        )
-    except Exception as e:
-        print(f"Warning: Failed to send CloudWatch metric: {e}")
+# Default API requests per minute, used unless --rpm is given
+DEFAULT_RPM = {
+    'anthropic': 50,
+    'openai': 500
+}
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10)
-)
-def process_single_paper(pdf_path, output_dir, api_key, provider, use_langchain=False):
+# LangChain requests arriving within BATCH_WAIT_SECONDS of each other are
+# coalesced into one extraction call of up to LANGCHAIN_BATCH_SIZE papers
+LANGCHAIN_BATCH_SIZE = 4
+BATCH_WAIT_SECONDS = 0.05
+
+# Near-duplicate detection (--coalesce-threshold)
+SHINGLE_WORDS = 5
+MINHASH_PERMUTATIONS = 128
+
+def _extraction_failure(error):
+    """Extraction result for a PDF whose worker process failed"""
+    return {'text': '', 'num_pages': 0, 'metadata': {}, 'success': False, 'error': str(error)}
+
+async def process_single_paper(pdf_path, extraction_result, text_store, client, provider, batcher=None,
+                               use_cache=True, rate_limiter=None, coalescer=None, cache_dir=None):
     """
-    Process a single paper: extract text and summarize.
+    Process a single paper: save its extracted text and summarize.
+    
+    File writes run in the default executor so they don't block the
+    event loop while other papers wait on the API.
     
     Args:
         pdf_path: Path to PDF file
-        output_dir: Directory to save results
-        api_key: API key for the chosen provider
+        extraction_result: Result of extract_text_from_pdf for pdf_path
+        text_store: TextStore receiving the extracted text
+        client: Async API client (from create_async_client)
         provider: 'anthropic' or 'openai'
-        use_langchain: Whether to use LangChain pipeline
+        batcher: AsyncBatcher running the LangChain pipeline (None to call the API directly)
+        use_cache: Reuse cached LLM results for identical papers
+        rate_limiter: AsyncLimiter shared by all papers to stay under the provider's RPM
+        coalescer: NearDuplicateCoalescer reusing summaries of near-duplicate papers
+        cache_dir: Response cache directory (from response_cache_dir; None for no cache)
         
     Returns:
         dict with results
     """
+    loop = asyncio.get_running_loop()
     filename = pdf_path.name if hasattr(pdf_path, 'name') else os.path.basename(pdf_path)
     
-    # Extract text
-    extraction_result = extract_text_from_pdf(pdf_path)
-    
     if not extraction_result['success']:
         return {
             'filename': filename,
@@ -87,50 +94,398 @@ def process_single_paper(pdf_path, output_dir, api_key, provider, use_langchain=
         }
     
     # Save extracted text
-    text_dir = Path(output_dir) / 'extracted_texts'
-    text_dir.mkdir(parents=True, exist_ok=True)
-    text_path = text_dir / f"{Path(filename).stem}.txt"
-    
-    with open(text_path, 'w', encoding='utf-8') as f:
-        f.write(extraction_result['text'])
+    await loop.run_in_executor(None, text_store.put, filename, extraction_result['text'])
     
     # Summarize using chosen method
-    if use_langchain:
-        from langchain_pipeline import process_paper_with_langchain
-        summary_result = process_paper_with_langchain(
-            extraction_result['text'], 
-            filename, 
-            api_key,
-            provider
-        )
+    duplicate_result = None
+    if coalescer is not None:
+        duplicate_result = await coalescer.find_duplicate(filename, extraction_result['text'])
+    
+    if duplicate_result is not None:
+        summary_result = dict(duplicate_result, filename=filename, coalesced_from=duplicate_result['filename'])
+    elif batcher is not None:
+        summary_result = await batcher.submit(extraction_result['text'], filename)
     else:
-        summary_result = summarize_paper(
+        summary_result = await summarize_paper_async(
             extraction_result['text'], 
             filename, 
-            api_key,
-            provider
+            client,
+            provider,
+            use_cache,
+            rate_limiter,
+            cache_dir
         )
     
     # Add extraction info
     summary_result['num_pages'] = extraction_result['num_pages']
     summary_result['text_length'] = len(extraction_result['text'])
     
-    # Small delay to respect rate limits
-    time.sleep(0.5)
-    
     return summary_result
 
+def load_checkpoint(checkpoint_path):
+    """
+    Load results saved by an earlier, interrupted run.
+    
+    Args:
+        checkpoint_path: JSONL file written by append_checkpoint
+        
+    Returns:
+        dict of filename -> result for papers that were processed successfully
+    """
+    done = {}
+    try:
+        with open(checkpoint_path, 'rb') as f:
+            for line in f:
+                try:
+                    result = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Line cut short by the interruption
+                if result.get('status') == 'success':
+                    done[result['filename']] = result
+    except FileNotFoundError:
+        pass
+    return done
+
+def append_checkpoint(checkpoint, result):
+    """Append one finished result to the checkpoint file, flushing immediately"""
+    if checkpoint is not None:
+        checkpoint.write(orjson.dumps(result) + b'\n')
+        checkpoint.flush()
+
+class AsyncBatcher:
+    """
+    Coalesce concurrent single-paper requests into batched calls.
+    
+    Requests submitted within wait_seconds of the first one (up to
+    max_batch_size) are handed to process_batch together, in the default
+    executor; a lone request is flushed as soon as the wait expires. Each
+    batch waits on rate_limiter once, as it is sent as one request.
+    """
+    
+    def __init__(self, process_batch, max_batch_size=LANGCHAIN_BATCH_SIZE, wait_seconds=BATCH_WAIT_SECONDS,
+                 rate_limiter=None):
+        """
+        Args:
+            process_batch: Blocking function taking a list of (text, filename)
+                tuples and returning one result dict per tuple, in order
+            max_batch_size: Maximum papers per call
+            wait_seconds: How long the first request waits for others to join it
+            rate_limiter: Optional AsyncLimiter acquired once per batch
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.wait_seconds = wait_seconds
+        self.rate_limiter = rate_limiter
+        self.queue = asyncio.Queue()
+        self._collector = None
+        self._batches = set()  # Keeps running batch tasks referenced
+    
+    async def submit(self, text, filename):
+        """Queue a paper and wait for its result"""
+        if self._collector is None:
+            self._collector = asyncio.create_task(self._collect())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, filename, future))
+        return await future
+    
+    async def _collect(self):
+        """Gather queued requests into batches and start each one without waiting for it"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.wait_seconds
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _run_batch(self, batch):
+        """Process one batch and resolve its requests' futures"""
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            docs = [(text, filename) for text, filename, _ in batch]
+            results = await asyncio.get_running_loop().run_in_executor(None, self.process_batch, docs)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (*_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def close(self):
+        """Stop collecting requests"""
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+
+class NearDuplicateCoalescer:
+    """
+    Send near-duplicate papers (revisions, preprint versions) to the LLM once.
+    
+    Each extracted text is MinHashed over word shingles. A paper whose
+    estimated Jaccard similarity to an earlier paper of the run reaches
+    threshold waits for that paper's summary and reuses it instead of
+    making its own API call.
+    """
+    
+    def __init__(self, threshold):
+        self.lsh = MinHashLSH(threshold=threshold, num_perm=MINHASH_PERMUTATIONS)
+        self.results = {}  # Representative filename -> future for its result
+    
+    @staticmethod
+    def minhash(text):
+        """MinHash of the text's word shingles"""
+        words = text.split()
+        shingles = {
+            ' '.join(words[i:i + SHINGLE_WORDS]).encode('utf-8')
+            for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))
+        }
+        minhash = MinHash(num_perm=MINHASH_PERMUTATIONS)
+        minhash.update_batch(shingles)
+        return minhash
+    
+    async def find_duplicate(self, filename, text):
+        """
+        Look for a near-duplicate among the papers already seen.
+        
+        Returns:
+            The duplicate's successful result, or None if there is no
+            duplicate (filename then becomes a representative and must be
+            passed to resolve) or the duplicate failed
+        """
+        loop = asyncio.get_running_loop()
+        minhash = await loop.run_in_executor(None, self.minhash, text)
+        
+        matches = self.lsh.query(minhash)
+        if not matches:
+            self.lsh.insert(filename, minhash)
+            self.results[filename] = loop.create_future()
+            return None
+        
+        result = await self.results[matches[0]]
+        return result if result.get('status') == 'success' else None
+    
+    def resolve(self, filename, result):
+        """Publish a representative's result to the papers waiting on it"""
+        future = self.results.get(filename)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+async def extract_papers(pdf_files, queue, num_consumers):
+    """
+    Producer: extract PDFs in worker processes and queue them for summarization.
+    
+    At most one extraction per CPU is in flight, and papers are queued in
+    the order they finish, so one slow PDF never holds back the rest. The
+    bounded queue stops extraction from running far ahead of the API
+    calls. A None is queued per consumer once every paper has been queued.
+    
+    Args:
+        pdf_files: List of PDF paths
+        queue: asyncio.Queue receiving (pdf_path, extraction_result) tuples
+        num_consumers: Number of consumers to signal when done
+    """
+    loop = asyncio.get_running_loop()
+    max_in_flight = os.cpu_count() or 1
+    
+    async def queue_finished(pending):
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            pdf_path = pending.pop(future)
+            try:
+                extraction_result = future.result()
+            except Exception as e:
+                extraction_result = _extraction_failure(e)
+            await queue.put((pdf_path, extraction_result))
+    
+    try:
+        with ProcessPoolExecutor(max_workers=max_in_flight) as pool:
+            pending = {}  # future -> pdf_path
+            for pdf_path in pdf_files:
+                pending[loop.run_in_executor(pool, extract_text_from_pdf, pdf_path)] = pdf_path
+                if len(pending) >= max_in_flight:
+                    await queue_finished(pending)
+            
+            while pending:
+                await queue_finished(pending)
+    finally:
+        for _ in range(num_consumers):
+            await queue.put(None)
+
+async def process_papers_concurrently(pdf_files, output_dir, api_key, provider, use_langchain=False, max_workers=5,
+                                      use_cache=True, rpm=None, checkpoint=None, coalesce_threshold=None,
+                                      semantic_cache=False):
+    """
+    Process papers as a two-stage pipeline on one event loop.
+    
+    A producer extracts PDFs in worker processes while max_workers
+    consumers summarize already-extracted papers, so PDF parsing overlaps
+    with waiting on the API instead of adding to it. With use_langchain,
+    papers reaching the API at about the same time are packed into shared
+    extraction requests by an AsyncBatcher.
+    
+    Args:
+        pdf_files: List of PDF paths
+        output_dir: Directory to save results
+        api_key: API key for the chosen provider
+        provider: 'anthropic' or 'openai'
+        use_langchain: Whether to use LangChain pipeline
+        max_workers: Maximum number of papers being summarized at once
+        use_cache: Reuse cached LLM results for identical papers
+        rpm: Maximum API requests per minute (default: DEFAULT_RPM for the provider)
+        checkpoint: Binary file each result is appended to as soon as it's done
+        coalesce_threshold: Similarity (0-1) above which near-duplicate papers
+            share one summary (None to summarize every paper; needs datasketch)
+        semantic_cache: With use_langchain, reuse the extractions of near-duplicate
+            papers from output_dir/.semantic_cache (needs faiss and sentence-transformers)
+        
+    Returns:
+        List of result dicts, in the same order as pdf_files
+    """
+    client = create_async_client(provider, api_key)
+    rate_limiter = AsyncLimiter(rpm or DEFAULT_RPM[provider], time_period=60)
+    queue = asyncio.Queue(maxsize=2 * max_workers)
+    text_store = TextStore(Path(output_dir) / TEXT_STORE_FILENAME)
+    results = [None] * len(pdf_files)
+    index_of = {pdf_path: i for i, pdf_path in enumerate(pdf_files)}
+    cache_dir = response_cache_dir(output_dir)
+    
+    coalescer = None
+    if coalesce_threshold is not None:
+        if MINHASH_AVAILABLE:
+            coalescer = NearDuplicateCoalescer(coalesce_threshold)
+        else:
+            print("✗ datasketch not installed, near-duplicate coalescing disabled (pip install datasketch)")
+    
+    batcher = None
+    if use_langchain:
+        from langchain_pipeline import get_langchain_processor, SEMANTIC_CACHE_DIRNAME
+        semantic_cache_dir = str(Path(output_dir) / SEMANTIC_CACHE_DIRNAME) if semantic_cache else None
+        processor = get_langchain_processor(provider, api_key, use_cache, semantic_cache_dir, str(cache_dir))
+        batcher = AsyncBatcher(
+            lambda docs: processor.process_papers_batch(docs, batch_size=LANGCHAIN_BATCH_SIZE),
+            rate_limiter=rate_limiter
+        )
+    
+    async def summarize_papers(pbar):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            
+            pdf_path, extraction_result = item
+            try:
+                result = await process_single_paper(
+                    pdf_path, extraction_result, text_store, client, provider, batcher, use_cache, rate_limiter,
+                    coalescer, cache_dir
+                )
+            except Exception as e:
+                result = {
+                    'filename': pdf_path.name,
+                    'status': 'processing_error',
+                    'error': str(e),
+                    'api_provider': provider
+                }
+            if coalescer is not None:
+                coalescer.resolve(pdf_path.name, result)
+            results[index_of[pdf_path]] = result
+            append_checkpoint(checkpoint, result)
+            
+            # Show status
+            status_icon = "✓" if result.get('status') == 'success' else "✗"
+            pbar.set_postfix_str(f"{status_icon} {result['filename'][:30]}")
+            pbar.update(1)
+    
+    try:
+        with tqdm(total=len(pdf_files), desc="Processing papers") as pbar:
+            await asyncio.gather(
+                extract_papers(pdf_files, queue, max_workers),
+                *(summarize_papers(pbar) for _ in range(max_workers))
+            )
+    finally:
+        if batcher is not None:
+            await batcher.close()
+        await client.close()
+        text_store.close()
+    
+    return results
+
+def process_papers_batch_api(pdf_files, output_dir, api_key, provider, use_cache=True):
+    """
+    Process papers through the provider's Batch API (about half the cost,
+    results within 24 hours).
+    
+    Args:
+        pdf_files: List of PDF paths
+        output_dir: Directory to save results
+        api_key: API key for the chosen provider
+        provider: 'anthropic' or 'openai'
+        use_cache: Reuse cached LLM results for identical papers
+        
+    Returns:
+        List of result dicts
+    """
+    results = []
+    papers = []
+    extractions = []
+    
+    with ProcessPoolExecutor() as pool, TextStore(Path(output_dir) / TEXT_STORE_FILENAME) as text_store:
+        extracted = pool.map(extract_text_from_pdf, pdf_files, chunksize=2)
+        for pdf_path, extraction_result in tqdm(zip(pdf_files, extracted), total=len(pdf_files), desc="Extracting text"):
+            if not extraction_result['success']:
+                results.append({
+                    'filename': pdf_path.name,
+                    'status': 'extraction_failed',
+                    'error': extraction_result['error']
+                })
+                continue
+            
+            text_store.put(pdf_path.name, extraction_result['text'])
+            papers.append((extraction_result['text'], pdf_path.name))
+            extractions.append(extraction_result)
+    
+    summaries = summarize_papers_batch(papers, api_key, provider, use_cache, cache_dir=response_cache_dir(output_dir))
+    
+    for summary_result, extraction_result in zip(summaries, extractions):
+        # Add extraction info
+        summary_result['num_pages'] = extraction_result['num_pages']
+        summary_result['text_length'] = len(extraction_result['text'])
+        results.append(summary_result)
+    
+    return results
+
 def track_metrics(results, start_time, end_time, provider):
     """Calculate and save performance metrics"""
     duration = end_time - start_time
-    successful = sum(1 for r in results if r.get('status') == 'success')
     
-    # Calculate quality scores
-    quality_scores = [r.get('quality_score', 0) for r in results if r.get('status') == 'success' and r.get('quality_score')]
-    avg_quality = np.mean(quality_scores) if quality_scores else 0
-    
-    # Count biomarkers
-    total_biomarkers = sum(len(r.get('biomarkers', [])) for r in results if r.get('status') == 'success')
+    # Success count, quality scores and biomarkers in one pass
+    successful = 0
+    quality_sum = 0.0
+    quality_count = 0
+    total_biomarkers = 0
+    for r in results:
+        if r.get('status') != 'success':
+            continue
+        successful += 1
+        quality_score = r.get('quality_score')
+        if quality_score:
+            quality_sum += quality_score
+            quality_count += 1
+        total_biomarkers += len(r.get('biomarkers', []))
+    avg_quality = quality_sum / quality_count if quality_count else 0
     
     metrics = {
         'timestamp': datetime.now().isoformat(),
@@ -144,19 +499,26 @@ def track_metrics(results, start_time, end_time, provider):
         'total_biomarkers_extracted': total_biomarkers
     }
     
-    # Send to CloudWatch
-    send_cloudwatch_metric('TotalPapersProcessed', len(results), dimensions=[{'Name': 'Provider', 'Value': provider}])
-    send_cloudwatch_metric('SuccessfulProcessing', successful, dimensions=[{'Name': 'Provider', 'Value': provider}])
-    send_cloudwatch_metric('FailedProcessing', len(results) - successful, dimensions=[{'Name': 'Provider', 'Value': provider}])
-    send_cloudwatch_metric('AverageQualityScore', avg_quality, unit='None', dimensions=[{'Name': 'Provider', 'Value': provider}])
-    send_cloudwatch_metric('TotalBiomarkers', total_biomarkers, dimensions=[{'Name': 'Provider', 'Value': provider}])
+    # Queue for CloudWatch; the five metrics go out together in one request
+    dimensions = [{'Name': 'Provider', 'Value': provider}]
+    send_cloudwatch_metric('TotalPapersProcessed', len(results), dimensions=dimensions)
+    send_cloudwatch_metric('SuccessfulProcessing', successful, dimensions=dimensions)
+    send_cloudwatch_metric('FailedProcessing', len(results) - successful, dimensions=dimensions)
+    send_cloudwatch_metric('AverageQualityScore', avg_quality, unit='None', dimensions=dimensions)
+    send_cloudwatch_metric('TotalBiomarkers', total_biomarkers, dimensions=dimensions)
     
     return metrics
 
+# Numeric result columns, kept numeric in the Parquet copy
+NUMERIC_COLUMNS = ['num_biomarkers', 'quality_score', 'num_pages', 'text_length', 'chunks_processed']
+
 def save_results_to_csv(results, output_path):
     """
     Save results to a CSV file.
     
+    A Parquet copy (same columns, zstd-compressed) is written next to it
+    when pyarrow is installed.
+    
     Args:
         results: List of result dictionaries
         output_path: Path to save CSV file
@@ -190,276 +552,286 @@ def save_results_to_csv(results, output_path):
         'error'
     ]
     
-    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
-        
-        for result in results:
-            # Convert list to string for key_findings
-            if 'key_findings' in result and isinstance(result['key_findings'], list):
-                result['key_findings'] = ' | '.join(result['key_findings'])
-            
-            # Process biomarkers
-            if 'biomarkers' in result and isinstance(result['biomarkers'], list):
-                result['num_biomarkers'] = len(result['biomarkers'])
-                # Convert biomarkers to JSON string for CSV
-                result['biomarkers'] = json.dumps(result['biomarkers'])
-            else:
-                result['num_biomarkers'] = 0
-            
-            # Fill in missing fields
-            row = {field: result.get(field, '') for field in fieldnames}
-            writer.writerow(row)
+    # Object dtype keeps values as-is (no int -> float upcasting around missing fields)
+    df = pd.DataFrame(results, dtype=object).reindex(columns=fieldnames)
+    
+    # Convert list to string for key_findings
+    df['key_findings'] = df['key_findings'].map(lambda x: ' | '.join(x) if isinstance(x, list) else x)
+    
+    # Process biomarkers, converting them to JSON strings for CSV
+    df['num_biomarkers'] = df['biomarkers'].map(lambda x: len(x) if isinstance(x, list) else 0)
+    df['biomarkers'] = df['biomarkers'].map(lambda x: orjson.dumps(x).decode() if isinstance(x, list) else x)
     
+    df.to_csv(output_path, index=False, encoding='utf-8', lineterminator='\r\n')
     print(f"\nResults saved to: {output_path}")
+    
+    if PARQUET_AVAILABLE:
+        for column in fieldnames:
+            if column in NUMERIC_COLUMNS:
+                df[column] = pd.to_numeric(df[column], errors='coerce').convert_dtypes()
+            else:
+                df[column] = df[column].astype('string')
+        
+        parquet_path = Path(output_path).with_suffix('.parquet')
+        df.to_parquet(parquet_path, index=False, compression='zstd')
+        print(f"Results saved to: {parquet_path}")
 
 def main(papers_dir='project/papers', output_dir='project/outputs', max_workers=5, 
          provider='anthropic', use_langchain=False, check_pubmed=False, 
-         pubmed_query='', user_email='', cloud_provider='local'):
+         pubmed_query='', user_email='', cloud_provider='local', use_cache=True, rpm=None,
+         use_batch_api=False, coalesce_threshold=None, assume_yes=False, semantic_cache=False,
+         resume=True):
     """
     Main pipeline to process all papers.
     
     Args:
         papers_dir: Directory containing PDF files
         output_dir: Directory to save results
-        max_workers: Number of parallel workers for API calls
+        max_workers: Maximum number of concurrent API calls
         provider: 'anthropic' or 'openai'
         use_langchain: Whether to use LangChain pipeline
         check_pubmed: Whether to check PubMed for new papers
         pubmed_query: PubMed search query
         user_email: Email for notifications
         cloud_provider: 'local', 'aws', or 'azure'
+        use_cache: Reuse cached LLM results for papers processed before
+        rpm: Maximum API requests per minute (default depends on the provider)
+        use_batch_api: Submit all papers through the provider's Batch API
+        coalesce_threshold: Similarity (0-1) above which near-duplicate papers share one summary
+        assume_yes: Skip the cost confirmation prompt (for cron and other unattended runs)
+        semantic_cache: With use_langchain, reuse extractions of near-duplicate papers
+        resume: Skip papers that already succeeded in an interrupted earlier run
     """
-    start_time = time.time()
-    
-    print(f"{'='*60}")
-    print(f"Research Paper Processing Pipeline")
-    print(f"{'='*60}")
-    print(f"Platform: {sys.platform}")
-    print(f"Cloud Provider: {cloud_provider.upper()}")
-    print(f"API Provider: {provider.upper()}")
-    print(f"Processing Method: {'LangChain' if use_langchain else 'Direct API'}")
-    
-    # Initialize cloud storage
-    storage = get_storage_client(cloud_provider)
+    try:
+        start_time = time.time()
     
-    # Check PubMed for new papers if requested
-    if check_pubmed and pubmed_query:
-        print(f"\n{'='*60}")
-        print("Checking PubMed for new papers...")
         print(f"{'='*60}")
+        print(f"Research Paper Processing Pipeline")
+        print(f"{'='*60}")
+        print(f"Platform: {sys.platform}")
+        print(f"Cloud Provider: {cloud_provider.upper()}")
+        print(f"API Provider: {provider.upper()}")
+        print(f"Processing Method: {'Batch API' if use_batch_api else 'LangChain' if use_langchain else 'Direct API'}")
+    
+        # Initialize cloud storage
+        storage = get_storage_client(cloud_provider)
+    
+        # Check PubMed for new papers if requested
+        if check_pubmed and pubmed_query:
+            print(f"\n{'='*60}")
+            print("Checking PubMed for new papers...")
+            print(f"{'='*60}")
         
-        tracking_file = os.path.join(output_dir, 'processed_papers.json')
-        new_papers = find_new_papers(pubmed_query, tracking_file, max_results=100, days_back=30)
+            tracking_file = os.path.join(output_dir, TRACKING_FILENAME)
+            new_papers = find_new_papers(pubmed_query, tracking_file, max_results=100, days_back=30)
         
-        if new_papers:
-            print(f"\n✓ Found {len(new_papers)} new papers!")
+            if new_papers:
+                print(f"\n✓ Found {len(new_papers)} new papers!")
             
-            # Send email notification
-            if user_email:
-                email_method = 'aws_ses' if cloud_provider == 'aws' else \
-                              'azure' if cloud_provider == 'azure' else 'smtp'
+                # Send email notification
+                if user_email:
+                    email_method = 'aws_ses' if cloud_provider == 'aws' else \
+                                  'azure' if cloud_provider == 'azure' else 'smtp'
                 
-                print(f"Sending email notification to {user_email}...")
-                notify_new_papers(new_papers, user_email, pubmed_query, method=email_method)
-            
-            # Save paper details
-            new_papers_file = os.path.join(output_dir, f'new_papers_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-            with open(new_papers_file, 'w') as f:
-                json.dump(new_papers, f, indent=2)
-            print(f"New papers list saved to: {new_papers_file}")
+                    print(f"Sending email notification to {user_email}...")
+                    notify_new_papers(new_papers, user_email, pubmed_query, method=email_method)
             
-            # Update processed papers list
-            processed = load_processed_papers(tracking_file)
-            processed.update(p['pmid'] for p in new_papers)
-            save_processed_papers(tracking_file, processed)
-        else:
-            print("No new papers found.")
-    
-    # Validate provider
-    provider = provider.lower()
-    if provider not in ['anthropic', 'openai']:
-        print(f"ERROR: Invalid provider '{provider}'. Use 'anthropic' or 'openai'.")
-        return
+                # Save paper details
+                new_papers_file = os.path.join(output_dir, f'new_papers_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+                with open(new_papers_file, 'wb') as f:
+                    f.write(orjson.dumps([paper._asdict() for paper in new_papers], option=orjson.OPT_INDENT_2))
+                print(f"New papers list saved to: {new_papers_file}")
+            else:
+                print("No new papers found.")
     
-    # Get API key based on provider
-    if provider == 'anthropic':
-        api_key = os.environ.get('ANTHROPIC_API_KEY')
-        if not api_key:
-            print("ERROR: ANTHROPIC_API_KEY environment variable not set.")
-            print("Please set it with: export ANTHROPIC_API_KEY='your-api-key'")
-            return
-    else:  # openai
-        api_key = os.environ.get('OPENAI_API_KEY')
-        if not api_key:
-            print("ERROR: OPENAI_API_KEY environment variable not set.")
-            print("Please set it with: export OPENAI_API_KEY='your-api-key'")
+        # Validate provider
+        provider = provider.lower()
+        if provider not in ['anthropic', 'openai']:
+            print(f"ERROR: Invalid provider '{provider}'. Use 'anthropic' or 'openai'.")
             return
     
-    # Create output directory
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+        # Get API key based on provider
+        if provider == 'anthropic':
+            api_key = os.environ.get('ANTHROPIC_API_KEY')
+            if not api_key:
+                print("ERROR: ANTHROPIC_API_KEY environment variable not set.")
+                print("Please set it with: export ANTHROPIC_API_KEY='your-api-key'")
+                return
+        else:  # openai
+            api_key = os.environ.get('OPENAI_API_KEY')
+            if not api_key:
+                print("ERROR: OPENAI_API_KEY environment variable not set.")
+                print("Please set it with: export OPENAI_API_KEY='your-api-key'")
+                return
+    
+        # Create output directory
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+        # Get all PDF files
+        papers_path = Path(papers_dir)
+        if not papers_path.exists():
+            print(f"ERROR: Papers directory not found: {papers_dir}")
+            print("Please create it and add PDF files.")
+            return
     
-    # Get all PDF files
-    papers_path = Path(papers_dir)
-    if not papers_path.exists():
-        print(f"ERROR: Papers directory not found: {papers_dir}")
-        print("Please create it and add PDF files.")
-        return
+        pdf_files = list(papers_path.glob('*.pdf'))
     
-    pdf_files = list(papers_path.glob('*.pdf'))
+        if not pdf_files:
+            print(f"No PDF files found in {papers_dir}")
+            return
     
-    if not pdf_files:
-        print(f"No PDF files found in {papers_dir}")
-        return
+        print(f"\nFound {len(pdf_files)} PDF files")
+    
+        # Resume an interrupted run: papers that already succeeded are not sent again
+        checkpoint_path = Path(output_dir) / f'results_checkpoint_{provider}.jsonl'
+        previous_results = load_checkpoint(checkpoint_path) if resume else {}
+        if previous_results:
+            pdf_files = [pdf_path for pdf_path in pdf_files if pdf_path.name not in previous_results]
+            print(f"✓ Resuming: {len(previous_results)} papers already processed, {len(pdf_files)} remaining")
+    
+        results = list(previous_results.values())
+    
+        if pdf_files:
+            # Estimate costs
+            cost_estimate = estimate_cost(len(pdf_files), provider=provider)
+            print(f"\nEstimated API costs ({cost_estimate['provider']}):")
+            print(f"  Input tokens: {cost_estimate['input_tokens']}")
+            print(f"  Output tokens: {cost_estimate['output_tokens']}")
+            print(f"  Input cost: {cost_estimate['input_cost']}")
+            print(f"  Output cost: {cost_estimate['output_cost']}")
+            print(f"  Total estimated cost: {cost_estimate['estimated_total']}")
+        
+            # Ask for confirmation
+            if not assume_yes:
+                response = input(f"\nProceed with processing {len(pdf_files)} papers using {provider.upper()}? (y/n): ")
+                if response.lower() != 'y':
+                    print("Processing cancelled.")
+                    return
+        
+            # Every finished result is appended to the checkpoint as it arrives (never
+            # truncated, so a --no-resume run cannot discard an interrupted run's progress)
+            with open(checkpoint_path, 'ab') as checkpoint:
+                if checkpoint.tell():
+                    checkpoint.write(b'\n')  # Terminate a line cut short by an interruption
+                if use_batch_api:
+                    print("\nSubmitting papers to the Batch API (about 50% cheaper; results can take up to 24 hours)...\n")
+                    new_results = process_papers_batch_api(pdf_files, output_dir, api_key, provider, use_cache)
+                    for result in new_results:
+                        append_checkpoint(checkpoint, result)
+                else:
+                    print(f"\nProcessing papers with up to {max_workers} concurrent requests...")
+                    print("(This may take a while...)\n")
+                
+                    # Process papers concurrently
+                    new_results = asyncio.run(process_papers_concurrently(
+                        pdf_files, output_dir, api_key, provider, use_langchain, max_workers, use_cache, rpm,
+                        checkpoint, coalesce_threshold, semantic_cache
+                    ))
+        
+            results.extend(new_results)
     
-    print(f"\nFound {len(pdf_files)} PDF files")
-    
-    # Estimate costs
-    cost_estimate = estimate_cost(len(pdf_files), provider=provider)
-    print(f"\nEstimated API costs ({cost_estimate['provider']}):")
-    print(f"  Input tokens: {cost_estimate['input_tokens']}")
-    print(f"  Output tokens: {cost_estimate['output_tokens']}")
-    print(f"  Input cost: {cost_estimate['input_cost']}")
-    print(f"  Output cost: {cost_estimate['output_cost']}")
-    print(f"  Total estimated cost: {cost_estimate['estimated_total']}")
-    
-    # Ask for confirmation
-    response = input(f"\nProceed with processing {len(pdf_files)} papers using {provider.upper()}? (y/n): ")
-    if response.lower() != 'y':
-        print("Processing cancelled.")
-        return
+        # Save results locally first
+        csv_path = Path(output_dir) / f'paper_summaries_{provider}.csv'
+        save_results_to_csv(results, csv_path)
     
-    print(f"\nProcessing papers with {max_workers} parallel workers...")
-    print("(This may take a while...)\n")
+        json_path = Path(output_dir) / f'paper_summaries_{provider}.json'
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        print(f"Detailed results saved to: {json_path}")
     
-    results = []
+        # The run's results are saved, so the next run starts from scratch
+        checkpoint_path.unlink(missing_ok=True)
     
-    # Process papers in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_pdf = {
-            executor.submit(process_single_paper, pdf_path, output_dir, api_key, provider, use_langchain): pdf_path
-            for pdf_path in pdf_files
-        }
-        
-        # Process completed tasks with progress bar
-        with tqdm(total=len(pdf_files), desc="Processing papers") as pbar:
-            for future in as_completed(future_to_pdf):
-                pdf_path = future_to_pdf[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    
-                    # Show status
-                    status_icon = "✓" if result.get('status') == 'success' else "✗"
-                    pbar.set_postfix_str(f"{status_icon} {pdf_path.name[:30]}")
-                    
-                except Exception as e:
-                    results.append({
-                        'filename': pdf_path.name,
-                        'status': 'processing_error',
-                        'error': str(e),
-                        'api_provider': provider
-                    })
-                    pbar.set_postfix_str(f"✗ {pdf_path.name[:30]}")
-                
-                pbar.update(1)
-    
-    # Save results locally first
-    csv_path = Path(output_dir) / f'paper_summaries_{provider}.csv'
-    save_results_to_csv(results, csv_path)
-    
-    json_path = Path(output_dir) / f'paper_summaries_{provider}.json'
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2)
-    print(f"Detailed results saved to: {json_path}")
-    
-    # Aggregate biomarkers
-    print(f"\n{'='*60}")
-    print("Aggregating biomarker data across papers...")
-    print(f"{'='*60}")
-    
-    aggregator = BiomarkerAggregator()
-    for result in results:
-        if result.get('status') == 'success':
-            aggregator.add_paper_results(result)
-    
-    summary = aggregator.get_summary()
-    print(f"\nBiomarker Summary:")
-    print(f"  Total unique biomarkers: {summary['total_unique_biomarkers']}")
-    print(f"  Total associations: {summary['total_biomarker_disease_associations']}")
-    
-    # Save biomarker data
-    biomarker_json_path = Path(output_dir) / f'biomarkers_aggregated_{provider}.json'
-    aggregator.export_to_json(str(biomarker_json_path))
-    
-    biomarker_csv_path = Path(output_dir) / f'biomarkers_aggregated_{provider}.csv'
-    aggregator.export_to_csv(str(biomarker_csv_path))
-    
-    # Find high-confidence associations
-    high_conf = aggregator.find_high_confidence_associations(min_papers=2)
-    if high_conf:
-        print(f"\nHigh-confidence associations (mentioned in 2+ papers): {len(high_conf)}")
-        high_conf_path = Path(output_dir) / f'high_confidence_associations_{provider}.json'
-        with open(high_conf_path, 'w') as f:
-            json.dump(high_conf, f, indent=2)
-        print(f"Saved to: {high_conf_path}")
-    
-    # Calculate and save metrics
-    end_time = time.time()
-    metrics = track_metrics(results, start_time, end_time, provider)
-    
-    metrics_path = Path(output_dir) / f'metrics_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{provider}.json'
-    with open(metrics_path, 'w', encoding='utf-8') as f:
-        json.dump(metrics, f, indent=2)
-    print(f"Metrics saved to: {metrics_path}")
-    
-    # Upload to cloud if not local
-    if cloud_provider != 'local':
+        # Aggregate biomarkers
         print(f"\n{'='*60}")
-        print(f"Uploading results to {cloud_provider.upper()}...")
+        print("Aggregating biomarker data across papers...")
         print(f"{'='*60}")
+    
+        aggregator = BiomarkerAggregator()
+        for result in results:
+            if result.get('status') == 'success':
+                aggregator.add_paper_results(result)
+    
+        summary = aggregator.get_summary()
+        print(f"\nBiomarker Summary:")
+        print(f"  Total unique biomarkers: {summary['total_unique_biomarkers']}")
+        print(f"  Total associations: {summary['total_biomarker_disease_associations']}")
+    
+        # Save biomarker data
+        biomarker_json_path = Path(output_dir) / f'biomarkers_aggregated_{provider}.json'
+        aggregator.export_to_json(str(biomarker_json_path))
+    
+        biomarker_csv_path = Path(output_dir) / f'biomarkers_aggregated_{provider}.csv'
+        aggregator.export_to_csv(str(biomarker_csv_path))
+    
+        # Find high-confidence associations
+        high_conf = aggregator.find_high_confidence_associations(min_papers=2)
+        if high_conf:
+            print(f"\nHigh-confidence associations (mentioned in 2+ papers): {len(high_conf)}")
+            high_conf_path = Path(output_dir) / f'high_confidence_associations_{provider}.json'
+            with open(high_conf_path, 'wb') as f:
+                f.write(orjson.dumps(high_conf, option=orjson.OPT_INDENT_2))
+            print(f"Saved to: {high_conf_path}")
+    
+        # Calculate and save metrics
+        end_time = time.time()
+        metrics = track_metrics(results, start_time, end_time, provider)
+    
+        metrics_path = Path(output_dir) / f'metrics_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{provider}.json'
+        with open(metrics_path, 'wb') as f:
+            f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
+        print(f"Metrics saved to: {metrics_path}")
+    
+        # Upload to cloud if not local
+        if cloud_provider != 'local':
+            print(f"\n{'='*60}")
+            print(f"Uploading results to {cloud_provider.upper()}...")
+            print(f"{'='*60}")
         
-        files_to_upload = [
-            csv_path,
-            json_path,
-            biomarker_json_path,
-            biomarker_csv_path,
-            metrics_path
-        ]
+            files_to_upload = [
+                csv_path,
+                json_path,
+                biomarker_json_path,
+                biomarker_csv_path,
+                metrics_path
+            ]
         
-        if high_conf:
-            files_to_upload.append(high_conf_path)
+            if high_conf:
+                files_to_upload.append(high_conf_path)
         
-        for local_file in files_to_upload:
-            remote_path = f"outputs/{local_file.name}"
-            storage.upload_file(str(local_file), remote_path)
-    
-    # Print summary statistics
-    successful = sum(1 for r in results if r.get('status') == 'success')
-    failed = len(results) - successful
-    
-    print(f"\n{'='*60}")
-    print(f"Processing Complete!")
-    print(f"{'='*60}")
-    print(f"Platform: {sys.platform}")
-    print(f"Cloud Provider: {cloud_provider.upper()}")
-    print(f"API Provider: {provider.upper()}")
-    print(f"Total papers: {len(results)}")
-    print(f"Successful: {successful}")
-    print(f"Failed: {failed}")
-    print(f"Processing time: {metrics['duration_seconds']:.2f} seconds")
-    print(f"Papers per minute: {metrics['papers_per_minute']:.2f}")
-    print(f"Average quality score: {metrics['average_quality_score']:.3f}")
-    print(f"Total biomarkers extracted: {metrics['total_biomarkers_extracted']}")
-    print(f"Unique biomarkers: {summary['total_unique_biomarkers']}")
-    print(f"Biomarker-disease associations: {summary['total_biomarker_disease_associations']}")
-    
-    if failed > 0:
-        print(f"\nFailed papers:")
-        for result in results:
-            if result.get('status') != 'success':
-                print(f"  - {result['filename']}: {result.get('error', 'Unknown error')}")
+            for local_file in files_to_upload:
+                remote_path = f"outputs/{local_file.name}"
+                storage.upload_file(str(local_file), remote_path)
+    
+        # Print summary statistics
+        successful = sum(1 for r in results if r.get('status') == 'success')
+        failed = len(results) - successful
+    
+        print(f"\n{'='*60}")
+        print(f"Processing Complete!")
+        print(f"{'='*60}")
+        print(f"Platform: {sys.platform}")
+        print(f"Cloud Provider: {cloud_provider.upper()}")
+        print(f"API Provider: {provider.upper()}")
+        print(f"Total papers: {len(results)}")
+        print(f"Successful: {successful}")
+        print(f"Failed: {failed}")
+        print(f"Processing time: {metrics['duration_seconds']:.2f} seconds")
+        print(f"Papers per minute: {metrics['papers_per_minute']:.2f}")
+        print(f"Average quality score: {metrics['average_quality_score']:.3f}")
+        print(f"Total biomarkers extracted: {metrics['total_biomarkers_extracted']}")
+        print(f"Unique biomarkers: {summary['total_unique_biomarkers']}")
+        print(f"Biomarker-disease associations: {summary['total_biomarker_disease_associations']}")
+    
+        if failed > 0:
+            print(f"\nFailed papers:")
+            for result in results:
+                if result.get('status') != 'success':
+                    print(f"  - {result['filename']}: {result.get('error', 'Unknown error')}")
+    finally:
+        # Send queued metrics now: atexit handlers do not run when main() is the
+        # target of a multiprocessing child (e.g. the GUI), which exits via os._exit
+        METRIC_BUFFER.flush_and_close()
 
 if __name__ == '__main__':
     import argparse
@@ -470,7 +842,7 @@ if __name__ == '__main__':
     parser.add_argument('--output-dir', default='project/outputs', 
                         help='Directory to save results')
     parser.add_argument('--workers', type=int, default=5, 
-                        help='Number of parallel workers (default: 5)')
+                        help='Maximum number of papers processed concurrently (default: 5)')
     parser.add_argument('--provider', choices=['anthropic', 'openai'], default='anthropic',
                         help='API provider to use: anthropic (Claude) or openai (GPT-4) (default: anthropic)')
     parser.add_argument('--use-langchain', action='store_true',
@@ -483,9 +855,27 @@ if __name__ == '__main__':
                         help='Email address for new paper notifications')
     parser.add_argument('--cloud', choices=['local', 'aws', 'azure'], default='local',
                         help='Cloud storage provider (default: local)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore cached LLM results and re-process every paper')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Process every paper again instead of resuming an interrupted run')
+    parser.add_argument('--rpm', type=int, default=None,
+                        help='Maximum API requests per minute (default: 50 for anthropic, 500 for openai)')
+    parser.add_argument('--batch', action='store_true',
+                        help="Use the provider's Batch API: about 50%% cheaper, results within 24 hours "
+                             "(not combined with --use-langchain)")
+    parser.add_argument('--coalesce-threshold', type=float, default=None,
+                        help='Summarize near-duplicate papers (estimated similarity at or above this, '
+                             'e.g. 0.85) only once; requires datasketch')
+    parser.add_argument('--semantic-cache', action='store_true',
+                        help='With --use-langchain, reuse the extraction of a near-identical earlier paper '
+                             'instead of calling the API; requires requirements-semantic-cache.txt')
+    parser.add_argument('--yes', action='store_true',
+                        help='Process without asking to confirm the estimated cost (for scheduled runs)')
     
     args = parser.parse_args()
     
     main(args.papers_dir, args.output_dir, args.workers, args.provider, 
          args.use_langchain, args.check_pubmed, args.pubmed_query, 
-         args.email, args.cloud)
\ No newline at end of file
+         args.email, args.cloud, not args.no_cache, args.rpm, args.batch, args.coalesce_threshold,
+         args.yes, args.semantic_cache, not args.no_resume)
\ No newline at end of file
@@ -2,31 +2,172 @@
 PubMed integration for discovering and downloading new research papers.
 """
 
+import logging
 import os
-import json
+import threading
+import orjson
+import shelve
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from urllib3.util.retry import Retry
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from io import BytesIO
 from xml.etree import ElementTree as ET
 
+try:
+    from lxml import etree as lxml_etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from pybloom_live import ScalableBloomFilter
+    BLOOM_AVAILABLE = True
+except ImportError:
+    BLOOM_AVAILABLE = False
+
+class _StdoutHandler(logging.Handler):
+    """Writes records to whatever sys.stdout currently is, like print"""
+    
+    def emit(self, record):
+        try:
+            print(self.format(record), flush=True)
+        except Exception:
+            self.handleError(record)
+
+# Module logger. Records go straight to stdout (or LOG_FILE), in order with the
+# pipeline's own prints and into anything capturing stdout, such as the GUI log.
+log = logging.getLogger('pipeline.pubmed')
+if not log.handlers:
+    log.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    _log_target = logging.FileHandler(os.environ['LOG_FILE']) if os.environ.get('LOG_FILE') else _StdoutHandler()
+    _log_target.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(_log_target)
+    log.propagate = False
+
+class Paper(NamedTuple):
+    """
+    Compact, immutable record for one PubMed article.
+    
+    Stored as a tuple, so each record avoids a per-instance dict. Use
+    paper._asdict() where a plain dict is needed (e.g. JSON output).
+    """
+    pmid: str
+    title: str
+    authors: Tuple[str, ...]
+    abstract: str
+    year: str
+    journal: str
+    url: str
+
+# Failures while a streamed response body is being read. The session's Retry
+# owns everything before the response arrives (connection errors, timeouts,
+# throttling), so those are deliberately not listed here: retrying them again
+# would multiply its attempts.
+TRANSIENT_STREAM_ERRORS = (
+    requests.exceptions.ChunkedEncodingError,
+    ProtocolError,
+    ReadTimeoutError
+)
+
+def record_failed_pmids(pmids: List[str], error: Exception):
+    """Append PMIDs that could not be fetched to the local failed-fetch file for later replay"""
+    failed_file = os.environ.get('FAILED_PUBMED_FILE', 'project/outputs/failed_pubmed_fetches.jsonl')
+    try:
+        os.makedirs(os.path.dirname(failed_file) or '.', exist_ok=True)
+        with open(failed_file, 'ab') as f:
+            f.write(orjson.dumps({
+                'pmids': pmids,
+                'error': str(error),
+                'timestamp': datetime.now().isoformat()
+            }) + b'\n')
+    except Exception as e:
+        log.error(f"Error recording failed PMIDs: {e}")
+
+def iter_pubmed_articles(source):
+    """
+    Stream PubmedArticle elements out of an efetch XML response.
+    
+    Each article is cleared once the caller has processed it, so the
+    document tree is never held in memory as a whole. Uses lxml when
+    installed and falls back to the stdlib ElementTree parser.
+    
+    Args:
+        source: XML as bytes, or a binary file-like object (e.g. a
+                streaming HTTP response body) read incrementally
+    """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    
+    if LXML_AVAILABLE:
+        for _, article in lxml_etree.iterparse(source, events=('end',), tag='PubmedArticle'):
+            yield article
+            article.clear()
+            # Drop already-processed siblings still referenced by the parent
+            while article.getprevious() is not None:
+                del article.getparent()[0]
+    else:
+        for _, elem in ET.iterparse(source, events=('end',)):
+            if elem.tag == 'PubmedArticle':
+                yield elem
+                elem.clear()
+
 class PubMedClient:
     """Client for interacting with PubMed API"""
     
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
     
-    def __init__(self, email: str = None, api_key: str = None):
+    CACHE_TTL_SECONDS = 30 * 86400  # Cached article details are refetched after 30 days
+    
+    def __init__(self, email: str = None, api_key: str = None, cache_dir: str = None):
         """
         Initialize PubMed client.
         
         Args:
             email: Your email (required by NCBI)
             api_key: NCBI API key (optional, increases rate limit)
+            cache_dir: Directory for the on-disk article cache (default:
+                       PUBMED_CACHE_DIR or .pubmed_cache; empty string disables)
         """
         self.email = email or os.environ.get('PUBMED_EMAIL', 'user@example.com')
+        if cache_dir is None:
+            cache_dir = os.environ.get('PUBMED_CACHE_DIR', '.pubmed_cache')
+        self.cache_path = os.path.join(cache_dir, 'articles') if cache_dir else None
         self.api_key = api_key or os.environ.get('NCBI_API_KEY', '')
         self.rate_limit = 0.34 if not self.api_key else 0.1  # seconds between requests
+        self.max_concurrent_requests = 10 if self.api_key else 3  # NCBI requests/second allowance
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """
+        Create a keep-alive HTTP session that retries throttled/failed requests.
+        
+        Throttled responses (429/503) are retried after the server's
+        Retry-After delay when given, otherwise with exponential backoff.
+        """
+        session = requests.Session()
+        retries = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': f'research-paper-pipeline ({self.email})',
+            'Accept-Encoding': 'gzip'
+        })
+        return session
     
     def search(self, query: str, max_results: int = 100, 
                min_date: str = None, max_date: str = None) -> List[str]:
@@ -60,7 +201,7 @@ class PubMedClient:
             params['maxdate'] = max_date
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.BASE_URL}esearch.fcgi",
                 params=params,
                 timeout=30
@@ -68,19 +209,81 @@ class PubMedClient:
             response.raise_for_status()
             
             data = response.json()
-            pmids = data.get('esearchresult', {}).get('idlist', [])
+            # Interned so membership tests against the (also interned)
+            # processed set can short-circuit on identity
+            pmids = [sys.intern(pmid) for pmid in data.get('esearchresult', {}).get('idlist', [])]
             
-            print(f"Found {len(pmids)} papers matching query: {query}")
+            log.debug(f"Found {len(pmids)} papers matching query: {query}")
             return pmids
             
         except Exception as e:
-            print(f"Error searching PubMed: {e}")
+            log.error(f"Error searching PubMed: {e}")
+            return []
+    
+    def _wait_for_request_slot(self):
+        """Space request start times by rate_limit across all worker threads"""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + self.rate_limit
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _fetch_batch(self, batch: List[str]) -> List[Paper]:
+        """Fetch and parse one efetch batch of PMIDs (recorded for replay if it keeps failing)"""
+        params = {
+            'db': 'pubmed',
+            'id': ','.join(batch),
+            'retmode': 'xml',
+            'email': self.email
+        }
+        
+        if self.api_key:
+            params['api_key'] = self.api_key
+        
+        try:
+            return self._request_batch(params)
+        except Exception as e:
+            log.error(f"Error fetching details for batch: {e}")
+            record_failed_pmids(batch, e)
             return []
     
-    def fetch_details(self, pmids: List[str]) -> List[Dict]:
+    @retry(
+        retry=retry_if_exception_type(TRANSIENT_STREAM_ERRORS),
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=0.5, max=30),
+        reraise=True
+    )
+    def _request_batch(self, params: Dict) -> List[Paper]:
+        """Stream one efetch request, restarting it if the connection drops mid-body"""
+        self._wait_for_request_slot()
+        
+        papers = []
+        with self.session.get(
+            f"{self.BASE_URL}efetch.fcgi",
+            params=params,
+            timeout=60,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True  # Let urllib3 un-gzip the stream
+            
+            # Parse XML one article at a time as the body arrives
+            for article in iter_pubmed_articles(response.raw):
+                paper = self._parse_article(article)
+                if paper:
+                    papers.append(paper)
+        
+        return papers
+    
+    def fetch_details(self, pmids: List[str]) -> List[Paper]:
         """
         Fetch detailed information for a list of PMIDs.
         
+        Batches of 200 PMIDs are fetched concurrently (up to the NCBI request
+        rate: 10/s with an API key, 3/s without), with request starts spaced
+        by rate_limit.
+        
         Args:
             pmids: List of PubMed IDs
             
@@ -90,16 +293,53 @@ class PubMedClient:
         if not pmids:
             return []
         
-        papers = []
+        # Serve previously fetched articles from the on-disk cache
+        cached = self._load_cached(pmids)
+        to_fetch = [pmid for pmid in pmids if pmid not in cached]
         
         # Process in batches of 200
-        for i in range(0, len(pmids), 200):
-            batch = pmids[i:i+200]
+        batches = [to_fetch[i:i+200] for i in range(0, len(to_fetch), 200)]
+        
+        if len(batches) <= 1:
+            fetched = self._fetch_batch(batches[0]) if batches else []
+        else:
+            max_workers = min(len(batches), self.max_concurrent_requests)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                batch_results = list(executor.map(self._fetch_batch, batches))
+            fetched = [paper for papers in batch_results for paper in papers]
+        
+        self._store_cached(fetched)
+        
+        if not cached:
+            return fetched
+        
+        by_pmid = {**cached, **{paper.pmid: paper for paper in fetched}}
+        return [by_pmid[pmid] for pmid in pmids if pmid in by_pmid]
+    
+    def fetch_summaries(self, pmids: List[str]) -> List[Paper]:
+        """
+        Fetch lightweight metadata for a list of PMIDs via eSummary.
+        
+        eSummary JSON is much smaller than eFetch XML but has no abstract,
+        so papers come back with an empty 'abstract'. Use this when only
+        titles, authors, journal and year are needed.
+        
+        Args:
+            pmids: List of PubMed IDs
+            
+        Returns:
+            List of paper details (same fields as fetch_details)
+        """
+        papers = []
+        
+        # eSummary accepts larger batches than eFetch
+        for i in range(0, len(pmids), 500):
+            batch = pmids[i:i+500]
             
             params = {
                 'db': 'pubmed',
                 'id': ','.join(batch),
-                'retmode': 'xml',
+                'retmode': 'json',
                 'email': self.email
             }
             
@@ -107,46 +347,87 @@ class PubMedClient:
                 params['api_key'] = self.api_key
             
             try:
-                time.sleep(self.rate_limit)
+                self._wait_for_request_slot()
                 
-                response = requests.get(
-                    f"{self.BASE_URL}efetch.fcgi",
+                response = self.session.get(
+                    f"{self.BASE_URL}esummary.fcgi",
                     params=params,
                     timeout=60
                 )
                 response.raise_for_status()
                 
-                # Parse XML
-                root = ET.fromstring(response.content)
-                
-                for article in root.findall('.//PubmedArticle'):
-                    paper = self._parse_article(article)
-                    if paper:
-                        papers.append(paper)
+                result = orjson.loads(response.content).get('result', {})
+                for pmid in result.get('uids', []):
+                    summary = result.get(pmid, {})
+                    papers.append(Paper(
+                        pmid=sys.intern(pmid),
+                        title=summary.get('title', 'Unknown'),
+                        authors=tuple(author['name'] for author in summary.get('authors', [])),
+                        abstract='',
+                        year=summary.get('pubdate', '')[:4] or 'Unknown',
+                        journal=summary.get('fulljournalname') or 'Unknown',
+                        url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+                    ))
                 
             except Exception as e:
-                print(f"Error fetching details for batch: {e}")
+                log.error(f"Error fetching summaries for batch: {e}")
                 continue
         
         return papers
     
-    def _parse_article(self, article) -> Optional[Dict]:
+    def _load_cached(self, pmids: List[str]) -> Dict[str, Paper]:
+        """Return cached, unexpired article details for the given PMIDs"""
+        if not self.cache_path or not pmids:
+            return {}
+        
+        cutoff = time.time() - self.CACHE_TTL_SECONDS
+        cached = {}
+        try:
+            with shelve.open(self.cache_path, flag='r') as cache:
+                for pmid in pmids:
+                    entry = cache.get(pmid)
+                    # Entries from older versions (plain dicts) count as misses
+                    if entry and entry[0] >= cutoff and isinstance(entry[1], Paper):
+                        cached[pmid] = entry[1]
+        except Exception:
+            # Missing or unreadable cache: fetch everything
+            return {}
+        return cached
+    
+    def _store_cached(self, papers: List[Paper]):
+        """Save freshly fetched article details to the on-disk cache"""
+        if not self.cache_path or not papers:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            now = time.time()
+            with shelve.open(self.cache_path) as cache:
+                for paper in papers:
+                    cache[paper.pmid] = (now, paper)
+        except Exception as e:
+            log.warning(f"Failed to update PubMed cache: {e}")
+    
+    def _parse_article(self, article) -> Optional[Paper]:
         """Parse article XML to extract details"""
         try:
-            medline = article.find('.//MedlineCitation')
-            pmid = medline.find('.//PMID').text
+            # The PubMed schema is fixed, so address elements by their direct
+            # path instead of scanning the whole subtree for every field
+            medline = article.find('MedlineCitation')
+            pmid = sys.intern(medline.find('PMID').text)
             
-            article_data = medline.find('.//Article')
+            article_data = medline.find('Article')
             
             # Title
-            title_elem = article_data.find('.//ArticleTitle')
+            title_elem = article_data.find('ArticleTitle')
             title = ''.join(title_elem.itertext()) if title_elem is not None else 'Unknown'
             
             # Authors
             authors = []
-            for author in article_data.findall('.//Author'):
-                last_name = author.find('.//LastName')
-                first_name = author.find('.//ForeName')
+            author_list = article_data.find('AuthorList')
+            for author in (author_list.findall('Author') if author_list is not None else []):
+                last_name = author.find('LastName')
+                first_name = author.find('ForeName')
                 if last_name is not None:
                     name = last_name.text
                     if first_name is not None:
@@ -154,68 +435,163 @@ class PubMedClient:
                     authors.append(name)
             
             # Abstract
-            abstract_elem = article_data.find('.//Abstract')
+            abstract_elem = article_data.find('Abstract')
             abstract = ''
             if abstract_elem is not None:
                 abstract = ' '.join(abstract_elem.itertext())
             
-            # Publication date
-            pub_date = article_data.find('.//PubDate')
-            year = pub_date.find('.//Year').text if pub_date.find('.//Year') is not None else 'Unknown'
+            # Journal and publication date
+            journal_node = article_data.find('Journal')
+            year_elem = journal_node.find('JournalIssue/PubDate/Year') if journal_node is not None else None
+            year = year_elem.text if year_elem is not None else 'Unknown'
             
-            # Journal
-            journal_elem = article_data.find('.//Journal/Title')
+            journal_elem = journal_node.find('Title') if journal_node is not None else None
             journal = journal_elem.text if journal_elem is not None else 'Unknown'
             
-            return {
-                'pmid': pmid,
-                'title': title,
-                'authors': authors,
-                'abstract': abstract,
-                'year': year,
-                'journal': journal,
-                'url': f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-            }
+            return Paper(
+                pmid=pmid,
+                title=title,
+                authors=tuple(authors),
+                abstract=abstract,
+                year=year,
+                journal=journal,
+                url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+            )
             
         except Exception as e:
-            print(f"Error parsing article: {e}")
+            log.warning(f"Error parsing article: {e}")
             return None
 
+TRACKING_FILENAME = 'processed_papers.txt'  # One PMID per line
+LEGACY_TRACKING_FILENAME = 'processed_papers.json'  # Older {"processed_pmids": [...]} file
+
+def _write_pmids(tracking_file: str, pmids: set):
+    with open(tracking_file, 'w', encoding='utf-8') as f:
+        f.writelines(f"{pmid}\n" for pmid in sorted(pmids))
+    _write_tracking_metadata(tracking_file)
+
+def _read_pmids(path: str) -> Tuple[set, bool]:
+    """
+    Read the PMIDs in a tracking file of either format.
+    
+    Returns:
+        (PMIDs, whether the file was in the legacy JSON format)
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    if content.lstrip().startswith(b'{'):
+        return set(map(sys.intern, orjson.loads(content).get('processed_pmids', []))), True
+    return set(map(sys.intern, content.decode('utf-8').split())), False
+
 def load_processed_papers(tracking_file: str) -> set:
-    """Load set of already processed PMIDs"""
-    if not os.path.exists(tracking_file):
-        return set()
+    """
+    Load set of already processed PMIDs.
+    
+    The tracking file holds one PMID per line. If it doesn't exist yet, a
+    legacy processed_papers.json in the same directory is migrated into it
+    (and left in place); a tracking file in the legacy JSON format is
+    converted in place.
+    """
+    legacy_file = os.path.join(os.path.dirname(tracking_file), LEGACY_TRACKING_FILENAME)
     
     try:
-        with open(tracking_file, 'r') as f:
-            data = json.load(f)
-            return set(data.get('processed_pmids', []))
+        if not os.path.exists(tracking_file):
+            if os.path.abspath(legacy_file) == os.path.abspath(tracking_file) or not os.path.exists(legacy_file):
+                return set()
+            pmids, _ = _read_pmids(legacy_file)
+            _write_pmids(tracking_file, pmids)
+            log.info(f"Migrated {len(pmids)} tracked PMIDs from {legacy_file} to {tracking_file}")
+            return pmids
+        
+        pmids, is_legacy = _read_pmids(tracking_file)
+        if is_legacy:
+            _write_pmids(tracking_file, pmids)
+        return pmids
     except Exception as e:
-        print(f"Error loading tracking file: {e}")
+        log.error(f"Error loading tracking file: {e}")
         return set()
 
-def save_processed_papers(tracking_file: str, pmids: set):
-    """Save processed PMIDs to tracking file"""
+def load_tracking_bloom(tracking_file: str):
+    """
+    Load the Bloom filter of processed PMIDs stored next to the tracking file.
+    
+    The filter lets find_new_papers rule out never-seen PMIDs without reading
+    the full tracking file. It is rebuilt from the tracking file when missing
+    or older than it. Returns None if pybloom_live is not installed.
+    """
+    if not BLOOM_AVAILABLE:
+        return None
+    
+    bloom_file = f"{tracking_file}.bloom"
+    try:
+        if os.path.getmtime(bloom_file) >= os.path.getmtime(tracking_file):
+            with open(bloom_file, 'rb') as f:
+                return ScalableBloomFilter.fromfile(f)
+    except OSError:
+        pass
+    
+    bloom = ScalableBloomFilter(error_rate=1e-4, mode=ScalableBloomFilter.LARGE_SET_GROWTH)
+    for pmid in load_processed_papers(tracking_file):
+        bloom.add(pmid)
+    _save_tracking_bloom(tracking_file, bloom)
+    return bloom
+
+def _save_tracking_bloom(tracking_file: str, bloom):
+    """Write the processed-PMID Bloom filter sidecar file"""
+    try:
+        os.makedirs(os.path.dirname(tracking_file) or '.', exist_ok=True)
+        with open(f"{tracking_file}.bloom", 'wb') as f:
+            bloom.tofile(f)
+    except Exception as e:
+        log.warning(f"Failed to save tracking Bloom filter: {e}")
+
+def _write_tracking_metadata(tracking_file: str):
+    """Record when the tracking file was last updated in a sidecar JSON file"""
+    with open(f"{tracking_file}.meta.json", 'wb') as f:
+        f.write(orjson.dumps({'last_updated': datetime.now().isoformat()}))
+
+def save_processed_papers(tracking_file: str, pmids: set, bloom=None):
+    """
+    Append newly processed PMIDs to the tracking file.
+    
+    Only the given PMIDs are written, so callers should pass the PMIDs that
+    are not yet tracked rather than the full processed set.
+    
+    Args:
+        tracking_file: File tracking processed papers
+        pmids: PMIDs to add
+        bloom: Bloom filter from load_tracking_bloom to update alongside
+               the tracking file (optional)
+    """
     os.makedirs(os.path.dirname(tracking_file) or '.', exist_ok=True)
     
-    data = {
-        'processed_pmids': list(pmids),
-        'last_updated': datetime.now().isoformat()
-    }
+    if pmids:
+        with open(tracking_file, 'a', encoding='utf-8') as f:
+            f.writelines(f"{pmid}\n" for pmid in sorted(pmids))
+    
+    _write_tracking_metadata(tracking_file)
     
-    with open(tracking_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Written after the tracking file so the filter stays at least as new
+    if bloom is not None:
+        for pmid in pmids:
+            bloom.add(pmid)
+        _save_tracking_bloom(tracking_file, bloom)
 
-def find_new_papers(query: str, tracking_file: str = 'project/outputs/processed_papers.json',
-                    max_results: int = 100, days_back: int = 30) -> List[Dict]:
+def find_new_papers(query: str, tracking_file: str = f'project/outputs/{TRACKING_FILENAME}',
+                    max_results: int = 100, days_back: int = 30,
+                    include_abstracts: bool = True) -> List[Paper]:
     """
     Find new papers from PubMed that haven't been processed yet.
     
+    The PMIDs of the returned papers are recorded in tracking_file.
+    
     Args:
         query: PubMed search query
         tracking_file: File tracking processed papers
         max_results: Maximum results to fetch
         days_back: How many days back to search
+        include_abstracts: Fetch full records with abstracts (eFetch); if
+                           False, fetch compact metadata only (eSummary)
         
     Returns:
         List of new paper details
@@ -235,20 +611,42 @@ def find_new_papers(query: str, tracking_file: str = 'project/outputs/processed_
         max_date=end_date.strftime('%Y/%m/%d')
     )
     
-    # Load already processed papers
-    processed = load_processed_papers(tracking_file)
+    # Drop duplicate PMIDs (order preserved)
+    unique_pmids = dict.fromkeys(pmids)
+    
+    # The Bloom filter has no false negatives: PMIDs it rejects were never
+    # processed, so the full history is only loaded to confirm possible hits
+    bloom = load_tracking_bloom(tracking_file) if os.path.exists(tracking_file) else None
+    if bloom is not None:
+        maybe_processed = {pmid for pmid in unique_pmids if pmid in bloom}
+        processed = maybe_processed & load_processed_papers(tracking_file) if maybe_processed else set()
+    else:
+        processed = load_processed_papers(tracking_file)
     
-    # Filter for new papers only
-    new_pmids = [pmid for pmid in pmids if pmid not in processed]
+    # Filter for new papers only. The difference is computed with C-level
+    # set operations; the ordered walk is only needed when some PMIDs were
+    # already processed.
+    new_set = unique_pmids.keys() - processed
+    if len(new_set) == len(unique_pmids):
+        new_pmids = list(unique_pmids)
+    else:
+        new_pmids = [pmid for pmid in unique_pmids if pmid in new_set]
     
     if not new_pmids:
-        print("No new papers found.")
+        log.info("No new papers found.")
         return []
     
-    print(f"Found {len(new_pmids)} new papers (out of {len(pmids)} total)")
+    log.info(f"Found {len(new_pmids)} new papers (out of {len(pmids)} total)")
     
     # Fetch details
-    new_papers = client.fetch_details(new_pmids)
+    if include_abstracts:
+        new_papers = client.fetch_details(new_pmids)
+    else:
+        new_papers = client.fetch_summaries(new_pmids)
+    
+    # Remember what was found so later runs don't refetch it
+    if new_papers:
+        save_processed_papers(tracking_file, {paper.pmid for paper in new_papers}, bloom)
     
     return new_papers
 
@@ -269,8 +667,8 @@ def download_paper_pdf(pmid: str, output_dir: str) -> Optional[str]:
     # 2. Use institutional access if available
     # 3. Respect copyright
     
-    print(f"Note: Automatic PDF download not implemented for PMID {pmid}")
-    print(f"Please download manually from: https://pubmed.ncbi.nlm.nih.gov/{pmid}/")
+    log.info(f"Note: Automatic PDF download not implemented for PMID {pmid}")
+    log.info(f"Please download manually from: https://pubmed.ncbi.nlm.nih.gov/{pmid}/")
     return None
 
 if __name__ == '__main__':
@@ -280,6 +678,6 @@ if __name__ == '__main__':
     
     print(f"\nNew papers found: {len(new_papers)}")
     for paper in new_papers[:5]:
-        print(f"\n{paper['title']}")
-        print(f"Authors: {', '.join(paper['authors'][:3])}")
-        print(f"PMID: {paper['pmid']}")
\ No newline at end of file
+        print(f"\n{paper.title}")
+        print(f"Authors: {', '.join(paper.authors[:3])}")
+        print(f"PMID: {paper.pmid}")
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Exact-match cache of LLM extraction results.
+
+Results are stored as JSON files keyed by a SHA-256 of everything that
+determines the response (model, sampling settings and the full prompt),
+so reprocessing an identical paper costs no API call, and editing a
+prompt invalidates its old entries automatically. The cache lives in
+<output_dir>/.cache/responses, next to the extracted-text cache.
+"""
+
+import hashlib
+import orjson
+import os
+import threading
+from pathlib import Path
+
+RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR')  # Overrides the per-output-directory location
+
+def response_cache_dir(output_dir):
+    """Response cache directory for a pipeline output directory"""
+    if RESPONSE_CACHE_DIR:
+        return Path(RESPONSE_CACHE_DIR)
+    return Path(output_dir) / '.cache' / 'responses'
+
+def response_cache_key(*parts):
+    """
+    Build a cache key from the request inputs.
+
+    Args:
+        *parts: Model name, temperature, prompt texts, etc.
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _cache_path(cache_dir, key):
+    return Path(cache_dir) / key[:2] / f'{key}.json'
+
+def load_cached_response(key, filename, cache_dir):
+    """
+    Look up a cached result.
+
+    Args:
+        key: Key from response_cache_key
+        filename: Name of the paper file being processed
+        cache_dir: Directory from response_cache_dir (None disables the cache)
+
+    Returns:
+        The cached result dict (marked cache_hit), or None on a miss
+    """
+    if cache_dir is None:
+        return None
+
+    try:
+        with open(_cache_path(cache_dir, key), 'rb') as f:
+            result = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+    result['filename'] = filename
+    result['cache_hit'] = True
+    return result
+
+def save_cached_response(key, result, cache_dir):
+    """Store a successful result under key in cache_dir (None disables the cache)"""
+    if cache_dir is None or result.get('status') != 'success':
+        return
+
+    path = _cache_path(cache_dir, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(result))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"  ✗ Could not cache response: {e}")
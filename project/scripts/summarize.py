@@ -3,35 +3,87 @@ Summarize and extract information from research papers using Anthropic's Claude
 """
 
 import os
-from anthropic import Anthropic
-from openai import OpenAI
+from functools import lru_cache
+from anthropic import Anthropic, AsyncAnthropic
+from anthropic import APIConnectionError as AnthropicConnectionError, APIStatusError as AnthropicStatusError
+from openai import OpenAI, AsyncOpenAI
+from openai import APIConnectionError as OpenAIConnectionError, APIStatusError as OpenAIStatusError
 import time
 import json
-from tenacity import retry, stop_after_attempt, wait_exponential
-try:
-    import boto3
-    CLOUDWATCH_AVAILABLE = True
-except ImportError:
-    CLOUDWATCH_AVAILABLE = False
+import orjson
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from response_cache import response_cache_key, load_cached_response, save_cached_response
+from metrics import send_cloudwatch_metric
 
-def send_metric(metric_name, value, provider):
-    """Send metrics to CloudWatch if available"""
-    if not CLOUDWATCH_AVAILABLE:
-        return
+BATCH_POLL_SECONDS = 60  # Interval between Batch API status checks
+
+# Output token caps. Complete summaries stay well under SUMMARY_MAX_TOKENS;
+# the rare reply cut off there is re-requested once with the larger cap.
+SUMMARY_MAX_TOKENS = 800
+SUMMARY_FALLBACK_MAX_TOKENS = 2000
+
+def is_transient_api_error(error):
+    """
+    Whether an API error is worth retrying.
     
-    try:
-        cloudwatch = boto3.client('cloudwatch')
-        cloudwatch.put_metric_data(
-            Namespace='ResearchPaperProcessing',
-            MetricData=[{
-                'MetricName': metric_name,
-                'Value': value,
-                'Unit': 'Count',
-                'Dimensions': [{'Name': 'Provider', 'Value': provider}]
-            }]
-        )
-    except Exception as e:
-        print(f"Warning: Failed to send CloudWatch metric: {e}")
+    Dropped connections, timeouts, rate limits and server errors are
+    transient; bad requests, authentication failures and invalid output
+    fail the same way on every attempt.
+    """
+    if isinstance(error, (AnthropicConnectionError, OpenAIConnectionError)):
+        return True
+    if isinstance(error, (AnthropicStatusError, OpenAIStatusError)):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+# Retry policy for provider API calls: transient errors only
+retry_transient = retry(
+    retry=retry_if_exception(is_transient_api_error),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=10),
+    reraise=True
+)
+
+@retry_transient
+def _call_api(method, *args, **kwargs):
+    """Call a client API method, retrying transient errors"""
+    return method(*args, **kwargs)
+
+@retry_transient
+async def _call_api_async(create, body, rate_limiter=None):
+    """Await a client's create method, retrying transient errors (each attempt waits on rate_limiter)"""
+    if rate_limiter is not None:
+        await rate_limiter.acquire()
+    return await create(**body)
+
+class TruncatedResponseError(ValueError):
+    """Raised when a reply is cut off at max_tokens"""
+
+def _with_fallback_tokens(body):
+    """Copy of a request body with the larger SUMMARY_FALLBACK_MAX_TOKENS cap"""
+    return {**body, 'max_tokens': SUMMARY_FALLBACK_MAX_TOKENS}
+
+@lru_cache(maxsize=4)
+def get_client(provider, api_key):
+    """
+    Shared sync API client per provider and key.
+    
+    Reusing the client keeps its HTTP connection pool (and TLS sessions)
+    alive across papers. SDK-level retries are disabled because calls are
+    already retried by retry_transient.
+    """
+    if provider == 'anthropic':
+        return Anthropic(api_key=api_key, max_retries=0)
+    elif provider == 'openai':
+        return OpenAI(api_key=api_key, max_retries=0)
+    else:
+        raise ValueError(f"Unknown provider: {provider}. Use 'anthropic' or 'openai'.")
+
+def send_metric(metric_name, value, provider):
+    """Queue a per-provider metric for CloudWatch (sent in the background, so API calls never wait on it)"""
+    send_cloudwatch_metric(metric_name, value, dimensions=[{'Name': 'Provider', 'Value': provider}])
+
+PAGE_MARKER = '--- Page'
 
 def chunk_text(text, max_chars=100000):
     """
@@ -48,46 +100,38 @@ def chunk_text(text, max_chars=100000):
     if len(text) <= max_chars:
         return [text]
     
-    # Try to split on page boundaries
-    pages = text.split('--- Page')
+    # Try to split on page boundaries. Pages are located with str.find and
+    # each chunk is sliced out of text once; a chunk after the first starts
+    # just past the page marker it was split on.
     chunks = []
-    current_chunk = ""
+    marker_len = len(PAGE_MARKER)
+    start = end = size = 0
+    page_start = 0
     
-    for page in pages:
-        if len(current_chunk) + len(page) > max_chars and current_chunk:
-            chunks.append(current_chunk)
-            current_chunk = page
+    while page_start <= len(text):
+        page_end = text.find(PAGE_MARKER, page_start)
+        if page_end == -1:
+            page_end = len(text)
+        page_len = page_end - page_start
+        
+        if size + page_len > max_chars and size:
+            chunks.append(text[start:end])
+            start, size = page_start, page_len
+        elif size:
+            size += marker_len + page_len
         else:
-            current_chunk += ('--- Page' if current_chunk else '') + page
+            start, size = page_start, page_len
+        end = page_end
+        page_start = page_end + marker_len
     
-    if current_chunk:
-        chunks.append(current_chunk)
+    if size:
+        chunks.append(text[start:end])
     
     return chunks
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    reraise=True
-)
-def summarize_paper_claude(text, filename, api_key):
-    """
-    Use Claude to summarize a research paper and extract key information.
-    
-    Args:
-        text: The paper text
-        filename: Name of the paper file
-        api_key: Anthropic API key
-        
-    Returns:
-        dict with extracted information
-    """
-    client = Anthropic(api_key=api_key)
-    
-    # Chunk text if necessary
-    chunks = chunk_text(text)
-    
-    prompt = f"""You are analyzing a research paper. Please extract and provide the following information in a structured format:
+# Static instructions shared by every paper. Sent ahead of (and separately
+# from) the paper text so providers can cache this prefix across requests.
+SUMMARY_INSTRUCTIONS = """You are analyzing a research paper. Please extract and provide the following information in a structured format:
 
 1. Title
 2. Authors (comma-separated list)
@@ -100,82 +144,142 @@ def summarize_paper_claude(text, filename, api_key):
 9. Limitations mentioned
 10. Future work suggested
 
-Please respond ONLY with a JSON object in this exact format:
-{{
-  "title": "paper title",
-  "authors": "author1, author2, author3",
-  "year": "YYYY",
-  "abstract": "brief summary",
-  "research_question": "main question",
-  "methodology": "methods used",
-  "key_findings": ["finding 1", "finding 2", "finding 3"],
-  "conclusions": "main conclusions",
-  "limitations": "limitations mentioned",
-  "future_work": "suggested future research"
-}}
+Record the information with the provided paper summary schema. If any field cannot be determined from the text, use "Not found" as the value."""
+
+OPENAI_SYSTEM_PROMPT = "You are a research paper analysis assistant. Always respond with valid JSON only."
+OPENAI_SYSTEM_MESSAGE = f"{OPENAI_SYSTEM_PROMPT}\n\n{SUMMARY_INSTRUCTIONS}"
+
+def build_summary_prompt(chunks):
+    """
+    Build the user message for the first chunk of a paper (the
+    instructions are sent separately, see SUMMARY_INSTRUCTIONS).
+    
+    Args:
+        chunks: Paper text chunks (from chunk_text)
+        
+    Returns:
+        Prompt text
+    """
+    part = f" (part 1 of {len(chunks)})" if len(chunks) > 1 else ''
+    return f"Here is the research paper{part}:\n\n{chunks[0]}"
 
-If any field cannot be determined from the text, use "Not found" as the value.
+def _string_field(description):
+    return {'type': 'string', 'description': description}
 
-Here is the research paper{' (part 1 of ' + str(len(chunks)) + ')' if len(chunks) > 1 else ''}:
+# Output schema for the direct-API extraction. Anthropic receives it as a
+# forced tool and OpenAI as a strict json_schema response format, so every
+# reply is a parsed object with exactly these fields.
+SUMMARY_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'title': _string_field("Paper title"),
+        'authors': _string_field("Comma-separated list of authors"),
+        'year': _string_field("Publication year (YYYY format)"),
+        'abstract': _string_field("Brief 2-3 sentence summary of the paper"),
+        'research_question': _string_field("Main research question or objective"),
+        'methodology': _string_field("Brief description of methodology used"),
+        'key_findings': {'type': 'array', 'items': {'type': 'string'}, 'description': "List of 3-5 key findings"},
+        'conclusions': _string_field("Main conclusions of the study"),
+        'limitations': _string_field("Study limitations mentioned by authors"),
+        'future_work': _string_field("Suggested future research directions")
+    },
+    'required': [
+        'title', 'authors', 'year', 'abstract', 'research_question', 'methodology',
+        'key_findings', 'conclusions', 'limitations', 'future_work'
+    ],
+    'additionalProperties': False
+}
+SUMMARY_SCHEMA_JSON = json.dumps(SUMMARY_SCHEMA, sort_keys=True)  # Part of the response cache keys
+SUMMARY_TOOL_NAME = 'record_paper_summary'
 
-{chunks[0]}"""
+def response_payload(response, provider):
+    """
+    Get the structured summary from a messages.create / chat.completions.create response.
+    
+    Raises:
+        ValueError: If the reply holds no complete summary (refused or cut off at max_tokens)
+    """
+    if provider == 'anthropic':
+        if response.stop_reason == 'max_tokens':
+            raise TruncatedResponseError("Reply cut off at max_tokens")
+        for block in response.content:
+            if block.type == 'tool_use':
+                return block.input
+        raise ValueError(f"Reply contained no summary (stop_reason: {response.stop_reason})")
+    
+    choice = response.choices[0]
+    if getattr(choice.message, 'refusal', None):
+        raise ValueError(f"Model refused: {choice.message.refusal}")
+    if choice.finish_reason == 'length':
+        raise TruncatedResponseError("Reply cut off at max_tokens")
+    return orjson.loads(choice.message.content)
+
+def _create_summary(create, body, provider):
+    """
+    Request a summary, re-requesting once with SUMMARY_FALLBACK_MAX_TOKENS
+    if the reply is cut off at SUMMARY_MAX_TOKENS.
+    
+    Returns:
+        The structured summary (from response_payload)
+    """
+    try:
+        return response_payload(_call_api(create, **body), provider)
+    except TruncatedResponseError:
+        send_metric('MaxTokensFallback', 1, provider)
+        return response_payload(_call_api(create, **_with_fallback_tokens(body)), provider)
 
+async def _create_summary_async(create, body, provider, rate_limiter=None):
+    """Async version of _create_summary"""
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        return response_payload(await _call_api_async(create, body, rate_limiter), provider)
+    except TruncatedResponseError:
+        send_metric('MaxTokensFallback', 1, provider)
+        return response_payload(await _call_api_async(create, _with_fallback_tokens(body), rate_limiter), provider)
+
+def summary_result(summary, filename, chunks, provider):
+    """Result dict for a structured summary (from response_payload)"""
+    result = dict(summary)
+    result['filename'] = filename
+    result['status'] = 'success'
+    result['chunks_processed'] = len(chunks)
+    result['api_provider'] = provider
+    
+    return result
+
+def api_error_result(error, filename, provider):
+    """Result dict for a failed API call"""
+    send_metric('APICallError', 1, provider)
+    print(f"  ✗ API error: {error}")
+    return {
+        'filename': filename,
+        'status': 'api_error',
+        'error': str(error),
+        'api_provider': provider
+    }
+
+def summarize_paper_claude(text, filename, api_key):
+    """
+    Use Claude to summarize a research paper and extract key information.
+    
+    Args:
+        text: The paper text
+        filename: Name of the paper file
+        api_key: Anthropic API key
         
+    Returns:
+        dict with extracted information
+    """
+    client = get_client('anthropic', api_key)
+    chunks, body, _ = _prepare_request(text, 'anthropic')
+    
+    try:
+        summary = _create_summary(client.messages.create, body, 'anthropic')
         send_metric('APICallSuccess', 1, 'anthropic')
+        return summary_result(summary, filename, chunks, 'anthropic')
         
-        response_text = message.content[0].text
-        
-        # Clean up the response (remove markdown code blocks if present)
-        response_text = response_text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        # Parse JSON response
-        result = json.loads(response_text)
-        result['filename'] = filename
-        result['status'] = 'success'
-        result['chunks_processed'] = len(chunks)
-        result['api_provider'] = 'anthropic'
-        
-        return result
-        
-    except json.JSONDecodeError as e:
-        send_metric('JSONParseError', 1, 'anthropic')
-        print(f"  ✗ JSON parsing error: {e}")
-        print(f"  Response: {response_text[:200]}...")
-        return {
-            'filename': filename,
-            'status': 'json_error',
-            'error': str(e),
-            'raw_response': response_text[:500],
-            'api_provider': 'anthropic'
-        }
     except Exception as e:
-        send_metric('APICallError', 1, 'anthropic')
-        print(f"  ✗ API error: {e}")
-        return {
-            'filename': filename,
-            'status': 'api_error',
-            'error': str(e),
-            'api_provider': 'anthropic'
-        }
+        return api_error_result(e, filename, 'anthropic')
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    reraise=True
-)
 def summarize_paper_openai(text, filename, api_key):
     """
     Use OpenAI to summarize a research paper and extract key information.
@@ -188,98 +292,288 @@ def summarize_paper_openai(text, filename, api_key):
     Returns:
         dict with extracted information
     """
-    client = OpenAI(api_key=api_key)
-    
-    # Chunk text if necessary (OpenAI has smaller context window)
-    chunks = chunk_text(text, max_chars=80000)
+    client = get_client('openai', api_key)
+    chunks, body, _ = _prepare_request(text, 'openai')
     
-    prompt = f"""You are analyzing a research paper. Please extract and provide the following information in a structured format:
-
-1. Title
-2. Authors (comma-separated list)
-3. Year of publication
-4. Abstract/Summary (2-3 sentences)
-5. Main research question or objective
-6. Methodology (brief description)
-7. Key findings (3-5 bullet points)
-8. Main conclusions
-9. Limitations mentioned
-10. Future work suggested
-
-Please respond ONLY with a JSON object in this exact format:
-{{
-  "title": "paper title",
-  "authors": "author1, author2, author3",
-  "year": "YYYY",
-  "abstract": "brief summary",
-  "research_question": "main question",
-  "methodology": "methods used",
-  "key_findings": ["finding 1", "finding 2", "finding 3"],
-  "conclusions": "main conclusions",
-  "limitations": "limitations mentioned",
-  "future_work": "suggested future research"
-}}
-
-If any field cannot be determined from the text, use "Not found" as the value.
-
-Here is the research paper{' (part 1 of ' + str(len(chunks)) + ')' if len(chunks) > 1 else ''}:
+    try:
+        summary = _create_summary(client.chat.completions.create, body, 'openai')
+        send_metric('APICallSuccess', 1, 'openai')
+        return summary_result(summary, filename, chunks, 'openai')
+        
+    except Exception as e:
+        return api_error_result(e, filename, 'openai')
 
-{chunks[0]}"""
+def create_async_client(provider, api_key):
+    """
+    Create an async API client for summarize_paper_async.
+    
+    Share one client across concurrent calls so they reuse its connection
+    pool, and close it (await client.close()) when done. SDK-level retries
+    are disabled because calls are already retried by retry_transient.
+    """
+    if provider.lower() == 'anthropic':
+        return AsyncAnthropic(api_key=api_key, max_retries=0)
+    elif provider.lower() == 'openai':
+        return AsyncOpenAI(api_key=api_key, max_retries=0)
+    else:
+        raise ValueError(f"Unknown provider: {provider}. Use 'anthropic' or 'openai'.")
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a research paper analysis assistant. Always respond with valid JSON only."},
+def _prepare_request(text, provider):
+    """
+    Build the API request for a paper.
+    
+    Returns:
+        (chunks, request body for messages.create / chat.completions.create,
+         response cache key)
+    """
+    if provider == 'anthropic':
+        chunks = chunk_text(text)
+        prompt = build_summary_prompt(chunks)
+        body = {
+            'model': "claude-sonnet-4-20250514",
+            'max_tokens': SUMMARY_MAX_TOKENS,
+            'system': [{
+                'type': 'text',
+                'text': SUMMARY_INSTRUCTIONS,
+                'cache_control': {'type': 'ephemeral'}
+            }],
+            'messages': [{"role": "user", "content": prompt}],
+            'tools': [{
+                'name': SUMMARY_TOOL_NAME,
+                'description': "Record the information extracted from the research paper",
+                'input_schema': SUMMARY_SCHEMA
+            }],
+            'tool_choice': {'type': 'tool', 'name': SUMMARY_TOOL_NAME}
+        }
+        cache_key = response_cache_key(provider, body['model'], SUMMARY_INSTRUCTIONS, SUMMARY_SCHEMA_JSON, prompt)
+    else:
+        # OpenAI has a smaller context window
+        chunks = chunk_text(text, max_chars=80000)
+        prompt = build_summary_prompt(chunks)
+        body = {
+            'model': "gpt-4o",
+            'messages': [
+                {"role": "system", "content": OPENAI_SYSTEM_MESSAGE},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.3,
-            max_tokens=2000
+            'temperature': 0.3,
+            'max_tokens': SUMMARY_MAX_TOKENS,
+            'response_format': {
+                'type': 'json_schema',
+                'json_schema': {'name': 'paper_summary', 'schema': SUMMARY_SCHEMA, 'strict': True}
+            }
+        }
+        cache_key = response_cache_key(
+            provider, body['model'], body['temperature'], OPENAI_SYSTEM_MESSAGE, SUMMARY_SCHEMA_JSON, prompt
         )
+    
+    return chunks, body, cache_key
+
+async def summarize_paper_async(text, filename, client, provider='anthropic', use_cache=True, rate_limiter=None,
+                                cache_dir=None):
+    """
+    Summarize a paper without blocking the event loop.
+    
+    Same prompt and result format as summarize_paper, for running many
+    papers concurrently on one event loop. Successful results are cached
+    by model and prompt, so identical papers are only sent once.
+    
+    Args:
+        text: The paper text
+        filename: Name of the paper file
+        client: Client from create_async_client
+        provider: 'anthropic' or 'openai'
+        use_cache: Return a cached result if one exists (False forces a new API call)
+        rate_limiter: Optional aiolimiter.AsyncLimiter acquired before the
+            API call; cache hits don't consume it
+        cache_dir: Response cache directory (from response_cache_dir; None for no cache)
         
-        send_metric('APICallSuccess', 1, 'openai')
-        
-        response_text = response.choices[0].message.content
-        
-        # Clean up the response (remove markdown code blocks if present)
-        response_text = response_text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
+    Returns:
+        dict with extracted information
+    """
+    provider = provider.lower()
+    chunks, body, cache_key = _prepare_request(text, provider)
+    
+    if use_cache:
+        cached = load_cached_response(cache_key, filename, cache_dir)
+        if cached is not None:
+            return cached
+    
+    try:
+        create = client.messages.create if provider == 'anthropic' else client.chat.completions.create
+        summary = await _create_summary_async(create, body, provider, rate_limiter)
+        send_metric('APICallSuccess', 1, provider)
+        result = summary_result(summary, filename, chunks, provider)
+        save_cached_response(cache_key, result, cache_dir)
+        return result
         
-        # Parse JSON response
-        result = json.loads(response_text)
-        result['filename'] = filename
-        result['status'] = 'success'
-        result['chunks_processed'] = len(chunks)
-        result['api_provider'] = 'openai'
+    except Exception as e:
+        return api_error_result(e, filename, provider)
+
+def _run_anthropic_batch(client, requests, poll_interval):
+    """
+    Run requests through the Message Batches API.
+    
+    Returns:
+        dict of custom_id -> summary (from response_payload) or Exception
+    """
+    batch = _call_api(client.messages.batches.create, requests=[
+        {'custom_id': custom_id, 'params': body} for custom_id, body in requests
+    ])
+    print(f"  ✓ Submitted batch {batch.id} ({len(requests)} papers)")
+    
+    while batch.processing_status != 'ended':
+        time.sleep(poll_interval)
+        batch = _call_api(client.messages.batches.retrieve, batch.id)
+        counts = batch.request_counts
+        print(f"  Batch {batch.id}: {batch.processing_status} "
+              f"({counts.succeeded} succeeded, {counts.errored} errored, {counts.processing} processing)")
+    
+    outputs = {}
+    for entry in _call_api(client.messages.batches.results, batch.id):
+        if entry.result.type == 'succeeded':
+            try:
+                outputs[entry.custom_id] = response_payload(entry.result.message, 'anthropic')
+            except ValueError as e:
+                outputs[entry.custom_id] = e
+        else:
+            error = getattr(entry.result, 'error', None)
+            outputs[entry.custom_id] = RuntimeError(f"Batch request {entry.result.type}: {error}")
+    return outputs
+
+def _run_openai_batch(client, requests, poll_interval):
+    """
+    Run requests through the OpenAI Batch API.
+    
+    Returns:
+        dict of custom_id -> summary or Exception
+    """
+    lines = [
+        orjson.dumps({'custom_id': custom_id, 'method': 'POST', 'url': '/v1/chat/completions', 'body': body})
+        for custom_id, body in requests
+    ]
+    input_file = _call_api(client.files.create, file=('batch.jsonl', b'\n'.join(lines)), purpose='batch')
+    batch = _call_api(
+        client.batches.create,
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h'
+    )
+    print(f"  ✓ Submitted batch {batch.id} ({len(requests)} papers)")
+    
+    while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+        time.sleep(poll_interval)
+        batch = _call_api(client.batches.retrieve, batch.id)
+        counts = batch.request_counts
+        print(f"  Batch {batch.id}: {batch.status} "
+              f"({counts.completed if counts else 0}/{counts.total if counts else len(requests)} completed)")
+    
+    outputs = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in _call_api(client.files.content, file_id).text.splitlines():
+            if not line.strip():
+                continue
+            entry = orjson.loads(line)
+            response = entry.get('response') or {}
+            if response.get('status_code') == 200:
+                choice = response['body']['choices'][0]
+                message = choice['message']
+                if message.get('refusal'):
+                    outputs[entry['custom_id']] = ValueError(f"Model refused: {message['refusal']}")
+                elif choice.get('finish_reason') == 'length':
+                    outputs[entry['custom_id']] = TruncatedResponseError("Reply cut off at max_tokens")
+                else:
+                    try:
+                        outputs[entry['custom_id']] = orjson.loads(message['content'])
+                    except orjson.JSONDecodeError as e:
+                        outputs[entry['custom_id']] = e
+            else:
+                error = entry.get('error') or response.get('body', {}).get('error')
+                outputs[entry['custom_id']] = RuntimeError(f"Batch request failed: {error}")
+    
+    if batch.status != 'completed':
+        print(f"  ✗ Batch {batch.id} ended with status '{batch.status}'")
+    return outputs
+
+def summarize_papers_batch(papers, api_key=None, provider='anthropic', use_cache=True, poll_interval=BATCH_POLL_SECONDS,
+                           cache_dir=None):
+    """
+    Summarize many papers through the provider's Batch API.
+    
+    Batch requests cost about half as much as real-time ones but may take
+    up to 24 hours, so this blocks while polling until the batch has ended.
+    Papers with a cached result are not submitted, and papers whose batch
+    reply was cut off at max_tokens are re-requested in real time with
+    SUMMARY_FALLBACK_MAX_TOKENS.
+    
+    Args:
+        papers: List of (text, filename) tuples
+        api_key: API key (if None, reads from environment variable)
+        provider: 'anthropic' or 'openai'
+        use_cache: Return cached results where available
+        poll_interval: Seconds between batch status checks
+        cache_dir: Response cache directory (from response_cache_dir; None for no cache)
         
-        return result
+    Returns:
+        List of result dicts, in the same order as papers
+    """
+    provider = provider.lower()
+    if provider == 'anthropic':
+        client = get_client(provider, api_key or os.environ.get('ANTHROPIC_API_KEY'))
+        run_batch = _run_anthropic_batch
+    elif provider == 'openai':
+        client = get_client(provider, api_key or os.environ.get('OPENAI_API_KEY'))
+        run_batch = _run_openai_batch
+    else:
+        raise ValueError(f"Unknown provider: {provider}. Use 'anthropic' or 'openai'.")
+    
+    results = [None] * len(papers)
+    pending = {}  # custom_id -> (index, chunks, body, cache_key)
+    requests = []
+    for i, (text, filename) in enumerate(papers):
+        chunks, body, cache_key = _prepare_request(text, provider)
+        if use_cache:
+            results[i] = load_cached_response(cache_key, filename, cache_dir)
+            if results[i] is not None:
+                continue
         
-    except json.JSONDecodeError as e:
-        send_metric('JSONParseError', 1, 'openai')
-        print(f"  ✗ JSON parsing error: {e}")
-        print(f"  Response: {response_text[:200]}...")
-        return {
-            'filename': filename,
-            'status': 'json_error',
-            'error': str(e),
-            'raw_response': response_text[:500],
-            'api_provider': 'openai'
-        }
+        custom_id = f'paper-{i}'
+        pending[custom_id] = (i, chunks, body, cache_key)
+        requests.append((custom_id, body))
+    
+    if not requests:
+        return results
+    
+    try:
+        outputs = run_batch(client, requests, poll_interval)
     except Exception as e:
-        send_metric('APICallError', 1, 'openai')
-        print(f"  ✗ API error: {e}")
-        return {
-            'filename': filename,
-            'status': 'api_error',
-            'error': str(e),
-            'api_provider': 'openai'
-        }
+        outputs = {}
+        print(f"  ✗ Batch API error: {e}")
+        batch_error = e
+    else:
+        batch_error = RuntimeError("No result returned for this request")
+    
+    create = client.messages.create if provider == 'anthropic' else client.chat.completions.create
+    for custom_id, (i, chunks, body, cache_key) in pending.items():
+        filename = papers[i][1]
+        output = outputs.get(custom_id, batch_error)
+        if isinstance(output, TruncatedResponseError):
+            send_metric('MaxTokensFallback', 1, provider)
+            try:
+                output = response_payload(_call_api(create, **_with_fallback_tokens(body)), provider)
+            except Exception as e:
+                output = e
+        if isinstance(output, Exception):
+            results[i] = api_error_result(output, filename, provider)
+            continue
+        
+        results[i] = summary_result(output, filename, chunks, provider)
+        send_metric('APICallSuccess', 1, provider)
+        save_cached_response(cache_key, results[i], cache_dir)
+    
+    return results
 
 def summarize_paper(text, filename, api_key=None, provider='anthropic'):
     """
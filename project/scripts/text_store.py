@@ -0,0 +1,89 @@
+"""
+Compressed store for extracted paper texts.
+
+Keeps every extracted text as one zlib-compressed row in a single SQLite
+file instead of one .txt file per paper, which is several times smaller
+and avoids thousands of small files on large corpora.
+"""
+
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+
+TEXT_STORE_FILENAME = 'extracted_texts.sqlite'
+COMPRESSION_LEVEL = 6
+
+class TextStore:
+    """Extracted texts keyed by PDF filename (safe to share between threads)"""
+
+    def __init__(self, path):
+        """
+        Open (or create) a text store.
+
+        Args:
+            path: SQLite file, or a directory to hold TEXT_STORE_FILENAME
+        """
+        path = Path(path)
+        if path.is_dir():
+            path = path / TEXT_STORE_FILENAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS texts (filename TEXT PRIMARY KEY, text BLOB NOT NULL)')
+        self._conn.commit()
+
+    def put(self, filename, text):
+        """Store (or replace) the text extracted from filename"""
+        data = zlib.compress(text.encode('utf-8'), COMPRESSION_LEVEL)
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO texts (filename, text) VALUES (?, ?)', (filename, data))
+            self._conn.commit()
+
+    def get(self, filename):
+        """
+        Read the text extracted from filename.
+
+        Returns:
+            The text, or None if it isn't stored
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT text FROM texts WHERE filename = ?', (filename,)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def filenames(self):
+        """List the filenames with stored texts"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute('SELECT filename FROM texts ORDER BY filename')]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Read texts from an extracted text store')
+    parser.add_argument('store', help=f'Store file or output directory containing {TEXT_STORE_FILENAME}')
+    parser.add_argument('filename', nargs='?', help='PDF filename to print (omit to list stored files)')
+    args = parser.parse_args()
+
+    with TextStore(args.store) as store:
+        if args.filename:
+            text = store.get(args.filename)
+            if text is None:
+                print(f"✗ No text stored for {args.filename}")
+            else:
+                print(text)
+        else:
+            for filename in store.filenames():
+                print(filename)
@@ -4,17 +4,61 @@ Cross-platform compatible (Windows, macOS, Linux).
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
 import threading
+import multiprocessing
+import queue
+from collections import deque
+import re
 import sys
 import os
 from pathlib import Path
-import json
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent))
 
+LOG_DRAIN_MS = 50       # Interval between log queue drains on the Tk main loop
+LOG_DRAIN_BATCH = 200   # Maximum log lines inserted per drain
+LOG_MAX_LINES = int(os.environ.get('LOG_MAX_LINES', '5000'))  # Oldest log rows are dropped beyond this
+
+# Log tag keywords; the group number is the tag's priority (lowest wins)
+_TAG_RE = re.compile(r'(✓|success)|(✗|error|failed)|(warning)', re.IGNORECASE)
+_TAGS = {1: 'success', 2: 'error', 3: 'warning'}
+LOG_TAG_COLORS = {'success': 'green', 'error': 'red', 'warning': 'orange', 'info': 'blue'}
+
+def log_tag(line):
+    """Pick the log tag (color) for a line of pipeline output"""
+    groups = {match.lastindex for match in _TAG_RE.finditer(line)}
+    return _TAGS[min(groups)] if groups else 'info'
+
+class _QueueWriter:
+    """File-like stdout replacement that queues each complete line with its log tag"""
+    
+    def __init__(self, log_queue):
+        self.log_queue = log_queue
+        self._partial = ''
+        self._lock = threading.Lock()
+    
+    def write(self, s):
+        with self._lock:
+            lines = (self._partial + s).split('\n')
+            self._partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                self.log_queue.put_nowait((line, log_tag(line)))
+        return len(s)
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        """Queue any trailing text that didn't end with a newline"""
+        with self._lock:
+            line, self._partial = self._partial, ''
+        if line.strip():
+            self.log_queue.put_nowait((line, log_tag(line)))
+
 class PipelineGUI:
     def __init__(self, root):
         self.root = root
@@ -34,9 +78,19 @@ class PipelineGUI:
         self.anthropic_key = tk.StringVar(value=os.environ.get('ANTHROPIC_API_KEY', ''))
         self.openai_key = tk.StringVar(value=os.environ.get('OPENAI_API_KEY', ''))
         
-        self.processing = False
+        self.process = None  # Child process running the pipeline
+        self.stop_requested = False
         
+        # Log lines from the GUI and the pipeline process, written to the widget by _drain_log_queue
+        self.log_queue = multiprocessing.Queue()
+        
+        # Build every widget before the window is mapped so layout is computed once
+        self.root.withdraw()
         self.setup_ui()
+        self.root.update_idletasks()
+        self.root.deiconify()
+        
+        self.root.after(LOG_DRAIN_MS, self._drain_log_queue)
     
     def setup_ui(self):
         # Create notebook for tabs
@@ -99,13 +153,13 @@ class PipelineGUI:
         dir_frame = ttk.LabelFrame(parent, text="Directories", padding=10)
         dir_frame.pack(fill='x', padx=10, pady=5)
         
-        ttk.Label(dir_frame, text="Papers Directory:").grid(row=0, column=0, sticky='w', pady=5)
-        ttk.Entry(dir_frame, textvariable=self.papers_dir, width=50).grid(row=0, column=1, padx=5)
-        ttk.Button(dir_frame, text="Browse", command=self.browse_papers_dir).grid(row=0, column=2)
-        
-        ttk.Label(dir_frame, text="Output Directory:").grid(row=1, column=0, sticky='w', pady=5)
-        ttk.Entry(dir_frame, textvariable=self.output_dir, width=50).grid(row=1, column=1, padx=5)
-        ttk.Button(dir_frame, text="Browse", command=self.browse_output_dir).grid(row=1, column=2)
+        for row, (label, variable, browse) in enumerate((
+            ("Papers Directory:", self.papers_dir, self.browse_papers_dir),
+            ("Output Directory:", self.output_dir, self.browse_output_dir)
+        )):
+            ttk.Label(dir_frame, text=label).grid(row=row, column=0, sticky='w', pady=5)
+            ttk.Entry(dir_frame, textvariable=variable, width=50).grid(row=row, column=1, padx=5)
+            ttk.Button(dir_frame, text="Browse", command=browse).grid(row=row, column=2)
         
         # API Configuration
         api_frame = ttk.LabelFrame(parent, text="API Configuration", padding=10)
@@ -121,11 +175,12 @@ class PipelineGUI:
         )
         provider_combo.grid(row=0, column=1, sticky='w', padx=5)
         
-        ttk.Label(api_frame, text="Anthropic API Key:").grid(row=1, column=0, sticky='w', pady=5)
-        ttk.Entry(api_frame, textvariable=self.anthropic_key, width=50, show='*').grid(row=1, column=1, padx=5)
-        
-        ttk.Label(api_frame, text="OpenAI API Key:").grid(row=2, column=0, sticky='w', pady=5)
-        ttk.Entry(api_frame, textvariable=self.openai_key, width=50, show='*').grid(row=2, column=1, padx=5)
+        for row, (label, variable) in enumerate((
+            ("Anthropic API Key:", self.anthropic_key),
+            ("OpenAI API Key:", self.openai_key)
+        ), start=1):
+            ttk.Label(api_frame, text=label).grid(row=row, column=0, sticky='w', pady=5)
+            ttk.Entry(api_frame, textvariable=variable, width=50, show='*').grid(row=row, column=1, padx=5)
         
         # Cloud Configuration
         cloud_frame = ttk.LabelFrame(parent, text="Cloud Storage", padding=10)
@@ -191,20 +246,31 @@ class PipelineGUI:
         ).pack(anchor='w', pady=5)
     
     def setup_log_tab(self, parent):
-        self.log_text = scrolledtext.ScrolledText(
+        # A Treeview only draws the visible rows, so long logs stay responsive
+        ttk.Style().configure('Log.Treeview', font=('Courier', 9))
+        self.log_tree = ttk.Treeview(
             parent,
-            wrap=tk.WORD,
-            width=80,
+            columns=('time', 'message'),
+            show='headings',
             height=30,
-            font=('Courier', 9)
+            style='Log.Treeview'
         )
-        self.log_text.pack(fill='both', expand=True, padx=10, pady=10)
+        self.log_tree.heading('time', text='Time', anchor=tk.W)
+        self.log_tree.heading('message', text='Message', anchor=tk.W)
+        self.log_tree.column('time', width=70, stretch=False)
+        self.log_tree.column('message', width=780, stretch=True)
+        
+        scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.log_tree.yview)
+        self.log_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y', pady=10, padx=(0, 10))
+        self.log_tree.pack(fill='both', expand=True, padx=(10, 0), pady=10)
         
         # Add tags for colored output
-        self.log_text.tag_config('success', foreground='green')
-        self.log_text.tag_config('error', foreground='red')
-        self.log_text.tag_config('warning', foreground='orange')
-        self.log_text.tag_config('info', foreground='blue')
+        for tag, color in LOG_TAG_COLORS.items():
+            self.log_tree.tag_configure(tag, foreground=color)
+        
+        # Row ids in display order, for dropping the oldest rows
+        self.log_rows = deque()
     
     def browse_papers_dir(self):
         directory = filedialog.askdirectory(initialdir=self.papers_dir.get())
@@ -217,109 +283,166 @@ class PipelineGUI:
             self.output_dir.set(directory)
     
     def log(self, message, tag='info'):
-        """Add message to log with timestamp"""
+        """Queue a message for the log (safe to call from any thread)"""
+        self.log_queue.put_nowait((message, tag))
+    
+    def log_bulk(self, entries):
+        """
+        Add several messages to the log (Tk main thread only).
+        
+        Args:
+            entries: List of (message, tag) tuples
+        """
+        if not entries:
+            return
+        
         timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n", tag)
-        self.log_text.see(tk.END)
-        self.root.update()
+        insert, end = self.log_tree.insert, tk.END
+        self.log_rows.extend(insert('', end, values=(timestamp, message), tags=(tag,)) for message, tag in entries)
+        
+        # Keep only the newest LOG_MAX_LINES rows
+        excess = len(self.log_rows) - LOG_MAX_LINES
+        if excess > 0:
+            self.log_tree.delete(*(self.log_rows.popleft() for _ in range(excess)))
+        
+        self.log_tree.see(self.log_rows[-1])
+    
+    def clear_log(self):
+        self.log_tree.delete(*self.log_rows)
+        self.log_rows.clear()
+    
+    def _drain_log_queue(self):
+        """Write up to LOG_DRAIN_BATCH queued log lines, then reschedule"""
+        entries = []
+        try:
+            while len(entries) < LOG_DRAIN_BATCH:
+                entries.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        self.log_bulk(entries)
+        self.root.after(LOG_DRAIN_MS, self._drain_log_queue)
+    
+    def read_config(self):
+        """Snapshot the form values into a plain dict (Tk main thread only)"""
+        return {
+            'papers_dir': self.papers_dir.get(),
+            'output_dir': self.output_dir.get(),
+            'max_workers': self.workers.get(),
+            'provider': self.provider.get(),
+            'use_langchain': self.use_langchain.get(),
+            'check_pubmed': self.check_pubmed.get(),
+            'pubmed_query': self.pubmed_query.get(),
+            'user_email': self.email.get(),
+            'cloud_provider': self.cloud_provider.get()
+        }
     
     def start_processing(self):
+        config = self.read_config()
+        anthropic_key = self.anthropic_key.get()
+        openai_key = self.openai_key.get()
+        
         # Validate inputs
-        if not Path(self.papers_dir.get()).exists():
+        if not os.path.isdir(config['papers_dir']):
             messagebox.showerror("Error", "Papers directory does not exist!")
             return
         
-        provider = self.provider.get()
-        if provider == 'anthropic' and not self.anthropic_key.get():
+        if config['provider'] == 'anthropic' and not anthropic_key:
             messagebox.showerror("Error", "Anthropic API key is required!")
             return
         
-        if provider == 'openai' and not self.openai_key.get():
+        if config['provider'] == 'openai' and not openai_key:
             messagebox.showerror("Error", "OpenAI API key is required!")
             return
         
-        if self.check_pubmed.get() and not self.pubmed_query.get():
+        if config['check_pubmed'] and not config['pubmed_query']:
             messagebox.showwarning("Warning", "PubMed check enabled but no query provided!")
         
         # Disable start button
         self.start_button.config(state='disabled')
         self.stop_button.config(state='normal')
-        self.processing = True
+        self.stop_requested = False
         
         # Clear log
-        self.log_text.delete(1.0, tk.END)
-        
-        # Set environment variables
-        os.environ['ANTHROPIC_API_KEY'] = self.anthropic_key.get()
-        os.environ['OPENAI_API_KEY'] = self.openai_key.get()
-        
-        # Start processing in separate thread
-        thread = threading.Thread(target=self.run_pipeline, daemon=True)
-        thread.start()
+        self.clear_log()
+        
+        # Set environment variables (empty fields keep any key already set)
+        os.environ.update({
+            name: value
+            for name, value in (('ANTHROPIC_API_KEY', anthropic_key), ('OPENAI_API_KEY', openai_key))
+            if value
+        })
+        
+        # Start processing in a separate process
+        self.status_var.set("Processing...")
+        self.log("Starting pipeline...", 'info')
+        self.process = multiprocessing.Process(target=run_pipeline, args=(config, self.log_queue))
+        self.process.start()
+        self.root.after(LOG_DRAIN_MS, self._poll_pipeline)
     
     def stop_processing(self):
-        self.processing = False
+        if self.process is None or not self.process.is_alive():
+            return
+        self.stop_requested = True
         self.log("Stopping processing...", 'warning')
+        self.process.terminate()
     
-    def run_pipeline(self):
-        """Run the processing pipeline"""
-        try:
-            self.status_var.set("Processing...")
-            self.log("Starting pipeline...", 'info')
-            
-            # Import process_papers
-            from process_papers import main
-            
-            # Redirect stdout to log
-            import io
-            from contextlib import redirect_stdout
-            
-            log_stream = io.StringIO()
-            
-            with redirect_stdout(log_stream):
-                main(
-                    papers_dir=self.papers_dir.get(),
-                    output_dir=self.output_dir.get(),
-                    max_workers=self.workers.get(),
-                    provider=self.provider.get(),
-                    use_langchain=self.use_langchain.get(),
-                    check_pubmed=self.check_pubmed.get(),
-                    pubmed_query=self.pubmed_query.get(),
-                    user_email=self.email.get(),
-                    cloud_provider=self.cloud_provider.get()
-                )
-            
-            # Display output
-            output = log_stream.getvalue()
-            for line in output.split('\n'):
-                if line.strip():
-                    if '✓' in line or 'success' in line.lower():
-                        self.log(line, 'success')
-                    elif '✗' in line or 'error' in line.lower() or 'failed' in line.lower():
-                        self.log(line, 'error')
-                    elif 'warning' in line.lower():
-                        self.log(line, 'warning')
-                    else:
-                        self.log(line, 'info')
-            
+    def _poll_pipeline(self):
+        """Wait for the pipeline process to exit, then report how it ended"""
+        if self.process.is_alive():
+            self.root.after(LOG_DRAIN_MS, self._poll_pipeline)
+            return
+        
+        exitcode = self.process.exitcode
+        self.process = None
+        self.start_button.config(state='normal')
+        self.stop_button.config(state='disabled')
+        
+        if self.stop_requested:
+            self.status_var.set("Processing stopped")
+            self.log("Pipeline stopped", 'warning')
+        elif exitcode == 0:
             self.status_var.set("Processing complete!")
             self.log("Pipeline completed successfully!", 'success')
             messagebox.showinfo("Success", "Processing completed successfully!")
-            
-        except Exception as e:
-            self.log(f"Error: {str(e)}", 'error')
+        else:
             self.status_var.set("Error occurred")
-            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
-        
-        finally:
-            self.start_button.config(state='normal')
-            self.stop_button.config(state='disabled')
-            self.processing = False
+            messagebox.showerror("Error", "An error occurred, see the Processing Log for details.")
+
+def run_pipeline(config, log_queue):
+    """
+    Run the processing pipeline (in the child process started by the GUI).
+    
+    Args:
+        config: Form values from PipelineGUI.read_config
+        log_queue: Queue receiving (line, tag) tuples of pipeline output
+    """
+    log_writer = _QueueWriter(log_queue)
+    sys.stdout = log_writer
+    try:
+        from process_papers import main
+        
+        # Clicking Start Processing is the confirmation; the child has no console for the prompt
+        main(**config, assume_yes=True)
+    except Exception as e:
+        log_queue.put((f"Error: {str(e)}", 'error'))
+        exitcode = 1
+    else:
+        exitcode = 0
+    finally:
+        log_writer.close()
+    
+    sys.exit(exitcode)
 
 def main():
     root = tk.Tk()
     app = PipelineGUI(root)
     root.mainloop()
+    
+    # Don't leave the pipeline running after the window is closed
+    if app.process is not None and app.process.is_alive():
+        app.process.terminate()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    multiprocessing.freeze_support()
+    main()